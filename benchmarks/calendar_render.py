@@ -0,0 +1,152 @@
+"""
+Render time of the calendar month grid and slot list.
+
+Compares the previous markup, which branched on each cell's status and built
+every link in the template (``|date`` filters, ``{% url %}`` per slot), with
+the current one: cells and slots prepared by ``bookings.calendar_grid`` and
+printed by the cached ``includes/calendar_grid.html`` and
+``includes/time_slots.html``. Context preparation is timed together with
+rendering. No database is needed:
+
+    python benchmarks/calendar_render.py
+    python benchmarks/calendar_render.py --month 2030-03 --step 5 --repeat 2000
+"""
+from __future__ import annotations
+
+import argparse
+import calendar
+from datetime import date, datetime, time, timedelta
+import os
+from pathlib import Path
+import sys
+import timeit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "salon_site.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.template import engines  # noqa: E402
+from django.template.loader import get_template  # noqa: E402
+
+from bookings import calendar_grid  # noqa: E402
+from bookings.models import Service, Worker  # noqa: E402
+
+LEGACY = engines["django"].from_string(
+    """
+{% for week in calendar_days %}
+    {% for day in week %}
+        {% if day.in_month %}
+            {% if day.status == 'available' %}
+                <a class="day available" href="?worker={{ worker.id }}&service={{ selected_service.id }}&month={{ month_start|date:'Y-m' }}&date={{ day.date|date:'Y-m-d' }}">{{ day.date.day }}</a>
+            {% elif day.status == 'full' %}
+                <div class="day full">{{ day.date.day }}</div>
+            {% elif day.status == 'past' %}
+                <div class="day past">{{ day.date.day }}</div>
+            {% else %}
+                <div class="day idle">{{ day.date.day }}</div>
+            {% endif %}
+        {% else %}
+            <div class="day spacer"></div>
+        {% endif %}
+    {% endfor %}
+{% endfor %}
+{% for slot in selected_slots %}
+    {% if slot.available %}
+    <a class="time-slot available" href="{% url 'book' %}?worker={{ worker.id }}&service={{ selected_service.id }}&date={{ selected_date|date:'Y-m-d' }}&time={{ slot.time }}">
+        <span class="time">{{ slot.time }}</span>
+        <span class="status">Free – book</span>
+    </a>
+    {% else %}
+    <div class="time-slot busy">
+        <span class="time">{{ slot.time }}</span>
+        <span class="status busy-text">Busy</span>
+    </div>
+    {% endif %}
+{% endfor %}
+"""
+)
+
+
+def legacy_cells(month_weeks, month_start, today, fits):
+    return [
+        [
+            {
+                "date": day,
+                "in_month": day.month == month_start.month,
+                "status": "past" if day < today else ("available" if fits(day) else "full") if day.month == month_start.month else "idle",
+                "is_today": day == today,
+            }
+            for day in week
+        ]
+        for week in month_weeks
+    ]
+
+
+def make_slots(step: int, free: bool) -> list[dict]:
+    start = datetime.combine(date.min, time(9, 0))
+    return [
+        {"time": (start + timedelta(minutes=minutes)).strftime("%H:%M"), "available": free}
+        for minutes in range(0, 9 * 60, step)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--month", default="2030-03", help="Month to render (YYYY-MM), in the future by default")
+    parser.add_argument("--step", type=int, default=15, help="Slot step in minutes")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    year, month = map(int, args.month.split("-"))
+    month_start = date(year, month, 1)
+    today = month_start - timedelta(days=1)
+    month_weeks = calendar.Calendar(firstweekday=0).monthdatescalendar(year, month)
+    # An explicit location keeps the model defaults from looking one up in the database.
+    worker = Worker(id=7, full_name="Anna", location_id=1)
+    service = Service(id=3, name="Haircut", location_id=1)
+    selected_date = month_start + timedelta(days=10)
+    grid = get_template("bookings/includes/calendar_grid.html")
+    slots_template = get_template("bookings/includes/time_slots.html")
+
+    print(f"{args.month}, {len(make_slots(args.step, True))} slots, {args.repeat} renders")
+    print(f"{'scenario':<14} {'legacy µs':>10} {'current µs':>11} {'speedup':>8}")
+    for label, free in (("fully booked", False), ("all free", True)):
+        fits = lambda day: free  # noqa: E731
+
+        def legacy():
+            LEGACY.render(
+                {
+                    "calendar_days": legacy_cells(month_weeks, month_start, today, fits),
+                    "selected_slots": make_slots(args.step, free),
+                    "worker": worker,
+                    "selected_service": service,
+                    "month_start": month_start,
+                    "selected_date": selected_date,
+                }
+            )
+
+        def current():
+            context = {
+                "calendar_days": calendar_grid.month_cells(
+                    month_weeks,
+                    month_start,
+                    today,
+                    fits=fits,
+                    day_url=calendar_grid.query_prefix(worker=worker.id, service=service.id, month=args.month),
+                ),
+                "selected_slots": calendar_grid.link_slots(make_slots(args.step, free), worker.id, service.id, selected_date),
+            }
+            grid.render(context)
+            slots_template.render(context)
+
+        old = min(timeit.repeat(legacy, number=args.repeat, repeat=3)) / args.repeat * 1e6
+        new = min(timeit.repeat(current, number=args.repeat, repeat=3)) / args.repeat * 1e6
+        print(f"{label:<14} {old:>10.0f} {new:>11.0f} {old / new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+SQLite write contention between page views and booking inserts.
+
+Visitor threads loop through a flash-message round trip (an invalid
+cancellation link that adds a message and redirects, then the home page that
+shows it) while one thread inserts bookings. Both run against a throwaway
+SQLite file, first with messages in database sessions (what
+``SessionStorage``, or ``FallbackStorage`` once its cookie overflows, does) and
+then with the current cookie messages, which give anonymous visitors no session:
+
+    python benchmarks/session_contention.py
+    python benchmarks/session_contention.py --visitors 8 --seconds 10
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import date, time as time_cls, timedelta
+import os
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+DB_DIR = tempfile.TemporaryDirectory()
+os.environ["DJANGO_SQLITE_PATH"] = str(Path(DB_DIR.name) / "contention.sqlite3")
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "salon_site.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import OperationalError, connection  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from bookings.models import Booking, Service, Worker  # noqa: E402
+
+SCENARIOS = {
+    "db sessions": {
+        "SESSION_ENGINE": "django.contrib.sessions.backends.db",
+        "MESSAGE_STORAGE": "django.contrib.messages.storage.session.SessionStorage",
+    },
+    "cookie messages": {},
+}
+
+
+def visitor(stop: threading.Event, views: list[int]) -> None:
+    client = Client()
+    cancel_url, home_url = reverse("cancel_booking", args=["not-a-token"]), reverse("home")
+    count = 0
+    while not stop.is_set():
+        client.get(cancel_url)
+        client.get(home_url)
+        count += 2
+    views.append(count)
+    connection.close()
+
+
+def booker(
+    stop: threading.Event, worker: Worker, service: Service, first_day: date, latencies: list[float], errors: list[str]
+) -> None:
+    i = 0
+    while not stop.is_set():
+        day, slot = first_day + timedelta(days=i // 36), i % 36
+        start = time.perf_counter()
+        try:
+            Booking.objects.create(
+                worker=worker, service=service, date=day, time=time_cls(9 + slot // 4, slot % 4 * 15), phone="+1234567890"
+            )
+            latencies.append(time.perf_counter() - start)
+        except OperationalError as exc:
+            errors.append(str(exc))
+        i += 1
+    connection.close()
+
+
+def run(visitors: int, seconds: float, first_day: date) -> dict:
+    worker = Worker.objects.create(full_name=f"Bench {first_day}")
+    service = Service.objects.get_or_create(name="Bench cut", defaults={"duration_minutes": 15})[0]
+    stop = threading.Event()
+    views: list[int] = []
+    latencies: list[float] = []
+    errors: list[str] = []
+    threads = [threading.Thread(target=visitor, args=(stop, views)) for _ in range(visitors)]
+    threads.append(threading.Thread(target=booker, args=(stop, worker, service, first_day, latencies, errors)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return {
+        "views": sum(views),
+        "bookings": len(latencies),
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0,
+        "max": latencies[-1] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--visitors", type=int, default=4, help="Concurrent visitor threads")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    call_command("migrate", verbosity=0)
+    print(f"{args.visitors} visitors, one booking writer, {args.seconds:.0f} s per scenario")
+    print(f"{'scenario':<15} {'views':>7} {'bookings':>9} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'locked':>7}")
+    for index, (label, overrides) in enumerate(SCENARIOS.items()):
+        with override_settings(**overrides):
+            stats = run(args.visitors, args.seconds, date(2040, 1, 1) + timedelta(days=1000 * index))
+        print(
+            f"{label:<15} {stats['views']:>7} {stats['bookings']:>9} {stats['p50']:>7.1f} {stats['p95']:>7.1f} "
+            f"{stats['max']:>7.1f} {stats['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
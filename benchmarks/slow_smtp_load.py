@@ -0,0 +1,218 @@
+"""
+Load test for the booking flow while the SMTP server is slow.
+
+Starts a local fake SMTP server that stalls before acknowledging each message,
+collects static files and boots gunicorn with salon_site/gunicorn_conf.py
+against a throwaway SQLite database, and fires concurrent booking POSTs at
+/book/. Every booking must land on the success page or the run fails. Compare
+worker models:
+
+    python benchmarks/slow_smtp_load.py --worker-model sync
+    python benchmarks/slow_smtp_load.py --worker-model gthread
+    python benchmarks/slow_smtp_load.py --worker-model asgi
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import http.cookiejar
+import os
+from pathlib import Path
+import re
+import socket
+import socketserver
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class SlowSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue that sleeps before accepting each message."""
+
+    delay = 2.0
+    received = 0
+    lock = threading.Lock()
+
+    def send(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        self.send("220 fake-smtp ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self.send("250 fake-smtp")
+            elif command == "DATA":
+                self.send("354 end with <CRLF>.<CRLF>")
+                while self.rfile.readline() not in (b".\r\n", b".\n", b""):
+                    pass
+                time.sleep(self.delay)
+                with self.lock:
+                    SlowSMTPHandler.received += 1
+                self.send("250 queued")
+            elif command == "QUIT":
+                self.send("221 bye")
+                return
+            else:
+                self.send("250 ok")
+
+
+class ThreadingSMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def manage(env: dict[str, str], *args: str) -> None:
+    subprocess.run([sys.executable, "manage.py", *args], cwd=BASE_DIR, env=env, check=True, capture_output=True)
+
+
+def book_once(base_url: str, worker_id: int, service_id: int, day: date) -> tuple[float, int, str]:
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    started = time.perf_counter()
+    html = opener.open(f"{base_url}/book/").read().decode()
+    token = CSRF_RE.search(html).group(1)
+    payload = urllib.parse.urlencode(
+        {
+            "csrfmiddlewaretoken": token,
+            "worker": worker_id,
+            "service": service_id,
+            "date": day.isoformat(),
+            "time": "10:00",
+            "phone": "+359888000000",
+            "email": "load@example.com",
+        }
+    ).encode()
+    request = urllib.request.Request(f"{base_url}/book/", data=payload, headers={"Referer": f"{base_url}/book/"})
+    try:
+        response = opener.open(request)
+        status, final_url = response.status, response.url
+    except urllib.error.HTTPError as exc:
+        status, final_url = exc.code, exc.url
+    return time.perf_counter() - started, status, final_url
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--worker-model", default="gthread", choices=["gthread", "asgi", "sync"])
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="threads per gthread worker")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--smtp-delay", type=float, default=2.0, help="seconds the fake SMTP server stalls per message")
+    args = parser.parse_args()
+
+    SlowSMTPHandler.delay = args.smtp_delay
+    smtp_port = free_port()
+    smtp_server = ThreadingSMTPServer(("127.0.0.1", smtp_port), SlowSMTPHandler)
+    threading.Thread(target=smtp_server.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        http_port = free_port()
+        env = dict(
+            os.environ,
+            DJANGO_SQLITE_PATH=str(Path(tmp) / "load.sqlite3"),
+            DJANGO_LOG_DIR=tmp,
+            DJANGO_STATIC_ROOT=str(Path(tmp) / "static"),
+            DJANGO_LOG_LEVEL="WARNING",
+            DJANGO_DEBUG="0",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=str(smtp_port),
+            EMAIL_USE_TLS="0",
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            GUNICORN_WORKER_MODEL=args.worker_model,
+            WEB_CONCURRENCY=str(args.workers),
+            GUNICORN_THREADS=str(args.threads),
+            GUNICORN_BIND=f"127.0.0.1:{http_port}",
+            GUNICORN_ACCESS_LOG="",
+            GUNICORN_LOG_LEVEL="warning",
+        )
+        manage(env, "migrate", "--noinput")
+        manage(env, "collectstatic", "--noinput")
+        manage(
+            env,
+            "shell",
+            "-c",
+            "from bookings.models import Worker, Service;"
+            "Worker.objects.create(full_name='Load Tester');"
+            "Service.objects.create(name='Cut', duration_minutes=30)",
+        )
+
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "python:salon_site.gunicorn_conf"],
+            cwd=BASE_DIR,
+            env=env,
+        )
+        try:
+            wait_for_port(http_port, server)
+            base_url = f"http://127.0.0.1:{http_port}"
+            first_day = date.today() + timedelta(days=1)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                futures = [
+                    pool.submit(book_once, base_url, 1, 1, first_day + timedelta(days=i))
+                    for i in range(args.requests)
+                ]
+                results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+            smtp_server.shutdown()
+
+    latencies = sorted(latency for latency, _, _ in results)
+    statuses: dict[int, int] = {}
+    for _, status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    failed = [(status, url) for _, status, url in results if status != 200 or "/booking-success/" not in url]
+
+    print(f"worker model:     {args.worker_model} ({args.workers} workers)")
+    print(f"smtp delay:       {args.smtp_delay:.1f}s per message")
+    print(f"requests:         {args.requests} at concurrency {args.concurrency}")
+    print(f"elapsed:          {elapsed:.2f}s")
+    print(f"throughput:       {args.requests / elapsed:.2f} bookings/s")
+    print(f"latency p50/p95:  {statistics.median(latencies):.2f}s / {latencies[int(len(latencies) * 0.95) - 1]:.2f}s")
+    print(f"statuses:         {statuses}")
+    print(f"emails received:  {SlowSMTPHandler.received}")
+    if failed:
+        print(f"FAILED: {len(failed)} of {args.requests} bookings did not succeed, e.g. {failed[0]}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+SMS batch throughput, offline.
+
+Sends a batch of reminder-sized messages through the locmem backend, which
+sleeps ``--latency`` seconds per message to stand in for the provider round
+trip, and compares serial sending with the concurrent, rate-limited batch:
+
+    python benchmarks/sms_throughput.py --messages 200 --latency 0.15
+    python benchmarks/sms_throughput.py --workers 1 4 8 16 --rate 20
+
+No Twilio account or network access is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+from pathlib import Path
+import sys
+import time
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "salon_site.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from bookings import sms  # noqa: E402
+
+
+def run(count: int, workers: int, rate: float, latency: float) -> tuple[float, int]:
+    sms.outbox.clear()
+    messages = [sms.SMSMessage("Reminder: appointment tomorrow 10:00 with Anna.", f"+359888{i:06d}") for i in range(count)]
+    connection = sms.get_connection(
+        "bookings.sms.backends.locmem.SmsBackend", max_workers=workers, rate_limit=rate, latency=latency
+    )
+    start = time.perf_counter()
+    sent = connection.send_messages(messages)
+    return time.perf_counter() - start, sent
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1, help="Simulated provider round trip in seconds")
+    parser.add_argument("--rate", type=float, default=0, help="Rate limit in messages/second (0 = unlimited)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, {args.latency * 1000:.0f} ms simulated latency, rate limit {args.rate or 'none'}")
+    print(f"{'workers':>8} {'seconds':>9} {'msg/s':>8}")
+    for workers in args.workers:
+        elapsed, sent = run(args.messages, workers, args.rate, args.latency)
+        print(f"{workers:>8} {elapsed:>9.2f} {sent / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
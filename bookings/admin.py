@@ -1,39 +1,188 @@
+from __future__ import annotations
+
+import re
+
 from django.contrib import admin
-from .models import Worker, Booking, Service, WorkerServicePrice
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from .models import (
+    Booking,
+    Location,
+    OutboundEmail,
+    SchedulerLease,
+    Service,
+    SlotOffer,
+    WaitlistEntry,
+    Worker,
+    WorkerServicePrice,
+    WorkerWeekSummary,
+)
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug", "hostname", "is_default")
+    prepopulated_fields = {"slug": ("name",)}
 
 
 @admin.register(Worker)
 class WorkerAdmin(admin.ModelAdmin):
-    list_display = ("full_name", "role", "is_active")
-    list_filter = ("is_active",)
+    list_display = ("full_name", "role", "location", "is_active")
+    list_filter = ("location", "is_active")
     search_fields = ("full_name", "role")
     fieldsets = (
-        (None, {"fields": ("full_name", "role", "is_active")}),
+        (None, {"fields": ("full_name", "role", "location", "is_active")}),
         ("Working hours", {"fields": ("working_hours_start", "working_hours_end")}),
+        ("Booking slots", {"fields": ("slot_step_minutes", "compact_slots")}),
         ("Profile", {"fields": ("photo", "bio")}),
     )
+    actions = ["rotate_feed_links"]
+
+    @admin.action(description="Revoke schedule feed links")
+    def rotate_feed_links(self, request, queryset):
+        for worker in queryset:
+            worker.rotate_feed_secret()
+        self.message_user(request, f"Revoked feed links for {len(queryset)} worker(s); new links are on the day board.")
+
+
+class CappedCountPaginator(Paginator):
+    """Paginator that stops counting once ``count_cap`` rows are found.
+
+    ``COUNT(*)`` over years of bookings scans the whole table on every changelist
+    page. Counting a ``LIMIT``-ed subquery bounds that work; on PostgreSQL an
+    unfiltered list falls back to the planner's row estimate past the cap.
+    """
+
+    count_cap = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        object_list = self.object_list
+        if not hasattr(object_list, "query"):
+            return len(object_list)
+        capped = object_list.order_by()[: self.count_cap + 1].count()
+        if capped <= self.count_cap:
+            return capped
+        return max(self._estimated_count(object_list) or 0, self.count_cap)
+
+    @staticmethod
+    def _estimated_count(queryset) -> int | None:
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql" or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] > 0 else None
+
+
+PHONE_SEARCH_RE = re.compile(r"^[0-9+\-\s]+$")
 
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
-    list_display = ("worker", "service", "date", "time", "phone", "email", "created_at")
-    list_filter = ("worker", "service", "date")
-    search_fields = ("phone", "worker__full_name", "service__name")
+    list_display = ("worker", "service", "date", "time", "phone", "email", "no_show", "created_at")
+    list_filter = ("location", "worker", "service", "no_show")
+    list_select_related = ("worker", "service")
+    date_hierarchy = "date"
+    ordering = ("-date", "-time", "-id")
+    search_fields = ("phone__startswith",)
+    search_help_text = "Search by the start of the phone number."
     autocomplete_fields = ("worker", "service")
+    readonly_fields = ("reminder_sent_at",)
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if term and PHONE_SEARCH_RE.match(term):
+            # Half-open range instead of LIKE so both SQLite and PostgreSQL use booking_phone_idx.
+            upper = term[:-1] + chr(ord(term[-1]) + 1)
+            return queryset.filter(phone__gte=term, phone__lt=upper), False
+        return super().get_search_results(request, queryset, search_term)
 
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
-    list_display = ("name", "duration_minutes")
+    list_display = ("name", "location", "duration_minutes", "slot_step_minutes")
+    list_filter = ("location",)
     search_fields = ("name",)
 
 
 @admin.register(WorkerServicePrice)
 class WorkerServicePriceAdmin(admin.ModelAdmin):
     list_display = ("worker", "service", "price", "duration_minutes")
-    list_filter = ("worker", "service")
+    list_filter = ("location", "worker", "service")
     search_fields = ("worker__full_name", "service__name")
     autocomplete_fields = ("worker", "service")
 
 
+@admin.register(WorkerWeekSummary)
+class WorkerWeekSummaryAdmin(admin.ModelAdmin):
+    list_display = (
+        "worker",
+        "week_start",
+        "booking_count",
+        "occupancy_percent",
+        "revenue",
+        "no_show_count",
+        "cancellation_count",
+        "peak_hour",
+    )
+    list_filter = ("worker",)
+    list_select_related = ("worker",)
+    date_hierarchy = "week_start"
+
+    # Rows are rebuilt by `manage.py build_analytics`; edits would be overwritten.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+class SlotOfferInline(admin.TabularInline):
+    model = SlotOffer
+    fields = ("date", "time", "expires_at", "accepted_at", "released_at")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(admin.ModelAdmin):
+    list_display = ("email", "worker", "service", "earliest_date", "latest_date", "is_active", "created_at")
+    list_filter = ("is_active", "worker")
+    list_select_related = ("worker", "service")
+    search_fields = ("email", "phone")
+    raw_id_fields = ("booking",)
+    inlines = (SlotOfferInline,)
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    readonly_fields = ("subject", "body", "html_body", "from_email", "to", "attempts", "last_error", "created_at", "sent_at")
+    fields = ("status", "next_attempt_at") + readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(SchedulerLease)
+class SchedulerLeaseAdmin(admin.ModelAdmin):
+    list_display = ("name", "holder", "expires_at", "updated_at")
+    readonly_fields = ("name", "holder", "expires_at", "metrics", "updated_at")
+
+    # Written by `manage.py run_scheduler`.
+    def has_add_permission(self, request):
+        return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,149 @@
+"""
+Weekly utilization and revenue per worker, aggregated in the database.
+
+Bookings are grouped per (worker, ``TruncWeek``) with ``Sum``/``Count`` in one
+query, joined to their worker-specific price and duration through a filtered
+LEFT JOIN on ``WorkerServicePrice``. Peak hours and cancellations are two more
+grouped queries, and the results are written to ``WorkerWeekSummary`` so
+dashboards read a few rows per worker instead of scanning raw bookings.
+
+Only the ORM is used, so the scheduler's weekly refresh runs on the web hosts
+without the reporting stack from ``requirements-dev.txt``.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, FilteredRelation, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, ExtractHour, TruncWeek
+
+from .availability import DEFAULT_DURATION_MINUTES
+from .models import Booking, BookingCancellation, Worker, WorkerWeekSummary
+
+_MONEY = DecimalField(max_digits=10, decimal_places=2)
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def _as_date(value) -> date:
+    # TruncWeek comes back as a datetime on some backends.
+    return value.date() if isinstance(value, datetime) else value
+
+
+def weekly_booking_totals(first_day: date, last_day: date):
+    """Booking count, minutes, revenue and no-shows per (worker, week) in a single query.
+
+    Durations fall back from the worker price to the service default to 60
+    minutes, matching ``availability.service_duration``. No-shows count toward
+    occupancy (the slot was held) but not toward revenue.
+    """
+    minutes = Coalesce(
+        "worker_price__duration_minutes", "service__duration_minutes", Value(DEFAULT_DURATION_MINUTES)
+    )
+    revenue = Case(
+        When(no_show=False, then=Coalesce("worker_price__price", Value(Decimal("0")), output_field=_MONEY)),
+        default=Value(Decimal("0")),
+        output_field=_MONEY,
+    )
+    return (
+        Booking.objects.filter(date__gte=first_day, date__lte=last_day)
+        .annotate(
+            worker_price=FilteredRelation(
+                "worker__service_prices",
+                condition=Q(worker__service_prices__service=F("service")),
+            ),
+            week=TruncWeek("date"),
+        )
+        .values("worker_id", "week")
+        .annotate(
+            booking_count=Count("id"),
+            booked_minutes=Sum(minutes),
+            revenue=Sum(revenue),
+            no_show_count=Count("id", filter=Q(no_show=True)),
+        )
+        .order_by()
+    )
+
+
+def _peak_hours(first_day: date, last_day: date) -> dict[tuple[int, date], int]:
+    """Most frequent start hour per (worker, week), earliest hour on ties."""
+    rows = (
+        Booking.objects.filter(date__gte=first_day, date__lte=last_day)
+        .annotate(week=TruncWeek("date"), hour=ExtractHour("time"))
+        .values("worker_id", "week", "hour")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    best: dict[tuple[int, date], tuple[int, int]] = {}
+    for row in rows:
+        key = (row["worker_id"], _as_date(row["week"]))
+        candidate = (-row["n"], row["hour"])
+        if key not in best or candidate < best[key]:
+            best[key] = candidate
+    return {key: hour for key, (_, hour) in best.items()}
+
+
+def _cancellation_counts(first_day: date, last_day: date) -> dict[tuple[int, date], int]:
+    rows = (
+        BookingCancellation.objects.filter(date__gte=first_day, date__lte=last_day)
+        .annotate(week=TruncWeek("date"))
+        .values("worker_id", "week")
+        .annotate(n=Count("id"))
+        .order_by()
+    )
+    return {(row["worker_id"], _as_date(row["week"])): row["n"] for row in rows}
+
+
+def compute_weekly_summary(first_day: date, last_day: date, open_days_per_week: int = 7) -> list[WorkerWeekSummary]:
+    """Unsaved ``WorkerWeekSummary`` rows for every worker-week in [first_day, last_day]."""
+    totals = {(row["worker_id"], _as_date(row["week"])): row for row in weekly_booking_totals(first_day, last_day)}
+    peaks = _peak_hours(first_day, last_day)
+    cancellations = _cancellation_counts(first_day, last_day)
+    daily_minutes = {
+        worker_id: max(0, (end.hour * 60 + end.minute) - (start.hour * 60 + start.minute))
+        for worker_id, start, end in Worker.objects.values_list("id", "working_hours_start", "working_hours_end")
+    }
+
+    summaries = []
+    for worker_id, week in sorted(set(totals) | set(cancellations), key=lambda key: (key[1], key[0])):
+        row = totals.get((worker_id, week), {})
+        booked = row.get("booked_minutes") or 0
+        available = daily_minutes.get(worker_id, 0) * open_days_per_week
+        occupancy = Decimal(booked * 100) / available if available else Decimal("0")
+        summaries.append(
+            WorkerWeekSummary(
+                worker_id=worker_id,
+                week_start=week,
+                booking_count=row.get("booking_count", 0),
+                booked_minutes=booked,
+                available_minutes=available,
+                occupancy_percent=occupancy.quantize(Decimal("0.1"), rounding=ROUND_HALF_UP),
+                revenue=Decimal(row.get("revenue") or 0).quantize(Decimal("0.01")),
+                no_show_count=row.get("no_show_count", 0),
+                cancellation_count=cancellations.get((worker_id, week), 0),
+                peak_hour=peaks.get((worker_id, week)),
+            )
+        )
+    return summaries
+
+
+def save_weekly_summary(summaries: list[WorkerWeekSummary], first_week: date, last_week: date) -> int:
+    """Replace stored summaries for weeks in [first_week, last_week] with ``summaries``."""
+    with transaction.atomic():
+        WorkerWeekSummary.objects.filter(week_start__gte=first_week, week_start__lte=last_week).delete()
+        WorkerWeekSummary.objects.bulk_create(summaries, batch_size=500)
+    return len(summaries)
+
+
+def refresh_weekly_summaries(first_day: date, last_day: date) -> list[WorkerWeekSummary]:
+    """Recompute and store summaries for every week touching [first_day, last_day]."""
+    first_week = week_start(first_day)
+    last_week = week_start(last_day)
+    summaries = compute_weekly_summary(first_week, last_week + timedelta(days=6))
+    save_weekly_summary(summaries, first_week, last_week)
+    return summaries
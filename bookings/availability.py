@@ -0,0 +1,332 @@
+"""
+Availability helpers shared by the calendar and booking views.
+
+The loaders resolve booking durations from a single ``WorkerServicePrice``
+query per worker instead of one query per booking, and come in sync and async
+flavours so the same logic serves WSGI and ASGI callers.
+
+``DailyAvailability`` rows summarise each booked worker-day (free minutes and
+the largest gap a slot can start in) so the month grid answers "does this
+service fit" from one range query. ``bookings.signals`` keeps them current.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from django.db import transaction
+
+from .models import Booking, DailyAvailability, Service, Worker, WorkerServicePrice
+
+DEFAULT_DURATION_MINUTES = 60
+SLOT_STEP_MINUTES = 15
+DEFAULT_WORKING_HOURS = (time(9, 0), time(18, 0))
+
+Interval = tuple[datetime, datetime]
+
+
+def working_hours(worker: Worker | None) -> tuple[time, time]:
+    """Return (start, end) of the worker's day, falling back to salon defaults."""
+    if worker is None:
+        return DEFAULT_WORKING_HOURS
+    return worker.working_hours_start, worker.working_hours_end
+
+
+def durations_from_prices(prices) -> dict[int, int]:
+    """Map service id -> duration minutes from an iterable of WorkerServicePrice rows."""
+    return {price.service_id: price.duration_minutes for price in prices}
+
+
+def duration_map(worker: Worker) -> dict[int, int]:
+    """Return worker-specific service durations in one query."""
+    return dict(WorkerServicePrice.objects.filter(worker=worker).values_list("service_id", "duration_minutes"))
+
+
+async def aduration_map(worker: Worker) -> dict[int, int]:
+    """Async variant of :func:`duration_map`."""
+    qs = WorkerServicePrice.objects.filter(worker=worker).values_list("service_id", "duration_minutes")
+    return {service_id: minutes async for service_id, minutes in qs}
+
+
+def durations_for_workers(worker_ids) -> dict[tuple[int, int], int]:
+    """Map (worker id, service id) -> duration minutes for several workers in one query."""
+    rows = WorkerServicePrice.objects.filter(worker_id__in=list(worker_ids)).values_list(
+        "worker_id", "service_id", "duration_minutes"
+    )
+    return {(worker_id, service_id): minutes for worker_id, service_id, minutes in rows}
+
+
+def service_duration(service: Service | None, durations: dict[int, int]) -> int:
+    """Return the duration for ``service`` using worker-specific overrides when present."""
+    if service is None:
+        return DEFAULT_DURATION_MINUTES
+    return durations.get(service.id, service.duration_minutes)
+
+
+def booking_interval(booking: Booking, durations: dict[int, int]) -> Interval:
+    """Return (start, end) naive datetimes for a booking with ``service`` preloaded."""
+    start = datetime.combine(booking.date, booking.time)
+    return start, start + timedelta(minutes=service_duration(booking.service, durations))
+
+
+def _month_queryset(worker: Worker, first_day: date, last_day: date):
+    return (
+        Booking.objects.filter(worker=worker, date__gte=first_day, date__lte=last_day)
+        .select_related("service")
+        .order_by("date", "time")
+    )
+
+
+def _group_intervals(bookings, durations: dict[int, int]) -> dict[date, list[Interval]]:
+    intervals: dict[date, list[Interval]] = {}
+    for booking in bookings:
+        intervals.setdefault(booking.date, []).append(booking_interval(booking, durations))
+    return intervals
+
+
+def intervals_by_date(worker: Worker, first_day: date, last_day: date, durations: dict[int, int]) -> dict[date, list[Interval]]:
+    """Load the worker's bookings in [first_day, last_day] grouped as intervals per day."""
+    return _group_intervals(_month_queryset(worker, first_day, last_day), durations)
+
+
+async def aintervals_by_date(
+    worker: Worker, first_day: date, last_day: date, durations: dict[int, int]
+) -> dict[date, list[Interval]]:
+    """Async variant of :func:`intervals_by_date`."""
+    bookings = [booking async for booking in _month_queryset(worker, first_day, last_day)]
+    return _group_intervals(bookings, durations)
+
+
+def day_bookings(worker_id: int, day: date, durations: dict[int, int], exclude_id: int | None = None) -> dict[time, Interval]:
+    """Existing bookings for one worker-day as start time -> interval, in one query."""
+    rows = Booking.objects.filter(worker_id=worker_id, date=day)
+    if exclude_id is not None:
+        rows = rows.exclude(pk=exclude_id)
+    bookings: dict[time, Interval] = {}
+    for start_time, service_id, default in rows.values_list("time", "service_id", "service__duration_minutes"):
+        minutes = DEFAULT_DURATION_MINUTES if service_id is None else durations.get(service_id, default)
+        start = datetime.combine(day, start_time)
+        bookings[start_time] = (start, start + timedelta(minutes=minutes))
+    return bookings
+
+
+def overlaps(interval: Interval, intervals) -> bool:
+    """True if ``interval`` overlaps any of ``intervals``."""
+    start, end = interval
+    return any(start < other_end and end > other_start for other_start, other_end in intervals)
+
+
+async def aintervals_for_days(worker: Worker, days, durations: dict[int, int]) -> dict[date, list[Interval]]:
+    """Load intervals for a few specific days (e.g. today and the selected date) in one query."""
+    queryset = Booking.objects.filter(worker=worker, date__in=set(days)).select_related("service").order_by("date", "time")
+    return _group_intervals([booking async for booking in queryset], durations)
+
+
+def _minutes(delta: timedelta) -> int:
+    return int(delta.total_seconds() // 60)
+
+
+def _clock(value: time) -> int:
+    """Minutes since midnight."""
+    return value.hour * 60 + value.minute
+
+
+def slot_step(worker: Worker | None, service: Service | None) -> int:
+    """Start time spacing: the service's override, else the worker's, else the salon default."""
+    if service is not None and service.slot_step_minutes:
+        return service.slot_step_minutes
+    if worker is not None and worker.slot_step_minutes:
+        return worker.slot_step_minutes
+    return SLOT_STEP_MINUTES
+
+
+def free_gaps(day: date, hours: tuple[time, time], intervals: list[Interval]) -> list[tuple[int, int]]:
+    """Free [start, end) runs within working hours, in minutes since midnight."""
+    open_dt = datetime.combine(day, hours[0])
+    close_dt = datetime.combine(day, hours[1])
+    if close_dt <= open_dt:
+        return []
+
+    busy = sorted(
+        (max(start, open_dt), min(end, close_dt)) for start, end in intervals if start < close_dt and end > open_dt
+    )
+    midnight = datetime.combine(day, time.min)
+    gaps = []
+    cursor = open_dt
+    for start, end in busy + [(close_dt, close_dt)]:
+        if start > cursor:
+            gaps.append((_minutes(cursor - midnight), _minutes(start - midnight)))
+        cursor = max(cursor, end)
+    return gaps
+
+
+def _first_start(gap_start: int, open_minutes: int, step: int, compact: bool) -> int:
+    if compact:
+        # Compact mode offers the start right where the gap opens.
+        return gap_start
+    # First grid start at or after the gap opens.
+    return open_minutes + -((open_minutes - gap_start) // step) * step
+
+
+def largest_gap(gaps, open_minutes: int, step: int = SLOT_STEP_MINUTES, compact: bool = False) -> int:
+    """Longest duration that can start in one of ``gaps`` under the given slot rules."""
+    return max((end - _first_start(start, open_minutes, step, compact) for start, end in gaps), default=0)
+
+
+def day_gaps(
+    day: date,
+    hours: tuple[time, time],
+    intervals: list[Interval],
+    step: int = SLOT_STEP_MINUTES,
+    compact: bool = False,
+) -> tuple[int, int]:
+    """Return (free minutes, largest gap) for one worker-day.
+
+    The largest gap is measured from the first start :func:`slots_for_day`
+    would offer inside it, so a service of ``duration`` minutes has a free
+    slot exactly when ``largest_gap >= duration``.
+    """
+    gaps = free_gaps(day, hours, intervals)
+    return sum(end - start for start, end in gaps), max(largest_gap(gaps, _clock(hours[0]), step, compact), 0)
+
+
+def day_fits(
+    summary: tuple[int, list] | None,
+    duration: int,
+    hours: tuple[time, time],
+    step: int = SLOT_STEP_MINUTES,
+    compact: bool = False,
+) -> bool:
+    """Whether ``duration`` fits a day given its (largest gap, gaps) summary; None means no bookings."""
+    if summary is None:
+        gaps = [(_clock(hours[0]), _clock(hours[1]))]
+    else:
+        largest, gaps = summary
+        if not gaps:
+            return largest >= duration
+    return largest_gap(gaps, _clock(hours[0]), step, compact) >= duration
+
+
+def refresh_daily_availability(worker_id: int, first_day: date, last_day: date | None = None) -> int:
+    """Recompute ``DailyAvailability`` for ``worker_id`` over [first_day, last_day]; return rows stored.
+
+    ``last_day=None`` covers every later booking. Days without bookings have
+    their row removed. The query count does not depend on the range size.
+    """
+    worker = (
+        Worker.objects.filter(pk=worker_id)
+        .values_list("working_hours_start", "working_hours_end", "slot_step_minutes", "compact_slots")
+        .first()
+    )
+    if worker is None:
+        return 0
+    hours, step, compact = worker[:2], worker[2], worker[3]
+    bookings = Booking.objects.filter(worker_id=worker_id, date__gte=first_day).select_related("service")
+    rows = DailyAvailability.objects.filter(worker_id=worker_id, date__gte=first_day)
+    if last_day is not None:
+        bookings = bookings.filter(date__lte=last_day)
+        rows = rows.filter(date__lte=last_day)
+    durations = duration_map(worker_id)
+    intervals = _group_intervals(bookings, durations)
+
+    summaries = []
+    for day, day_intervals in intervals.items():
+        gaps = free_gaps(day, hours, day_intervals)
+        summaries.append(
+            DailyAvailability(
+                worker_id=worker_id,
+                date=day,
+                free_minutes=sum(end - start for start, end in gaps),
+                largest_gap_minutes=max(largest_gap(gaps, _clock(hours[0]), step, compact), 0),
+                gaps=[list(gap) for gap in gaps],
+            )
+        )
+    with transaction.atomic():
+        rows.delete()
+        DailyAvailability.objects.bulk_create(summaries, batch_size=500)
+    return len(summaries)
+
+
+def _summary_queryset(worker: Worker, first_day: date, last_day: date):
+    return DailyAvailability.objects.filter(worker=worker, date__gte=first_day, date__lte=last_day).values_list(
+        "date", "largest_gap_minutes", "gaps"
+    )
+
+
+def day_summaries(worker: Worker, first_day: date, last_day: date) -> dict[date, tuple[int, list]]:
+    """(largest gap, gaps) per booked day in [first_day, last_day]; missing days are fully free."""
+    return {day: (largest, gaps) for day, largest, gaps in _summary_queryset(worker, first_day, last_day)}
+
+
+async def aday_summaries(worker: Worker, first_day: date, last_day: date) -> dict[date, tuple[int, list]]:
+    """Async variant of :func:`day_summaries`."""
+    return {day: (largest, gaps) async for day, largest, gaps in _summary_queryset(worker, first_day, last_day)}
+
+
+def slots_for_day(
+    day: date,
+    duration: int,
+    hours: tuple[time, time],
+    intervals: list[Interval],
+    now: datetime,
+    step: int = SLOT_STEP_MINUTES,
+    compact: bool = False,
+) -> list[dict[str, object]]:
+    """Return candidate start times for ``day`` with an availability flag.
+
+    ``now`` is a naive local datetime; starts whose end is already in the past
+    are dropped for the current day. In ``compact`` mode only free starts
+    touching a booking or the edges of the day are returned.
+    """
+    start_dt = datetime.combine(day, hours[0])
+    end_dt = datetime.combine(day, hours[1])
+    if end_dt <= start_dt:
+        return []
+
+    last_start = end_dt - timedelta(minutes=duration)
+    if last_start < start_dt:
+        return []
+
+    length = timedelta(minutes=duration)
+    busy = sorted(intervals)
+
+    def is_past(slot: datetime) -> bool:
+        return slot.date() == now.date() and slot + length <= now
+
+    if compact:
+        candidates = {start_dt, last_start}
+        for begin, end in busy:
+            candidates.update((end, begin - length))
+        return [
+            {"time": slot.time().strftime("%H:%M"), "available": True}
+            for slot in sorted(candidates)
+            if start_dt <= slot <= last_start and not is_past(slot) and not overlaps((slot, slot + length), busy)
+        ]
+
+    step_delta = timedelta(minutes=step)
+    slots: list[dict[str, object]] = []
+    slot = start_dt
+    first_open = 0  # busy[:first_open] all end before the current slot
+    while slot <= last_start:
+        if is_past(slot):
+            slot += step_delta
+            continue
+
+        candidate_end = slot + length
+        while first_open < len(busy) and busy[first_open][1] <= slot:
+            first_open += 1
+        conflict = False
+        for begin, end in busy[first_open:]:
+            if begin >= candidate_end:
+                break
+            if end > slot:
+                conflict = True
+                break
+        slots.append(
+            {
+                "time": slot.time().strftime("%H:%M"),
+                "available": not conflict,
+            }
+        )
+        slot += step_delta
+
+    return slots
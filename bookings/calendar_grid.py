@@ -0,0 +1,76 @@
+"""
+Display data for the calendar page.
+
+The view resolves every cell's CSS class, label and link here, building each
+URL from a prefix computed once, so ``calendar.html`` only prints attributes
+instead of evaluating ``{% if %}`` chains, ``|date`` filters and
+``{% url %}`` tags for each of the 35-42 day cells and every time slot.
+"""
+from __future__ import annotations
+
+from datetime import date
+from typing import Callable, Iterable
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+CELL_CLASSES = {
+    "available": "day available",
+    "full": "day full",
+    "past": "day past",
+    "idle": "day idle",
+}
+SPACER_CLASS = "day spacer"
+
+
+def query_prefix(path: str = "", **params) -> str:
+    """``path?a=1&b=2&`` for the non-empty params, ready for one more ``key=value``."""
+    query = urlencode({key: value for key, value in params.items() if value not in (None, "")})
+    return f"{path}?{query}&" if query else f"{path}?"
+
+
+def month_cells(
+    month_weeks: Iterable[Iterable[date]],
+    month_start: date,
+    today: date,
+    fits: Callable[[date], bool] | None = None,
+    day_url: str = "",
+) -> list[list[dict]]:
+    """Cells for the month grid, one list per week.
+
+    ``fits(day)`` says whether the chosen service fits a day (None when no
+    worker/service is chosen); available days link to ``day_url`` plus
+    ``date=YYYY-MM-DD``.
+    """
+    weeks = []
+    for week in month_weeks:
+        cells = []
+        for day in week:
+            in_month = day.month == month_start.month
+            if day < today:
+                status = "past"
+            elif fits is not None and in_month:
+                status = "available" if fits(day) else "full"
+            else:
+                status = "idle"
+            cells.append(
+                {
+                    "date": day,
+                    "in_month": in_month,
+                    "status": status,
+                    "is_today": day == today,
+                    "css": CELL_CLASSES[status] if in_month else SPACER_CLASS,
+                    "label": str(day.day) if in_month else "",
+                    "url": f"{day_url}date={day.isoformat()}" if in_month and status == "available" else "",
+                }
+            )
+        weeks.append(cells)
+    return weeks
+
+
+def link_slots(slots: list[dict], worker_id: int, service_id: int, day: date) -> list[dict]:
+    """Add the booking form URL to each available slot (in place) and return ``slots``."""
+    prefix = query_prefix(reverse("book"), worker=worker_id, service=service_id, date=day.isoformat())
+    for slot in slots:
+        slot["url"] = f"{prefix}time={slot['time']}" if slot["available"] else ""
+    return slots
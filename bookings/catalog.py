@@ -0,0 +1,195 @@
+"""
+Read-through cache for the rarely changing catalog: active workers, services
+and the price list, kept separately for each location.
+
+Each entry has a version token in the shared Django cache. A lookup reads that
+token (one cache round trip, no SQL) and serves the process-local copy if it
+matches, else the shared copy stored under the token, else loads from the
+database. ``invalidate`` writes a fresh token, so every gunicorn worker sees
+the change on its next lookup; ``bookings.signals`` calls it on save/delete.
+
+Lookups use the location activated by ``bookings.tenancy`` for the request;
+cache keys lead with the location id, so one salon's entries are never read
+or invalidated by another's.
+
+Returned model instances are shared between requests and must be treated as
+read-only.
+"""
+from __future__ import annotations
+
+import threading
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django import forms
+from django.core.cache import cache
+from django.db import transaction
+from django.forms.models import ModelChoiceIterator
+
+from . import routing, tenancy
+from .models import Service, Worker
+
+CATALOG_TIMEOUT = 60 * 60
+KEY_PREFIX = "bookings:catalog"
+
+WORKERS = "workers"
+SERVICES = "services"
+PRICELIST = "pricelist"
+
+
+def _load_workers(location_id: int) -> list[Worker]:
+    return list(Worker.objects.filter(location_id=location_id, is_active=True))
+
+
+def _load_services(location_id: int) -> list[Service]:
+    return list(Service.objects.filter(location_id=location_id))
+
+
+def _load_pricelist(location_id: int) -> list[Worker]:
+    return list(
+        Worker.objects.filter(location_id=location_id, is_active=True).prefetch_related("service_prices__service")
+    )
+
+
+LOADERS = {WORKERS: _load_workers, SERVICES: _load_services, PRICELIST: _load_pricelist}
+
+_local: dict[tuple[int, str], tuple[str, list]] = {}
+_local_lock = threading.Lock()
+
+
+def _version_key(location_id: int, name: str) -> str:
+    return f"{KEY_PREFIX}:{location_id}:{name}:version"
+
+
+def _version(location_id: int, name: str) -> str:
+    key = _version_key(location_id, name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def get(name: str, location_id: int | None = None) -> list:
+    """Return the cached list for catalog entry ``name`` (current location by default)."""
+    location_id = location_id or tenancy.current_location_id()
+    version = _version(location_id, name)
+    local = _local.get((location_id, name))
+    if version is not None and local is not None and local[0] == version:
+        return list(local[1])
+
+    data_key = f"{KEY_PREFIX}:{location_id}:{name}:{version}"
+    objects = cache.get(data_key) if version is not None else None
+    if objects is None:
+        # Never cache rows read from a lagging replica.
+        with routing.primary():
+            objects = LOADERS[name](location_id)
+        if version is not None:
+            cache.set(data_key, objects, CATALOG_TIMEOUT)
+    if version is not None:
+        with _local_lock:
+            _local[(location_id, name)] = (version, objects)
+    return list(objects)
+
+
+def _bump(location_id: int, names) -> None:
+    for name in names:
+        cache.set(_version_key(location_id, name), uuid4().hex, None)
+    with _local_lock:
+        for name in names:
+            _local.pop((location_id, name), None)
+
+
+def invalidate(*names: str, location_id: int | None = None) -> None:
+    """Drop catalog entries (all of them by default) of a location in every process.
+
+    The version is bumped now and again after commit, so a reader that reloads
+    between the write and the commit cannot pin the old rows.
+    """
+    names = names or tuple(LOADERS)
+    location_id = location_id or tenancy.current_location_id()
+    _bump(location_id, names)
+    transaction.on_commit(lambda: _bump(location_id, names))
+
+
+def version_token(*names: str) -> str:
+    """Current versions of the given entries (all by default) for the current location."""
+    location_id = tenancy.current_location_id()
+    return ".".join([str(location_id), *(_version(location_id, name) or "" for name in names or LOADERS)])
+
+
+def active_workers() -> list[Worker]:
+    """Active workers ordered by name."""
+    return get(WORKERS)
+
+
+def services() -> list[Service]:
+    """All services ordered by name."""
+    return get(SERVICES)
+
+
+def pricelist() -> list[Worker]:
+    """Active workers with ``service_prices`` (and their services) prefetched."""
+    return get(PRICELIST)
+
+
+def active_worker(worker_id) -> Worker | None:
+    """Active worker with the given id, or None."""
+    return next((worker for worker in active_workers() if str(worker.pk) == str(worker_id)), None)
+
+
+def worker_prices(worker_id) -> list:
+    """``WorkerServicePrice`` rows (with services) for an active worker."""
+    for worker in pricelist():
+        if str(worker.pk) == str(worker_id):
+            return list(worker.service_prices.all())
+    return []
+
+
+aactive_workers = sync_to_async(active_workers)
+aservices = sync_to_async(services)
+aworker_prices = sync_to_async(worker_prices)
+
+
+class CatalogChoiceIterator(ModelChoiceIterator):
+    """Choices from the catalog instead of the field's queryset."""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for obj in self.field.catalog():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(self.field.catalog()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.catalog())
+
+
+class CatalogModelChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField that renders and validates against a catalog list, without SQL.
+
+    ``queryset`` is kept for ModelForm machinery; ``catalog`` must return the
+    same rows.
+    """
+
+    iterator = CatalogChoiceIterator
+
+    def __init__(self, queryset, *, catalog, **kwargs):
+        self.catalog = catalog
+        super().__init__(queryset, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, self.queryset.model):
+            value = value.pk
+        for obj in self.catalog():
+            if str(obj.pk) == str(value):
+                return obj
+        raise forms.ValidationError(
+            self.error_messages["invalid_choice"],
+            code="invalid_choice",
+            params={"value": value},
+        )
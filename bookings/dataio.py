@@ -0,0 +1,451 @@
+"""
+Streaming CSV / JSON Lines import and export for salon data.
+
+Exports read with ``values_list(...).iterator(chunk_size=...)`` so memory stays
+flat regardless of history size. Imports are validated and written in chunks
+with ``bulk_create`` / ``bulk_update`` inside one transaction, so a failed
+import leaves the database untouched.
+
+Services are matched by name (ids differ between environments); workers keep
+their ids so prices and bookings can reference them with ``worker_id``. Both
+directions work on the current location (see ``bookings.tenancy``).
+"""
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+import json
+from typing import IO, Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import availability, catalog, tenancy
+from .http_caching import invalidate_worker_pages
+from .models import Booking, Service, Worker, WorkerServicePrice
+
+DEFAULT_CHUNK_SIZE = 1000
+FORMATS = ("csv", "json")
+
+COLUMNS: dict[str, tuple[str, ...]] = {
+    "workers": (
+        "id",
+        "full_name",
+        "is_active",
+        "role",
+        "bio",
+        "working_hours_start",
+        "working_hours_end",
+        "slot_step_minutes",
+        "compact_slots",
+    ),
+    "services": ("name", "description", "duration_minutes", "slot_step_minutes"),
+    "prices": ("worker_id", "service", "price", "duration_minutes"),
+    "bookings": ("worker_id", "service", "date", "time", "phone", "email", "created_at"),
+}
+KINDS = tuple(COLUMNS)
+
+_EXPORT_MODELS = {"workers": Worker, "services": Service, "prices": WorkerServicePrice, "bookings": Booking}
+_EXPORT_ORDERING = {
+    "workers": ("id",),
+    "services": ("name",),
+    "prices": ("worker_id", "service__name"),
+    "bookings": ("date", "time", "id"),
+}
+# Column -> ORM lookup where they differ.
+_LOOKUPS = {"service": "service__name"}
+
+
+class DataImportError(Exception):
+    """Raised when an import has validation errors; the transaction is rolled back."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__(f"{len(errors)} row(s) failed validation")
+        self.errors = errors
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: list[str] = field(default_factory=list)
+    # worker id -> (first, last) day whose DailyAvailability rows need refreshing; last None = open-ended.
+    stale_days: dict[int, tuple[date, date | None]] = field(default_factory=dict, repr=False)
+    # Keys already imported from this file (worker ids, booking slots) -> row number.
+    seen: dict[object, int] = field(default_factory=dict, repr=False)
+
+    def mark_stale(self, worker_id: int, first: date, last: date | None = None) -> None:
+        if worker_id in self.stale_days:
+            old_first, old_last = self.stale_days[worker_id]
+            first = min(first, old_first)
+            last = None if last is None or old_last is None else max(last, old_last)
+        self.stale_days[worker_id] = (first, last)
+
+
+# --- export -----------------------------------------------------------------
+
+def iter_export_rows(kind: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[dict]:
+    """Yield one dict per row of ``kind`` without materialising the queryset."""
+    columns = COLUMNS[kind]
+    lookups = [_LOOKUPS.get(column, column) for column in columns]
+    queryset = (
+        _EXPORT_MODELS[kind]
+        .objects.filter(location_id=tenancy.current_location_id())
+        .order_by(*_EXPORT_ORDERING[kind])
+        .values_list(*lookups)
+    )
+    for values in queryset.iterator(chunk_size=chunk_size):
+        yield dict(zip(columns, values))
+
+
+def _serialize(value) -> object:
+    if value is None:
+        return None
+    if isinstance(value, (date, time, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def write_rows(rows: Iterable[dict], columns: tuple[str, ...], stream: IO[str], fmt: str) -> int:
+    """Write rows as CSV or JSON Lines to ``stream``; return the row count."""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(["" if row[c] is None else _serialize(row[c]) for c in columns])
+            count += 1
+    else:
+        for row in rows:
+            stream.write(json.dumps({c: _serialize(row[c]) for c in columns}, ensure_ascii=False))
+            stream.write("\n")
+            count += 1
+    return count
+
+
+# --- import -----------------------------------------------------------------
+
+def read_rows(stream: IO[str], fmt: str) -> Iterator[dict]:
+    """Yield dicts from a CSV file or a JSON Lines file, one line at a time."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _chunks(rows: Iterable[dict], size: int) -> Iterator[list[tuple[int, dict]]]:
+    numbered = enumerate(rows, start=1)
+    while chunk := list(islice(numbered, size)):
+        yield chunk
+
+
+def _clean(model, name: str, raw):
+    """Coerce and validate one raw value with the model field's own rules."""
+    model_field = model._meta.get_field(name)
+    if raw == "" or raw is None:
+        if model_field.has_default():
+            raw = model_field.get_default()
+        else:
+            raw = None if model_field.null else ""
+    return model_field.clean(raw, None)
+
+
+def _clean_row(model, row: dict, names: Iterable[str], line: int, result: ImportResult) -> dict | None:
+    cleaned = {}
+    for name in names:
+        if name not in row:
+            continue
+        try:
+            cleaned[name] = _clean(model, name, row[name])
+        except ValidationError as exc:
+            result.errors.append(f"row {line}: {name}: {'; '.join(exc.messages)}")
+            return None
+    return cleaned
+
+
+def _import_workers(chunk, result: ImportResult, batch_size: int) -> None:
+    names = [c for c in COLUMNS["workers"] if c != "id"]
+    rows = []
+    for line, row in chunk:
+        cleaned = _clean_row(Worker, row, names, line, result)
+        if cleaned is None:
+            continue
+        worker_id = row.get("id") or None
+        rows.append((line, int(worker_id) if worker_id else None, cleaned))
+
+    explicit_ids = [worker_id for _, worker_id, _ in rows if worker_id]
+    existing = Worker.objects.filter(location_id=tenancy.current_location_id()).in_bulk(explicit_ids)
+    # Ids taken by another location's workers would fail bulk_create with an IntegrityError.
+    taken = set(Worker.objects.filter(id__in=explicit_ids).exclude(id__in=existing).values_list("id", flat=True))
+    to_create, to_update, fields = [], [], set()
+    for line, worker_id, cleaned in rows:
+        if worker_id:
+            if worker_id in taken:
+                result.errors.append(f"row {line}: id: worker {worker_id} belongs to another location")
+                continue
+            first_line = result.seen.setdefault(("worker", worker_id), line)
+            if first_line != line:
+                result.errors.append(f"row {line}: id: worker {worker_id} already imported from row {first_line}")
+                continue
+        if worker_id in existing:
+            worker = existing[worker_id]
+            for name, value in cleaned.items():
+                setattr(worker, name, value)
+            fields.update(cleaned)
+            to_update.append(worker)
+        else:
+            to_create.append(Worker(id=worker_id, **cleaned))
+    Worker.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        now = timezone.now()
+        for worker in to_update:
+            worker.updated_at = now
+        Worker.objects.bulk_update(to_update, sorted(fields | {"updated_at"}), batch_size=batch_size)
+        for worker in to_update:
+            result.mark_stale(worker.id, timezone.localdate())
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def _import_services(chunk, result: ImportResult, batch_size: int) -> None:
+    names = ("description", "duration_minutes", "slot_step_minutes")
+    rows = []
+    for line, row in chunk:
+        name = (row.get("name") or "").strip()
+        if not name:
+            result.errors.append(f"row {line}: name: This field is required.")
+            continue
+        cleaned = _clean_row(Service, row, names, line, result)
+        if cleaned is not None:
+            rows.append((name, cleaned))
+
+    services = Service.objects.filter(location_id=tenancy.current_location_id(), name__in=[name for name, _ in rows])
+    existing = {s.name: s for s in services}
+    to_create, to_update, fields = {}, [], set()
+    for name, cleaned in rows:
+        if name in existing:
+            service = existing[name]
+            for attr, value in cleaned.items():
+                setattr(service, attr, value)
+            fields.update(cleaned)
+            to_update.append(service)
+        else:
+            to_create[name] = Service(name=name, **cleaned)
+    Service.objects.bulk_create(to_create.values(), batch_size=batch_size)
+    if to_update:
+        now = timezone.now()
+        for service in to_update:
+            service.updated_at = now
+        Service.objects.bulk_update(to_update, sorted(fields | {"updated_at"}), batch_size=batch_size)
+        today = timezone.localdate()
+        affected = Booking.objects.filter(service__in=to_update, date__gte=today).values_list("worker_id", flat=True)
+        for worker_id in set(affected):
+            result.mark_stale(worker_id, today)
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def _resolve_refs(chunk) -> tuple[set[int], dict[str, Service]]:
+    """Load the workers and services a chunk refers to with one query each."""
+    worker_ids, service_names = set(), set()
+    for _, row in chunk:
+        if str(row.get("worker_id") or "").isdigit():
+            worker_ids.add(int(row["worker_id"]))
+        if row.get("service"):
+            service_names.add(row["service"].strip())
+    location_id = tenancy.current_location_id()
+    known_workers = set(Worker.objects.filter(location_id=location_id, id__in=worker_ids).values_list("id", flat=True))
+    services = {s.name: s for s in Service.objects.filter(location_id=location_id, name__in=service_names)}
+    return known_workers, services
+
+
+def _row_refs(row: dict, line: int, known_workers, services, result: ImportResult, service_required: bool):
+    worker_id = str(row.get("worker_id") or "")
+    if not worker_id.isdigit() or int(worker_id) not in known_workers:
+        result.errors.append(f"row {line}: worker_id: unknown worker {worker_id!r}")
+        return None
+    service_name = (row.get("service") or "").strip()
+    service = services.get(service_name)
+    if service is None and (service_name or service_required):
+        result.errors.append(f"row {line}: service: unknown service {service_name!r}")
+        return None
+    return int(worker_id), service
+
+
+def _import_prices(chunk, result: ImportResult, batch_size: int) -> None:
+    known_workers, services = _resolve_refs(chunk)
+    rows = []
+    for line, row in chunk:
+        refs = _row_refs(row, line, known_workers, services, result, service_required=True)
+        cleaned = _clean_row(WorkerServicePrice, row, ("price", "duration_minutes"), line, result) if refs else None
+        if cleaned is not None:
+            rows.append((refs[0], refs[1], cleaned))
+
+    existing = {
+        (p.worker_id, p.service_id): p
+        for p in WorkerServicePrice.objects.filter(
+            worker_id__in={w for w, _, _ in rows}, service_id__in={s.id for _, s, _ in rows}
+        )
+    }
+    to_create, to_update, fields = {}, [], set()
+    for worker_id, service, cleaned in rows:
+        key = (worker_id, service.id)
+        if key in existing:
+            price = existing[key]
+            for attr, value in cleaned.items():
+                setattr(price, attr, value)
+            fields.update(cleaned)
+            to_update.append(price)
+        else:
+            to_create[key] = WorkerServicePrice(worker_id=worker_id, service=service, **cleaned)
+    WorkerServicePrice.objects.bulk_create(to_create.values(), batch_size=batch_size)
+    if to_update:
+        now = timezone.now()
+        for price in to_update:
+            price.updated_at = now
+        WorkerServicePrice.objects.bulk_update(to_update, sorted(fields | {"updated_at"}), batch_size=batch_size)
+    for worker_id in {worker_id for worker_id, _, _ in rows}:
+        result.mark_stale(worker_id, timezone.localdate())
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def _import_bookings(chunk, result: ImportResult, batch_size: int, skip_conflicts: bool) -> None:
+    known_workers, services = _resolve_refs(chunk)
+    rows = []
+    for line, row in chunk:
+        refs = _row_refs(row, line, known_workers, services, result, service_required=False)
+        cleaned = _clean_row(Booking, row, ("date", "time", "phone", "email"), line, result) if refs else None
+        if cleaned is None:
+            continue
+        if cleaned.get("date") is None or cleaned.get("time") is None:
+            result.errors.append(f"row {line}: date/time: This field is required.")
+            continue
+        rows.append((line, refs[0], refs[1], cleaned))
+    if not rows:
+        return
+
+    # Preload every existing interval the chunk could collide with: one query for
+    # bookings in the chunk's worker/date window, one for worker-specific durations.
+    worker_ids = {worker_id for _, worker_id, _, _ in rows}
+    days = [cleaned["date"] for _, _, _, cleaned in rows]
+    durations = availability.durations_for_workers(worker_ids)
+
+    def minutes(worker_id: int, service_id: int | None, default: int | None) -> int:
+        if service_id is None:
+            return availability.DEFAULT_DURATION_MINUTES
+        return durations.get((worker_id, service_id), default)
+
+    existing = Booking.objects.filter(worker_id__in=worker_ids, date__gte=min(days), date__lte=max(days)).values_list(
+        "id", "worker_id", "date", "time", "service_id", "service__duration_minutes"
+    )
+    intervals: dict[tuple[int, date], dict[time, tuple[datetime, datetime]]] = {}
+    booking_ids: dict[tuple[int, date, time], int] = {}
+    for booking_id, worker_id, day, start, service_id, default in existing:
+        begin = datetime.combine(day, start)
+        intervals.setdefault((worker_id, day), {})[start] = (
+            begin,
+            begin + timedelta(minutes=minutes(worker_id, service_id, default)),
+        )
+        booking_ids[(worker_id, day, start)] = booking_id
+
+    to_create, to_update = [], []
+    for line, worker_id, service, cleaned in rows:
+        day, start = cleaned["date"], cleaned["time"]
+        key = (worker_id, day, start)
+        first_line = result.seen.setdefault(key, line)
+        if first_line != line:
+            if skip_conflicts:
+                result.skipped += 1
+            else:
+                result.errors.append(f"row {line}: duplicates row {first_line} for worker {worker_id} on {day} at {start}")
+            continue
+        begin = datetime.combine(day, start)
+        end = begin + timedelta(
+            minutes=minutes(worker_id, service.id if service else None, service.duration_minutes if service else None)
+        )
+        day_intervals = intervals.setdefault((worker_id, day), {})
+        clash = any(
+            begin < other_end and end > other_begin
+            for other_start, (other_begin, other_end) in day_intervals.items()
+            if other_start != start
+        )
+        if clash:
+            if skip_conflicts:
+                result.skipped += 1
+            else:
+                result.errors.append(f"row {line}: conflicts with another booking for worker {worker_id} on {day} at {start}")
+            continue
+
+        day_intervals[start] = (begin, end)
+        booking = Booking(worker_id=worker_id, service=service, **cleaned)
+        if key in booking_ids:
+            booking.id = booking_ids[key]
+            to_update.append(booking)
+        else:
+            to_create.append(booking)
+
+    Booking.objects.bulk_create(to_create, batch_size=batch_size)
+    if to_update:
+        # bulk_update() skips auto_now, and feed ETags depend on updated_at.
+        now = timezone.now()
+        for booking in to_update:
+            booking.updated_at = now
+        Booking.objects.bulk_update(to_update, ["service", "phone", "email", "updated_at"], batch_size=batch_size)
+    for booking in to_create + to_update:
+        result.mark_stale(booking.worker_id, booking.date, booking.date)
+    result.created += len(to_create)
+    result.updated += len(to_update)
+
+
+def import_rows(
+    kind: str,
+    rows: Iterable[dict],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    skip_conflicts: bool = False,
+) -> ImportResult:
+    """Validate and upsert ``rows`` of ``kind`` in chunks inside one transaction.
+
+    Raises :class:`DataImportError` (after rolling back) if any row is invalid.
+    """
+    result = ImportResult()
+    with transaction.atomic():
+        for chunk in _chunks(rows, chunk_size):
+            if kind == "workers":
+                _import_workers(chunk, result, chunk_size)
+            elif kind == "services":
+                _import_services(chunk, result, chunk_size)
+            elif kind == "prices":
+                _import_prices(chunk, result, chunk_size)
+            else:
+                _import_bookings(chunk, result, chunk_size, skip_conflicts)
+        if result.errors:
+            # Raising inside atomic() rolls back every chunk written so far.
+            raise DataImportError(result.errors)
+        if kind == "workers" and result.created:
+            # Explicit ids don't advance PostgreSQL's sequence; the next Worker.objects.create() would collide.
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), [Worker]):
+                    cursor.execute(sql)
+        # bulk_create/bulk_update bypass the signals that maintain the availability
+        # summary, the cached calendar pages and the catalog cache.
+        for worker_id, (first, last) in result.stale_days.items():
+            availability.refresh_daily_availability(worker_id, first, last)
+            invalidate_worker_pages(worker_id)
+        if kind != "bookings":
+            catalog.invalidate()
+        if dry_run:
+            transaction.set_rollback(True)
+    return result
@@ -0,0 +1,204 @@
+"""
+Per-worker schedule feeds (iCalendar and CSV).
+
+Rows are read with ``values_list(...).iterator(chunk_size=...)`` and durations
+are resolved from one ``WorkerServicePrice`` query up front, so a feed streams
+in constant memory whatever the length of the worker's history. The ETag is
+derived from aggregates over the same rows, letting calendar apps that poll
+the feed get a 304 without the body being generated.
+"""
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+import hashlib
+from typing import Iterable, Iterator, NamedTuple
+
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from . import availability
+from .models import Booking, Worker
+
+FEED_CHUNK_SIZE = 500
+# Calendar subscriptions only need recent history; CSV exports default to all of it.
+ICS_LOOKBACK_DAYS = 90
+CSV_COLUMNS = ("date", "start", "end", "duration_minutes", "service", "phone", "email", "created_at")
+
+_ROW_FIELDS = ("id", "date", "time", "service_id", "service__name", "service__duration_minutes", "phone", "email", "created_at", "updated_at")
+
+
+class ScheduleEntry(NamedTuple):
+    id: int
+    start: datetime
+    end: datetime
+    duration: int
+    service: str
+    phone: str
+    email: str
+    created_at: datetime
+    updated_at: datetime
+
+
+def schedule_queryset(worker: Worker, since: date | None = None):
+    """Bookings for ``worker`` from ``since`` onwards in start order (uses the worker/date/time unique index)."""
+    queryset = Booking.objects.filter(worker=worker)
+    if since is not None:
+        queryset = queryset.filter(date__gte=since)
+    return queryset
+
+
+def schedule_etag(worker: Worker, since: date | None, durations: dict[int, int], fmt: str) -> str:
+    """Fingerprint the feed from aggregates instead of reading every row.
+
+    Count and max id change on create/delete, max ``updated_at`` on edits, the
+    services' max ``updated_at`` on renames and default duration changes, and
+    the duration map covers worker price changes that move end times.
+    """
+    stats = schedule_queryset(worker, since).aggregate(
+        count=Count("id"),
+        last_id=Max("id"),
+        changed=Max("updated_at"),
+        services_changed=Max("service__updated_at"),
+    )
+    parts = [
+        fmt,
+        str(worker.pk),
+        worker.full_name,
+        since.isoformat() if since else "",
+        str(stats["count"]),
+        str(stats["last_id"] or 0),
+        stats["changed"].isoformat() if stats["changed"] else "",
+        stats["services_changed"].isoformat() if stats["services_changed"] else "",
+        repr(sorted(durations.items())),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def iter_schedule(
+    worker: Worker, since: date | None, durations: dict[int, int], chunk_size: int = FEED_CHUNK_SIZE
+) -> Iterator[ScheduleEntry]:
+    """Yield the worker's bookings with start/end resolved, one DB chunk at a time."""
+    rows = (
+        schedule_queryset(worker, since)
+        .order_by("date", "time", "id")
+        .values_list(*_ROW_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+    for booking_id, day, start_time, service_id, service_name, default, phone, email, created_at, updated_at in rows:
+        if service_id is None:
+            minutes = availability.DEFAULT_DURATION_MINUTES
+        else:
+            minutes = durations.get(service_id, default)
+        start = datetime.combine(day, start_time)
+        yield ScheduleEntry(
+            booking_id,
+            start,
+            start + timedelta(minutes=minutes),
+            minutes,
+            service_name or "",
+            phone,
+            email,
+            created_at,
+            updated_at,
+        )
+
+
+def buffered(chunks: Iterable[str], size: int = 100) -> Iterator[str]:
+    """Join small chunks so the server writes a few KB at a time rather than one row."""
+    pending: list[str] = []
+    for chunk in chunks:
+        pending.append(chunk)
+        if len(pending) >= size:
+            yield "".join(pending)
+            pending = []
+    if pending:
+        yield "".join(pending)
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_csv(entries: Iterable[ScheduleEntry]) -> Iterator[str]:
+    """Render entries as CSV, one line per yielded chunk."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for entry in entries:
+        yield writer.writerow(
+            [
+                entry.start.date().isoformat(),
+                entry.start.strftime("%H:%M"),
+                entry.end.strftime("%H:%M"),
+                entry.duration,
+                entry.service,
+                entry.phone,
+                entry.email,
+                timezone.localtime(entry.created_at).isoformat(timespec="seconds"),
+            ]
+        )
+
+
+def _ics_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def _ics_fold(line: str) -> str:
+    """Fold a content line at 75 octets as RFC 5545 requires."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, chunk = [], b""
+    for char in line:
+        piece = char.encode()
+        if len(chunk) + len(piece) > (75 if not parts else 74):
+            parts.append(chunk.decode())
+            chunk = b""
+        chunk += piece
+    parts.append(chunk.decode())
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def _ics_utc(value: datetime) -> str:
+    """Format a datetime as UTC; naive values are booking wall-clock times in TIME_ZONE."""
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def iter_ics(worker: Worker, entries: Iterable[ScheduleEntry], host: str = "salon") -> Iterator[str]:
+    """Render entries as an iCalendar feed, one VEVENT per yielded chunk."""
+    yield "".join(
+        _ics_fold(line)
+        for line in (
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Sky Salon and Beauty//Bookings//EN",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_ics_escape(worker.full_name)} bookings",
+        )
+    )
+    for entry in entries:
+        summary = entry.service or "Booking"
+        description = f"Phone: {entry.phone}"
+        if entry.email:
+            description += f"\nEmail: {entry.email}"
+        yield "".join(
+            _ics_fold(line)
+            for line in (
+                "BEGIN:VEVENT",
+                f"UID:booking-{entry.id}@{host}",
+                f"DTSTAMP:{_ics_utc(entry.updated_at)}",
+                f"LAST-MODIFIED:{_ics_utc(entry.updated_at)}",
+                f"DTSTART:{_ics_utc(entry.start)}",
+                f"DTEND:{_ics_utc(entry.end)}",
+                f"SUMMARY:{_ics_escape(summary)}",
+                f"DESCRIPTION:{_ics_escape(description)}",
+                "END:VEVENT",
+            )
+        )
+    yield "END:VCALENDAR\r\n"
@@ -1,21 +1,41 @@
 from __future__ import annotations
 
-from datetime import date, time
+from datetime import date, datetime, time, timedelta
 from django import forms
 from django.utils import timezone
-from .models import Booking, Worker, Service
+from . import availability, catalog, idempotency
+from .models import Booking, Worker, Service, WaitlistEntry
 
 
 class BookingForm(forms.ModelForm):
     date = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
-    time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time", "step": 900}))
-    worker = forms.ModelChoiceField(queryset=Worker.objects.filter(is_active=True), empty_label="Select a worker")
-    service = forms.ModelChoiceField(queryset=Service.objects.all(), required=True, help_text="", empty_label="Select a service")
+    # Offered starts follow each worker's/service's slot step (and compact mode can
+    # offer e.g. 10:40 right after a booking), so the input accepts any minute.
+    time = forms.TimeField(widget=forms.TimeInput(attrs={"type": "time", "step": 60}))
+    # Choices come from the cached catalog so rendering the form runs no queries.
+    worker = catalog.CatalogModelChoiceField(
+        queryset=Worker.objects.filter(is_active=True), catalog=catalog.active_workers, empty_label="Select a worker"
+    )
+    service = catalog.CatalogModelChoiceField(
+        queryset=Service.objects.all(),
+        catalog=catalog.services,
+        required=True,
+        help_text="",
+        empty_label="Select a service",
+    )
+
+    # Lets the view recognise a replayed POST (double click, browser retry); see bookings.idempotency.
+    idempotency_key = forms.CharField(widget=forms.HiddenInput, required=False)
 
     class Meta:
         model = Booking
         fields = ["worker", "service", "date", "time", "phone", "email"]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not self.is_bound:
+            self.fields["idempotency_key"].initial = idempotency.new_key()
+
     def clean(self):
         cleaned = super().clean()
         selected_date: date | None = cleaned.get("date")
@@ -28,11 +48,63 @@ class BookingForm(forms.ModelForm):
             if dt < timezone.now():
                 raise forms.ValidationError("Please choose a future date and time.")
 
+        # Loaded once here and reused by validate_unique(): worker durations come
+        # from the catalog, the day's bookings from a single query.
+        self._day_bookings = None
         if selected_worker and selected_service and selected_date and selected_time:
-            if Booking.has_conflict(selected_worker, selected_date, selected_time, selected_service):
+            durations = availability.durations_from_prices(catalog.worker_prices(selected_worker.pk))
+            self._day_bookings = availability.day_bookings(
+                selected_worker.pk, selected_date, durations, exclude_id=self.instance.pk
+            )
+            start = datetime.combine(selected_date, selected_time)
+            end = start + timedelta(minutes=availability.service_duration(selected_service, durations))
+            if availability.overlaps((start, end), self._day_bookings.values()):
                 raise forms.ValidationError("This time slot conflicts with an existing appointment.")
 
         return cleaned
 
+    def _get_validation_exclusions(self):
+        # worker/service were already resolved against the catalog; skip the
+        # model's per-ForeignKey existence queries.
+        exclude = super()._get_validation_exclusions()
+        exclude.update({"worker", "service"})
+        return exclude
+
+    def validate_unique(self):
+        day_bookings = getattr(self, "_day_bookings", None)
+        if day_bookings is None:
+            return super().validate_unique()
+        if self.cleaned_data.get("time") in day_bookings:
+            self._update_errors(self.instance.unique_error_message(Booking, ("worker", "date", "time")))
+
+
+class WaitlistForm(forms.ModelForm):
+    """Join the waitlist for a worker/service within a date range."""
+
+    earliest_date = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
+    latest_date = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
+    worker = catalog.CatalogModelChoiceField(
+        queryset=Worker.objects.filter(is_active=True), catalog=catalog.active_workers, empty_label="Select a worker"
+    )
+    service = catalog.CatalogModelChoiceField(
+        queryset=Service.objects.all(), catalog=catalog.services, empty_label="Select a service"
+    )
 
+    class Meta:
+        model = WaitlistEntry
+        fields = ["worker", "service", "earliest_date", "latest_date", "email", "phone"]
+
+    def clean(self):
+        cleaned = super().clean()
+        earliest: date | None = cleaned.get("earliest_date")
+        latest: date | None = cleaned.get("latest_date")
+        if earliest and earliest < timezone.localdate():
+            self.add_error("earliest_date", "Please choose a date from today onwards.")
+        if earliest and latest and latest < earliest:
+            self.add_error("latest_date", "The end of the range must not be before its start.")
+        return cleaned
 
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.update({"worker", "service"})
+        return exclude
@@ -0,0 +1,180 @@
+"""
+HTTP caching for the public catalog pages.
+
+``public_page`` answers conditional GETs with 304 from validators computed
+off the catalog cache (no SQL), and marks 200/304 responses cacheable by
+browsers and shared caches. The ETag fingerprints the ids and ``updated_at``
+of every row a page shows, so it also changes when a row is removed or
+deactivated; Last-Modified is the newest ``updated_at`` among them, which a
+removal alone does not advance. Django checks If-None-Match first, so
+clients that send both are always covered.
+
+A page rendered while flash messages are pending is never cached or
+answered with 304, otherwise the message would be lost or shown again later.
+
+``anonymous_page_cache`` stores whole rendered pages server-side for visitors
+without a session, keyed on the normalized query, the current 15-minute
+bucket, the catalog version and a per-worker version that booking writes
+bump through ``invalidate_worker_pages``.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from functools import wraps
+import hashlib
+import time
+from typing import Callable, Iterable
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers, patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from . import catalog, routing
+
+Validators = tuple[str | None, datetime | None]
+
+PAGE_CACHE_BUCKET = 15 * 60
+PAGE_KEY_PREFIX = "bookings:page"
+
+
+def row_validators(rows: Iterable[Model], *extra: str) -> Validators:
+    """(ETag, Last-Modified) for a page built from ``rows`` plus any ``extra`` inputs."""
+    parts = list(extra)
+    last_modified = None
+    for row in rows:
+        parts.append(f"{row._meta.label_lower}:{row.pk}:{row.updated_at.isoformat()}")
+        if last_modified is None or row.updated_at > last_modified:
+            last_modified = row.updated_at
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32], last_modified
+
+
+def has_pending_messages(request) -> bool:
+    """Whether flash messages are waiting to be shown, without consuming them."""
+    return bool(len(messages.get_messages(request)))
+
+
+def public_page(validators: Callable[..., Validators], **cache_control) -> Callable:
+    """Conditional GET plus ``Cache-Control: public`` with ``cache_control`` options.
+
+    ``validators(request, *args, **kwargs)`` returns (etag, last_modified)
+    and is evaluated once per request.
+    """
+
+    def decorator(view):
+        def resolve(request, *args, **kwargs) -> Validators:
+            if not hasattr(request, "_page_validators"):
+                request._page_validators = validators(request, *args, **kwargs)
+            return request._page_validators
+
+        conditional = condition(
+            etag_func=lambda request, *args, **kwargs: resolve(request, *args, **kwargs)[0],
+            last_modified_func=lambda request, *args, **kwargs: resolve(request, *args, **kwargs)[1],
+        )(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            if has_pending_messages(request):
+                response = view(request, *args, **kwargs)
+                add_never_cache_headers(response)
+                return response
+            response = conditional(request, *args, **kwargs)
+            if response.status_code in (200, 304):
+                patch_cache_control(response, public=True, **cache_control)
+                # A messages cookie must reach the server; keep per-cookie copies apart.
+                patch_vary_headers(response, ("Cookie",))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _worker_version_key(worker_id) -> str:
+    return f"{PAGE_KEY_PREFIX}:worker:{worker_id}:version"
+
+
+def _bump_worker(worker_id) -> None:
+    cache.set(_worker_version_key(worker_id), uuid4().hex, None)
+
+
+def invalidate_worker_pages(worker_id) -> None:
+    """Drop cached pages for ``worker_id``, now and again after commit (see ``catalog.invalidate``)."""
+    _bump_worker(worker_id)
+    transaction.on_commit(lambda: _bump_worker(worker_id))
+
+
+def _cacheable_request(request) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        # Visitors who just wrote read the primary; keep their pages out of the shared cache.
+        and routing.PIN_COOKIE not in request.COOKIES
+        and not has_pending_messages(request)
+    )
+
+
+def _page_key(request, view_name: str, params: tuple[str, ...], worker_param: str) -> str:
+    query = urlencode([(name, request.GET[name]) for name in params if request.GET.get(name)])
+    worker_id = request.GET.get(worker_param) or ""
+    worker_version = cache.get(_worker_version_key(worker_id)) if worker_id else ""
+    parts = [
+        view_name,
+        str(int(time.time() // PAGE_CACHE_BUCKET)),
+        catalog.version_token(),
+        worker_version or "",
+        query,
+    ]
+    return f"{PAGE_KEY_PREFIX}:{hashlib.sha256('|'.join(parts).encode()).hexdigest()[:32]}"
+
+
+def _lookup(request, view_name: str, params: tuple[str, ...], worker_param: str):
+    """(key, cached (content, content_type) or None); key is None when the request must not be cached."""
+    if not _cacheable_request(request):
+        return None, None
+    key = _page_key(request, view_name, params, worker_param)
+    return key, cache.get(key)
+
+
+def _storable(request, response) -> bool:
+    # A CSRF token or message rendered into the page, or any cookie, is per visitor.
+    return (
+        response.status_code == 200
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        and not has_pending_messages(request)
+    )
+
+
+def anonymous_page_cache(params: tuple[str, ...], worker_param: str = "worker") -> Callable:
+    """Cache an async view's rendered page for anonymous visitors until the 15-minute bucket ends.
+
+    Only the query parameters in ``params`` vary the page; the one named
+    ``worker_param`` also selects the per-worker version.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            key, cached = await sync_to_async(_lookup)(request, view.__name__, params, worker_param)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            response = await view(request, *args, **kwargs)
+            if key is not None and _storable(request, response):
+                timeout = PAGE_CACHE_BUCKET - int(time.time() % PAGE_CACHE_BUCKET)
+                await cache.aset(key, (response.content, response["Content-Type"]), timeout)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,79 @@
+"""
+Idempotency keys for the booking form.
+
+Each rendered form carries a random key in a hidden field. The first POST with
+a key claims it in the shared Django cache; once the booking is saved the key
+maps to its id, and any replay of that POST (double click, browser retry) is
+answered from the cache without validating, saving or emailing again. A POST
+that fails validation releases its key so the corrected form can be resubmitted.
+
+The cache is only the fast path: ``add()`` is a get-then-set on some backends
+(e.g. the file cache), so two concurrent POSTs can both claim a key. The key is
+also stored in the unique ``Booking.idempotency_key`` column, and a request
+that fails to book checks it with ``saved_booking_id`` before reporting an
+error.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .models import Booking
+
+IDEMPOTENCY_TTL = 10 * 60
+KEY_PREFIX = "bookings:idempotency"
+PENDING = "pending"
+# A replay arriving while the first request still runs waits this long for its result.
+PENDING_WAIT_SECONDS = 5.0
+PENDING_POLL_SECONDS = 0.1
+
+_KEY_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def new_key() -> str:
+    return uuid4().hex
+
+
+def is_valid(key: str | None) -> bool:
+    return bool(key) and bool(_KEY_RE.match(key))
+
+
+def _cache_key(key: str) -> str:
+    return f"{KEY_PREFIX}:{key}"
+
+
+async def aclaim(key: str) -> bool:
+    """Reserve ``key`` for this request; False if another request already has it."""
+    return await cache.aadd(_cache_key(key), PENDING, IDEMPOTENCY_TTL)
+
+
+async def acomplete(key: str, booking_id: int) -> None:
+    await cache.aset(_cache_key(key), booking_id, IDEMPOTENCY_TTL)
+
+
+async def arelease(key: str) -> None:
+    await cache.adelete(_cache_key(key))
+
+
+def saved_booking_id(key: str) -> int | None:
+    """Id of the booking already saved under ``key``, from the database."""
+    return Booking.objects.filter(idempotency_key=key).values_list("id", flat=True).first()
+
+
+async def aresult(key: str, wait: float = PENDING_WAIT_SECONDS) -> int | None:
+    """Booking id stored for ``key``, waiting up to ``wait`` seconds while it is pending.
+
+    Returns None if the first request released the key or is still running.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while True:
+        value = await cache.aget(_cache_key(key))
+        if value != PENDING:
+            return value
+        if loop.time() >= deadline:
+            return None
+        await asyncio.sleep(PENDING_POLL_SECONDS)
@@ -0,0 +1,104 @@
+"""
+Responsive variants for uploaded worker photos.
+
+Each upload is cropped to a square (the cards render it with ``aspect-ratio: 1/1``)
+and saved at a few widths as JPEG and WebP next to the original. The generated
+file names are recorded on ``Worker.photo_variants`` so templates can build a
+``srcset`` without touching the storage backend.
+"""
+from __future__ import annotations
+
+from io import BytesIO
+import logging
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import catalog
+
+logger = logging.getLogger(__name__)
+
+PHOTO_WIDTHS = (220, 440, 880)
+VARIANT_DIR = "workers/variants"
+PHOTO_FORMATS = {
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 6}),
+}
+
+
+def variant_name(source_name: str, width: int, extension: str) -> str:
+    """Return the storage name for one variant of ``source_name``."""
+    stem = PurePosixPath(source_name).stem
+    return f"{VARIANT_DIR}/{stem}-{width}w.{extension}"
+
+
+def _target_widths(source_width: int) -> list[int]:
+    """Widths to generate without upscaling; always at least the smallest one."""
+    widths = [width for width in PHOTO_WIDTHS if width <= source_width]
+    return widths or [PHOTO_WIDTHS[0]]
+
+
+def generate_photo_variants(photo) -> dict:
+    """Render square JPEG/WebP variants of ``photo`` and return the variant map."""
+    storage = photo.storage
+    photo.open("rb")
+    try:
+        with Image.open(photo) as original:
+            image = ImageOps.exif_transpose(original).convert("RGB")
+    finally:
+        photo.close()
+
+    side = min(image.size)
+    variants: dict = {"source": photo.name, "widths": _target_widths(side)}
+    for key, (pil_format, extension, save_options) in PHOTO_FORMATS.items():
+        names: dict[str, str] = {}
+        for width in variants["widths"]:
+            resized = ImageOps.fit(image, (width, width), method=Image.Resampling.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, **save_options)
+            name = variant_name(photo.name, width, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            names[str(width)] = storage.save(name, ContentFile(buffer.getvalue()))
+        variants[key] = names
+    return variants
+
+
+def delete_photo_variants(variants: dict, storage) -> None:
+    """Remove previously generated variant files."""
+    for key in PHOTO_FORMATS:
+        for name in variants.get(key, {}).values():
+            if storage.exists(name):
+                storage.delete(name)
+
+
+def refresh_worker_photo(worker, force: bool = False) -> bool:
+    """Regenerate ``worker``'s photo variants when the upload changed; return True if updated."""
+    current = worker.photo_variants or {}
+    if not worker.photo:
+        if not current:
+            return False
+        delete_photo_variants(current, worker.photo.storage)
+        variants: dict = {}
+    elif not force and current.get("source") == worker.photo.name:
+        return False
+    else:
+        if current:
+            delete_photo_variants(current, worker.photo.storage)
+        variants = generate_photo_variants(worker.photo)
+
+    # update() rather than save() so post_save handlers don't fire again; that
+    # also skips the catalog signal and auto_now, so bump updated_at (page
+    # validators) and invalidate the cached worker lists here.
+    updated_at = timezone.now()
+    type(worker).objects.filter(pk=worker.pk).update(photo_variants=variants, updated_at=updated_at)
+    worker.photo_variants = variants
+    worker.updated_at = updated_at
+    catalog.invalidate(catalog.WORKERS, catalog.PRICELIST, location_id=worker.location_id)
+    logger.info(
+        "Worker photo variants refreshed",
+        extra={"worker_id": worker.pk, "widths": variants.get("widths", [])},
+    )
+    return True
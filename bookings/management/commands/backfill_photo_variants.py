@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from bookings.images import refresh_worker_photo
+from bookings.models import Worker
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnail and WebP variants for existing worker photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants even if they are up to date")
+
+    def handle(self, *args, **options):
+        refreshed = failed = 0
+        for worker in Worker.objects.exclude(photo="").exclude(photo__isnull=True).iterator():
+            try:
+                if refresh_worker_photo(worker, force=options["force"]):
+                    refreshed += 1
+            except Exception:
+                failed += 1
+                logger.exception("Failed to generate worker photo variants", extra={"worker_id": worker.pk})
+                self.stderr.write(f"Could not process photo for worker {worker.pk} ({worker.photo.name})")
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} worker photos ({failed} failed)"))
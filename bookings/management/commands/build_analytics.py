@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from bookings import analytics
+
+
+class Command(BaseCommand):
+    help = "Recompute weekly utilization/revenue summaries per worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--weeks", type=int, default=8, help="Number of weeks back from the current one to rebuild")
+        parser.add_argument("--start", help="First day to rebuild (YYYY-MM-DD); overrides --weeks")
+        parser.add_argument("--end", help="Last day to rebuild (YYYY-MM-DD, default today)")
+
+    def handle(self, *args, **options):
+        try:
+            end = datetime.strptime(options["end"], "%Y-%m-%d").date() if options["end"] else timezone.localdate()
+            if options["start"]:
+                start = datetime.strptime(options["start"], "%Y-%m-%d").date()
+            else:
+                start = end - timedelta(weeks=max(options["weeks"], 0))
+        except ValueError:
+            raise CommandError("Dates must be in YYYY-MM-DD format")
+        if start > end:
+            raise CommandError("--start must not be after --end")
+
+        summary = analytics.refresh_weekly_summaries(start, end)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {len(summary)} worker-week summaries for weeks "
+                f"{analytics.week_start(start)} to {analytics.week_start(end)}"
+            )
+        )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings import routing, tenancy
+from bookings.dataio import COLUMNS, DEFAULT_CHUNK_SIZE, FORMATS, KINDS, iter_export_rows, write_rows
+from bookings.models import Location
+
+
+class Command(BaseCommand):
+    help = "Stream workers, services, prices or bookings to CSV or JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("--format", choices=FORMATS, default="csv", help="csv or json (one object per line)")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--location", help="Slug of the salon to export (default: the default location)")
+
+    def handle(self, *args, **options):
+        try:
+            location_id = tenancy.location_id_for_slug(options["location"])
+        except Location.DoesNotExist:
+            raise CommandError(f"Unknown location {options['location']!r}")
+        with tenancy.activate(location_id), routing.replica():
+            self._export(options)
+
+    def _export(self, options):
+        kind = options["kind"]
+        rows = iter_export_rows(kind, chunk_size=options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as stream:
+                count = write_rows(rows, COLUMNS[kind], stream, options["format"])
+            self.stderr.write(self.style.SUCCESS(f"Exported {count} {kind} to {options['output']}"))
+        else:
+            # Rows carry their own line endings.
+            self.stdout.ending = ""
+            count = write_rows(rows, COLUMNS[kind], self.stdout, options["format"])
+            self.stderr.write(self.style.SUCCESS(f"Exported {count} {kind}"))
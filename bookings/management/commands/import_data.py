@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings import tenancy
+from bookings.dataio import DEFAULT_CHUNK_SIZE, FORMATS, KINDS, DataImportError, import_rows, read_rows
+from bookings.models import Location
+
+
+class Command(BaseCommand):
+    help = "Import workers, services, prices or bookings from CSV or JSON Lines (upserts, all-or-nothing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=KINDS)
+        parser.add_argument("path", help="CSV or JSON Lines file to read")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension (.csv, otherwise json)")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate and roll back")
+        parser.add_argument(
+            "--skip-conflicts",
+            action="store_true",
+            help="Skip bookings that overlap an existing booking instead of failing",
+        )
+        parser.add_argument("--location", help="Slug of the salon to import into (default: the default location)")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "json")
+        try:
+            location_id = tenancy.location_id_for_slug(options["location"])
+        except Location.DoesNotExist:
+            raise CommandError(f"Unknown location {options['location']!r}")
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as stream, tenancy.activate(location_id):
+                result = import_rows(
+                    options["kind"],
+                    read_rows(stream, fmt),
+                    chunk_size=options["chunk_size"],
+                    dry_run=options["dry_run"],
+                    skip_conflicts=options["skip_conflicts"],
+                )
+        except DataImportError as exc:
+            for error in exc.errors[:50]:
+                self.stderr.write(error)
+            if len(exc.errors) > 50:
+                self.stderr.write(f"... and {len(exc.errors) - 50} more")
+            raise CommandError(f"Import aborted, nothing was written: {exc}")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        prefix = "Dry run: would have" if options["dry_run"] else "Imported:"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix} created {result.created}, updated {result.updated}, skipped {result.skipped} {options['kind']}"
+            )
+        )
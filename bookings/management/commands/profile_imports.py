@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def root(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """Parse the stderr produced by ``python -X importtime`` into records."""
+    records: list[ImportRecord] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_part, cumulative_part, name_part = parts
+        try:
+            self_us = int(self_part.strip())
+            cumulative_us = int(cumulative_part.strip())
+        except ValueError:
+            # Header line ("self [us] | cumulative | imported package")
+            continue
+        stripped = name_part.lstrip(" ")
+        depth = (len(name_part) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped.strip(), self_us, cumulative_us, max(depth, 0)))
+    return records
+
+
+def summarize_by_root(records: list[ImportRecord]) -> list[tuple[str, int, int]]:
+    """Return (top-level package, self time in us, module count) sorted by cost."""
+    totals: dict[str, list[int]] = {}
+    for record in records:
+        bucket = totals.setdefault(record.root, [0, 0])
+        bucket[0] += record.self_us
+        bucket[1] += 1
+    return sorted(((root, us, count) for root, (us, count) in totals.items()), key=lambda item: item[1], reverse=True)
+
+
+class Command(BaseCommand):
+    help = "Report the import-time cost of booting the WSGI application (built on python -X importtime)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--module", default="salon_site.wsgi", help="Module to import (default: salon_site.wsgi)")
+        parser.add_argument("--top", type=int, default=20, help="Number of packages/modules to list")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=None,
+            help="Exit with an error when total import time exceeds this many milliseconds",
+        )
+
+    def handle(self, *args, **options):
+        module = options["module"]
+        top = options["top"]
+
+        env = os.environ.copy()
+        env.setdefault("DJANGO_SETTINGS_MODULE", "salon_site.settings")
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=str(settings.BASE_DIR),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+            raise CommandError(f"Importing {module} failed:\n{tail[-2000:]}")
+
+        records = parse_importtime(proc.stderr)
+        total_us = sum(record.self_us for record in records)
+
+        self.stdout.write(f"Import of {module}: {total_us / 1000:.1f} ms across {len(records)} modules")
+        self.stdout.write("")
+        self.stdout.write("Top-level packages by self time:")
+        for root, us, count in summarize_by_root(records)[:top]:
+            self.stdout.write(f"  {us / 1000:8.1f} ms  {count:5d} modules  {root}")
+
+        self.stdout.write("")
+        self.stdout.write("Slowest modules by cumulative time:")
+        for record in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+            self.stdout.write(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+
+        budget = options["budget_ms"]
+        if budget is not None and total_us / 1000 > budget:
+            raise CommandError(f"Import time {total_us / 1000:.1f} ms exceeds budget of {budget:.1f} ms")
+
+        self.stdout.write(self.style.SUCCESS(f"Total import time: {total_us / 1000:.1f} ms"))
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, Max, Min, OuterRef
+from django.utils import timezone
+
+from bookings.availability import refresh_daily_availability
+from bookings.models import Booking, DailyAvailability, Worker
+
+
+class Command(BaseCommand):
+    help = "Recompute the DailyAvailability summary used by the calendar month grid"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="First day to rebuild (YYYY-MM-DD, default today)")
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only rebuild days that have bookings but no summary row (cheap enough to run on every deploy)",
+        )
+
+    def handle(self, *args, **options):
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--since must be in YYYY-MM-DD format")
+        else:
+            since = timezone.localdate()
+
+        if options["missing"]:
+            summarized = DailyAvailability.objects.filter(worker_id=OuterRef("worker_id"), date=OuterRef("date"))
+            ranges = {
+                row["worker_id"]: (row["first"], row["last"])
+                for row in Booking.objects.filter(date__gte=since)
+                .exclude(Exists(summarized))
+                .values("worker_id")
+                .annotate(first=Min("date"), last=Max("date"))
+                .order_by()
+            }
+        else:
+            ranges = {worker_id: (since, None) for worker_id in Worker.objects.values_list("id", flat=True)}
+
+        stored = 0
+        worker_ids = list(ranges)
+        for worker_id, (first, last) in ranges.items():
+            stored += refresh_daily_availability(worker_id, first, last)
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {stored} daily availability rows for {len(worker_ids)} workers from {since}")
+        )
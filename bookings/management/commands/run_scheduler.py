@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from bookings.models import SchedulerLease
+from bookings.scheduler import LEASE_NAME, Scheduler, default_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run reminders, outbox retries, summary refreshes and session cleanup in one long-lived process. "
+        "Safe to start on every host: a database lease elects a single leader."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tick", type=float, default=settings.SCHEDULER_TICK_SECONDS, help="Seconds between ticks")
+        parser.add_argument(
+            "--lease", type=float, default=settings.SCHEDULER_LEASE_SECONDS, help="Leader lease lifetime in seconds"
+        )
+        for name, seconds in settings.SCHEDULER_INTERVALS.items():
+            parser.add_argument(
+                f"--{name}-interval",
+                type=float,
+                default=seconds,
+                dest=f"{name}_interval",
+                help=f"Seconds between {name} runs (0 disables the job)",
+            )
+        parser.add_argument("--once", action="store_true", help="Run one tick and exit")
+        parser.add_argument("--status", action="store_true", help="Print the current leader and job metrics, then exit")
+
+    def handle(self, *args, **options):
+        if options["status"]:
+            return self._status()
+
+        intervals = {name: options[f"{name}_interval"] for name in settings.SCHEDULER_INTERVALS}
+        scheduler = Scheduler(default_jobs(intervals), lease_seconds=options["lease"])
+        stopping = threading.Event()
+        if not options["once"]:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stopping.set())
+
+        self.stdout.write(f"Scheduler {scheduler.holder} started: {', '.join(job.name for job in scheduler.jobs)}")
+        try:
+            while True:
+                ran = scheduler.tick()
+                if ran and options["verbosity"] > 1:
+                    self.stdout.write(f"Ran {', '.join(ran)}")
+                if options["once"] or stopping.wait(options["tick"]):
+                    break
+        finally:
+            scheduler.stop()
+        self.stdout.write(self.style.SUCCESS("Scheduler stopped"))
+
+    def _status(self):
+        lease = SchedulerLease.objects.filter(name=LEASE_NAME).first()
+        if lease is None:
+            self.stdout.write("No scheduler has run yet")
+            return
+        state = "active" if lease.expires_at > timezone.now() else "expired"
+        self.stdout.write(f"Leader {lease.holder} ({state}, lease until {lease.expires_at.isoformat()})")
+        self.stdout.write(json.dumps(lease.metrics.get("jobs", {}), indent=2, sort_keys=True))
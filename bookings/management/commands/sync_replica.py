@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from bookings.routing import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over the replica stand-in (DJANGO_SQLITE_REPLICA_PATH). "
+        "Only for local testing of replica routing; real replicas are fed by the database server."
+    )
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.databases:
+            raise CommandError("No replica configured: set DJANGO_SQLITE_REPLICA_PATH")
+        source, target = connections[DEFAULT_DB_ALIAS], connections[REPLICA_ALIAS]
+        if source.vendor != "sqlite" or target.vendor != "sqlite":
+            raise CommandError("sync_replica only copies SQLite files")
+        source.ensure_connection()
+        target.ensure_connection()
+        # The online backup API copies a consistent snapshot while the primary stays in use.
+        source.connection.backup(target.connection)
+        self.stdout.write(self.style.SUCCESS(f"Copied {source.settings_dict['NAME']} to {target.settings_dict['NAME']}"))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0007_worker_working_hours'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='worker',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0010_booking_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='no_show',
+            field=models.BooleanField(default=False, help_text='Client did not turn up'),
+        ),
+        migrations.CreateModel(
+            name='WorkerWeekSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week_start', models.DateField(help_text='Monday of the week')),
+                ('booking_count', models.PositiveIntegerField(default=0)),
+                ('booked_minutes', models.PositiveIntegerField(default=0)),
+                ('available_minutes', models.PositiveIntegerField(default=0)),
+                ('occupancy_percent', models.DecimalField(decimal_places=1, default=0, max_digits=5)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('no_show_count', models.PositiveIntegerField(default=0)),
+                ('cancellation_count', models.PositiveIntegerField(default=0)),
+                ('peak_hour', models.PositiveSmallIntegerField(blank=True, help_text='Hour of day with most bookings', null=True)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='week_summaries', to='bookings.worker')),
+            ],
+            options={
+                'verbose_name_plural': 'worker week summaries',
+                'ordering': ['-week_start', 'worker__full_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BookingCancellation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('time', models.TimeField()),
+                ('cancelled_at', models.DateTimeField(auto_now_add=True)),
+                ('service', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cancellations', to='bookings.service')),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cancellations', to='bookings.worker')),
+            ],
+            options={
+                'ordering': ['-date', '-time'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='workerweeksummary',
+            constraint=models.UniqueConstraint(fields=('worker', 'week_start'), name='unique_worker_week_summary'),
+        ),
+        migrations.AddIndex(
+            model_name='bookingcancellation',
+            index=models.Index(fields=['date', 'worker'], name='cancellation_date_worker_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0011_booking_analytics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAvailability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('free_minutes', models.PositiveIntegerField(default=0)),
+                ('largest_gap_minutes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_availability', to='bookings.worker')),
+            ],
+            options={
+                'verbose_name_plural': 'daily availability',
+                'ordering': ['worker', 'date'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyavailability',
+            constraint=models.UniqueConstraint(fields=('worker', 'date'), name='unique_worker_daily_availability'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0012_daily_availability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyavailability',
+            name='gaps',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='slot_step_minutes',
+            field=models.PositiveSmallIntegerField(blank=True, choices=[(5, '5 min'), (10, '10 min'), (15, '15 min'), (20, '20 min'), (30, '30 min'), (45, '45 min'), (60, '60 min')], help_text="Overrides the worker's start time spacing for this service", null=True),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='compact_slots',
+            field=models.BooleanField(default=False, help_text='Only offer starts right after a booking or at the edges of the day, to avoid gaps'),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='slot_step_minutes',
+            field=models.PositiveSmallIntegerField(choices=[(5, '5 min'), (10, '10 min'), (15, '15 min'), (20, '20 min'), (30, '30 min'), (45, '45 min'), (60, '60 min')], default=15, help_text='Spacing between offered start times'),
+        ),
+    ]
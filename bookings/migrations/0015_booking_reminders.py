@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:05
+
+from datetime import datetime, timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_starts_at(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    bookings = Booking.objects.using(schema_editor.connection.alias)
+    # The old send_reminders re-sent every run, so anything due soon has had its reminder.
+    reminded_until = timezone.now() + timedelta(hours=24)
+    now = timezone.now()
+    batch = []
+    for pk, day, start in bookings.values_list("id", "date", "time").iterator(chunk_size=2000):
+        starts_at = timezone.make_aware(datetime.combine(day, start))
+        batch.append(Booking(id=pk, starts_at=starts_at, reminder_sent_at=now if starts_at <= reminded_until else None))
+        if len(batch) >= 2000:
+            bookings.bulk_update(batch, ["starts_at", "reminder_sent_at"])
+            batch = []
+    if batch:
+        bookings.bulk_update(batch, ["starts_at", "reminder_sent_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0014_waitlist'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='starts_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_starts_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='booking',
+            name='starts_at',
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True)), fields=['starts_at'], name='booking_reminder_due_idx'),
+        ),
+    ]
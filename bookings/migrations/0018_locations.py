@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-19 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+import bookings.models
+
+
+def create_default_location(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Location = apps.get_model("bookings", "Location")
+    location = Location.objects.using(db_alias).create(name="Main salon", slug="main", is_default=True)
+    # Everything that exists belongs to the one salon run so far.
+    for model_name in ("Worker", "Service", "WorkerServicePrice", "Booking"):
+        apps.get_model("bookings", model_name).objects.using(db_alias).update(location=location)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0017_catalog_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(unique=True)),
+                ('hostname', models.CharField(blank=True, help_text='Host name this salon is served on, e.g. north.example.com', max_length=255)),
+                ('is_default', models.BooleanField(default=False, help_text='Serves requests for unknown host names')),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(condition=models.Q(('hostname', ''), _negated=True), fields=('hostname',), name='unique_location_hostname'),
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_default', True)), fields=('is_default',), name='single_default_location'),
+        ),
+        migrations.AddField(
+            model_name='worker',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='workers', to='bookings.location'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='location',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='services', to='bookings.location'),
+        ),
+        migrations.AddField(
+            model_name='workerserviceprice',
+            name='location',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='service_prices', to='bookings.location'),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='location',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='bookings', to='bookings.location'),
+        ),
+        migrations.RunPython(create_default_location, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='worker',
+            name='location',
+            field=models.ForeignKey(default=bookings.models.current_location_id, on_delete=django.db.models.deletion.PROTECT, related_name='workers', to='bookings.location'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='location',
+            field=models.ForeignKey(default=bookings.models.current_location_id, on_delete=django.db.models.deletion.PROTECT, related_name='services', to='bookings.location'),
+        ),
+        migrations.AlterField(
+            model_name='workerserviceprice',
+            name='location',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='service_prices', to='bookings.location'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='location',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='bookings', to='bookings.location'),
+        ),
+        # Service names are unique per salon instead of globally.
+        migrations.AlterField(
+            model_name='service',
+            name='name',
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name='service',
+            constraint=models.UniqueConstraint(fields=('location', 'name'), name='unique_service_name_per_location'),
+        ),
+        migrations.AddIndex(
+            model_name='worker',
+            index=models.Index(fields=['location', 'is_active', 'full_name'], name='worker_location_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='workerserviceprice',
+            index=models.Index(fields=['location', 'worker'], name='price_location_worker_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['location', 'date', 'time'], name='booking_location_day_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+import bookings.models
+
+
+def give_each_worker_a_secret(apps, schema_editor):
+    Worker = apps.get_model("bookings", "Worker")
+    # AddField evaluates the callable default once for all existing rows.
+    for worker in Worker.objects.only("id"):
+        worker.feed_secret = bookings.models.new_feed_secret()
+        worker.save(update_fields=["feed_secret"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0018_locations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='worker',
+            name='feed_secret',
+            field=models.CharField(default=bookings.models.new_feed_secret, editable=False, max_length=32),
+        ),
+        migrations.RunPython(give_each_worker_a_secret, migrations.RunPython.noop),
+    ]
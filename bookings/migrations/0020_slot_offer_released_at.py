@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0019_worker_feed_secret'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='slotoffer',
+            name='unique_accepted_slot_offer',
+        ),
+        migrations.AddField(
+            model_name='slotoffer',
+            name='released_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='slotoffer',
+            constraint=models.UniqueConstraint(condition=models.Q(('accepted_at__isnull', False), ('released_at__isnull', True)), fields=('worker', 'date', 'time'), name='unique_accepted_slot_offer'),
+        ),
+    ]
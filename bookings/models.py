@@ -1,41 +1,215 @@
 from __future__ import annotations
 
 import datetime
+import secrets
 
 from django.core.validators import RegexValidator
-from django.core.signing import Signer
+from django.core.signing import BadSignature, Signer
 from django.db import models
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+FEED_TOKEN_SALT = "bookings.worker-feed"
+SLOT_STEP_CHOICES = [(minutes, f"{minutes} min") for minutes in (5, 10, 15, 20, 30, 45, 60)]
+
+
+def new_feed_secret() -> str:
+    return secrets.token_hex(16)
+
+
+def current_location_id() -> int:
+    """Default for ``location`` fields: the location active for this request or command."""
+    from .tenancy import current_location_id
+
+    return current_location_id()
+
+
+class Location(models.Model):
+    """One salon. Requests are routed to a location by hostname (see ``bookings.tenancy``)."""
+
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(unique=True)
+    hostname = models.CharField(
+        max_length=255, blank=True, help_text="Host name this salon is served on, e.g. north.example.com"
+    )
+    is_default = models.BooleanField(default=False, help_text="Serves requests for unknown host names")
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hostname"], condition=~models.Q(hostname=""), name="unique_location_hostname"
+            ),
+            models.UniqueConstraint(
+                fields=["is_default"], condition=models.Q(is_default=True), name="single_default_location"
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.name
 
 
 class Worker(models.Model):
+    location = models.ForeignKey(
+        Location, on_delete=models.PROTECT, related_name="workers", default=current_location_id
+    )
     full_name = models.CharField(max_length=100)
     is_active = models.BooleanField(default=True)
     role = models.CharField(max_length=100, blank=True)
     bio = models.TextField(blank=True)
     photo = models.ImageField(upload_to="workers/", blank=True, null=True)
+    # Generated by bookings.images: {"source": ..., "widths": [...], "jpeg": {width: name}, "webp": {...}}
+    photo_variants = models.JSONField(default=dict, blank=True, editable=False)
     working_hours_start = models.TimeField(default=datetime.time(9, 0))
     working_hours_end = models.TimeField(default=datetime.time(18, 0))
+    slot_step_minutes = models.PositiveSmallIntegerField(
+        choices=SLOT_STEP_CHOICES, default=15, help_text="Spacing between offered start times"
+    )
+    compact_slots = models.BooleanField(
+        default=False,
+        help_text="Only offer starts right after a booking or at the edges of the day, to avoid gaps",
+    )
+    # Folded into feed tokens; replacing it revokes every link handed out so far.
+    feed_secret = models.CharField(max_length=32, default=new_feed_secret, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["full_name"]
+        indexes = [
+            # The catalog loads one location's active workers by name.
+            models.Index(fields=["location", "is_active", "full_name"], name="worker_location_active_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover - admin/readability only
         return self.full_name
 
+    def _photo_srcset(self, key: str) -> str:
+        names = (self.photo_variants or {}).get(key) or {}
+        if not self.photo or not names:
+            return ""
+        storage = self.photo.storage
+        return ", ".join(f"{storage.url(name)} {width}w" for width, name in names.items())
+
+    @property
+    def photo_srcset(self) -> str:
+        """JPEG ``srcset`` for the photo variants, empty until they are generated."""
+        return self._photo_srcset("jpeg")
+
+    @property
+    def photo_webp_srcset(self) -> str:
+        """WebP ``srcset`` for the photo variants, empty until they are generated."""
+        return self._photo_srcset("webp")
+
+    @property
+    def photo_thumbnail_url(self) -> str:
+        """Smallest generated variant, falling back to the original upload."""
+        if not self.photo:
+            return ""
+        names = (self.photo_variants or {}).get("jpeg") or {}
+        if names:
+            smallest = min(names, key=int)
+            return self.photo.storage.url(names[smallest])
+        return self.photo.url
+
+    def get_feed_token(self) -> str:
+        """Signed token for this worker's schedule feeds (ICS/CSV)."""
+        return Signer(salt=FEED_TOKEN_SALT).sign(f"worker_{self.id}.{self.feed_secret}")
+
+    def rotate_feed_secret(self) -> None:
+        """Revoke the current feed links; ``get_feed_token()`` returns a new one afterwards."""
+        self.feed_secret = new_feed_secret()
+        self.save(update_fields=["feed_secret"])
+
+    @classmethod
+    def from_feed_token(cls, token: str):
+        """Return the active worker for a schedule feed token, or None if it is invalid or revoked."""
+        try:
+            unsigned = Signer(salt=FEED_TOKEN_SALT).unsign(token)
+        except BadSignature:
+            return None
+        worker_id, _, secret = unsigned.removeprefix("worker_").partition(".")
+        if not unsigned.startswith("worker_") or not secret:
+            return None
+        try:
+            worker = cls.objects.get(id=int(worker_id), is_active=True)
+        except (ValueError, cls.DoesNotExist):
+            return None
+        return worker if constant_time_compare(worker.feed_secret, secret) else None
+
 
 class Service(models.Model):
-    name = models.CharField(max_length=100, unique=True)
+    location = models.ForeignKey(
+        Location, on_delete=models.PROTECT, related_name="services", default=current_location_id
+    )
+    name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     duration_minutes = models.PositiveIntegerField(default=60, help_text="Duration in minutes")
+    slot_step_minutes = models.PositiveSmallIntegerField(
+        choices=SLOT_STEP_CHOICES,
+        null=True,
+        blank=True,
+        help_text="Overrides the worker's start time spacing for this service",
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
+        constraints = [
+            # Also the index behind the catalog's per-location service list.
+            models.UniqueConstraint(fields=["location", "name"], name="unique_service_name_per_location"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.name
 
 
+def _worker_locations(objs) -> dict[int, int]:
+    """worker id -> location id for rows whose ``location`` is not set yet, in one query."""
+    worker_ids = {obj.worker_id for obj in objs if obj.location_id is None}
+    if not worker_ids:
+        return {}
+    return dict(Worker.objects.filter(pk__in=worker_ids).values_list("id", "location_id"))
+
+
+def _copy_worker_location(obj, save_kwargs: dict) -> None:
+    """Keep a row's denormalized ``location`` equal to its worker's."""
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is not None and "worker" not in update_fields and "worker_id" not in update_fields:
+        return
+    obj.location_id = obj.worker.location_id
+    if update_fields is not None:
+        save_kwargs["update_fields"] = {*update_fields, "location"}
+
+
+class BookingQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() is skipped here, so fill in the denormalized start time.
+        objs = list(objs)
+        locations = _worker_locations(objs)
+        for obj in objs:
+            if obj.starts_at is None:
+                obj.starts_at = Booking.aware_start(obj.date, obj.time)
+            if obj.location_id is None:
+                obj.location_id = locations[obj.worker_id]
+        return super().bulk_create(objs, *args, **kwargs)
+
+
+class WorkerServicePriceQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() is skipped here, so copy the worker's location.
+        objs = list(objs)
+        locations = _worker_locations(objs)
+        for obj in objs:
+            if obj.location_id is None:
+                obj.location_id = locations[obj.worker_id]
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class Booking(models.Model):
+    # The worker's location, copied by save() so per-salon scans lead with it.
+    location = models.ForeignKey(Location, on_delete=models.PROTECT, related_name="bookings", editable=False)
     worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="bookings")
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="bookings", null=True, blank=True)
     date = models.DateField()
@@ -46,15 +220,56 @@ class Booking(models.Model):
         validators=[RegexValidator(r"^[0-9+\-\s]{7,20}$", "Enter a valid phone number.")],
         help_text="Contact phone number",
     )
+    no_show = models.BooleanField(default=False, help_text="Client did not turn up")
+    # date + time as an aware datetime in TIME_ZONE, kept in sync by save().
+    starts_at = models.DateTimeField(editable=False)
+    reminder_sent_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # The booking form's idempotency key; unique so a replayed submission can never insert twice.
+    idempotency_key = models.CharField(max_length=32, null=True, blank=True, unique=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookingQuerySet.as_manager()
 
     class Meta:
         unique_together = ("worker", "date", "time")
         ordering = ["-date", "-time"]
+        indexes = [
+            # send_reminders: unsent bookings starting within the window.
+            models.Index(
+                fields=["starts_at"],
+                name="booking_reminder_due_idx",
+                condition=models.Q(reminder_sent_at__isnull=True),
+            ),
+            # Serves the default ordering, the admin date hierarchy and date range scans.
+            models.Index(fields=["date", "time"], name="booking_date_time_idx"),
+            # One salon's day: the staff day board, exports and per-location scans.
+            models.Index(fields=["location", "date", "time"], name="booking_location_day_idx"),
+            # Admin phone search is a prefix match (LIKE 'x%'), which can use this index.
+            models.Index(fields=["phone"], name="booking_phone_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.date} {self.time} - {self.worker}"
 
+    @staticmethod
+    def aware_start(date, time) -> datetime.datetime:
+        """Booking wall-clock date and time as an aware datetime in the current time zone."""
+        return timezone.make_aware(datetime.datetime.combine(date, time))
+
+    def save(self, *args, **kwargs):
+        _copy_worker_location(self, kwargs)
+        starts_at = self.aware_start(self.date, self.time)
+        if starts_at != self.starts_at:
+            if self.starts_at is not None:
+                # A moved booking needs a fresh reminder.
+                self.reminder_sent_at = None
+            self.starts_at = starts_at
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "starts_at", "reminder_sent_at"}
+        super().save(*args, **kwargs)
+
     @property
     def end_time(self):
         """Calculate the end time of this booking based on service duration."""
@@ -72,34 +287,6 @@ class Booking(models.Model):
             return self.service.duration_minutes
         return 60
 
-    @classmethod
-    def has_conflict(cls, worker, date, time, service, exclude_booking=None):
-        """Check if there's a time conflict for the given worker, date, time, and service."""
-        from datetime import datetime, timedelta
-
-        # Calculate the end time for the new booking
-        start_datetime = datetime.combine(date, time)
-        # Use worker-specific duration when possible
-        duration = cls._duration_for_worker_service(worker, service)
-        end_datetime = start_datetime + timedelta(minutes=duration)
-
-        # Get all existing bookings for this worker on this date
-        existing_bookings = cls.objects.filter(worker=worker, date=date)
-        if exclude_booking:
-            existing_bookings = existing_bookings.exclude(id=exclude_booking.id)
-
-        # Check for conflicts
-        for booking in existing_bookings:
-            existing_start = datetime.combine(booking.date, booking.time)
-            existing_duration = cls._duration_for_worker_service(worker, booking.service)
-            existing_end = existing_start + timedelta(minutes=existing_duration)
-
-            # Check if the new booking overlaps with any existing booking
-            if (start_datetime < existing_end and end_datetime > existing_start):
-                return True
-
-        return False
-
     @staticmethod
     def _duration_for_worker_service(worker: Worker, service: Service | None) -> int:
         """Return duration minutes using worker-specific price when available."""
@@ -129,17 +316,208 @@ class Booking(models.Model):
 
 
 class WorkerServicePrice(models.Model):
+    location = models.ForeignKey(
+        Location, on_delete=models.PROTECT, related_name="service_prices", editable=False
+    )
     worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="service_prices")
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="worker_prices")
     price = models.DecimalField(max_digits=8, decimal_places=2)
     duration_minutes = models.PositiveIntegerField(default=60)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = WorkerServicePriceQuerySet.as_manager()
+
     class Meta:
         unique_together = ("worker", "service")
         ordering = ["worker__full_name", "service__name"]
+        indexes = [
+            models.Index(fields=["location", "worker"], name="price_location_worker_idx"),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.worker} - {self.service}: {self.price}"
 
+    def save(self, *args, **kwargs):
+        _copy_worker_location(self, kwargs)
+        super().save(*args, **kwargs)
 
 
+class BookingCancellation(models.Model):
+    """What a cancelled booking was, kept after the booking row is deleted."""
+
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="cancellations")
+    service = models.ForeignKey(Service, on_delete=models.SET_NULL, related_name="cancellations", null=True, blank=True)
+    date = models.DateField()
+    time = models.TimeField()
+    cancelled_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-date", "-time"]
+        indexes = [models.Index(fields=["date", "worker"], name="cancellation_date_worker_idx")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.date} {self.time} - {self.worker} (cancelled)"
+
+
+class WorkerWeekSummary(models.Model):
+    """Precomputed weekly utilization and revenue per worker, built by ``build_analytics``."""
+
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="week_summaries")
+    week_start = models.DateField(help_text="Monday of the week")
+    booking_count = models.PositiveIntegerField(default=0)
+    booked_minutes = models.PositiveIntegerField(default=0)
+    available_minutes = models.PositiveIntegerField(default=0)
+    occupancy_percent = models.DecimalField(max_digits=5, decimal_places=1, default=0)
+    revenue = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    no_show_count = models.PositiveIntegerField(default=0)
+    cancellation_count = models.PositiveIntegerField(default=0)
+    peak_hour = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Hour of day with most bookings")
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-week_start", "worker__full_name"]
+        constraints = [models.UniqueConstraint(fields=["worker", "week_start"], name="unique_worker_week_summary")]
+        verbose_name_plural = "worker week summaries"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.worker} - week of {self.week_start}"
+
+
+class DailyAvailability(models.Model):
+    """Free time per worker-day, maintained by ``bookings.availability`` as bookings change.
+
+    Only days with bookings get a row; a missing row means the whole working day is free.
+    """
+
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="daily_availability")
+    date = models.DateField()
+    free_minutes = models.PositiveIntegerField(default=0)
+    # Longest run that can start on the worker's slot grid, so "fits" is largest_gap >= duration.
+    largest_gap_minutes = models.PositiveIntegerField(default=0)
+    # Free [start, end) runs in minutes since midnight, for services with their own slot step.
+    gaps = models.JSONField(default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["worker", "date"]
+        constraints = [models.UniqueConstraint(fields=["worker", "date"], name="unique_worker_daily_availability")]
+        verbose_name_plural = "daily availability"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.worker} {self.date}: {self.largest_gap_minutes} min gap"
+
+
+class WaitlistEntry(models.Model):
+    """A client waiting for any slot with a worker/service between two dates."""
+
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="waitlist_entries")
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="waitlist_entries")
+    earliest_date = models.DateField()
+    latest_date = models.DateField()
+    email = models.EmailField()
+    phone = models.CharField(
+        max_length=20,
+        validators=[RegexValidator(r"^[0-9+\-\s]{7,20}$", "Enter a valid phone number.")],
+    )
+    is_active = models.BooleanField(default=True)
+    booking = models.ForeignKey(
+        "Booking", on_delete=models.SET_NULL, null=True, blank=True, related_name="+", help_text="Booking made from an offer"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        verbose_name_plural = "waitlist entries"
+        indexes = [
+            # Cancellation matching: worker/service equality, then the date range, oldest first.
+            models.Index(
+                fields=["worker", "service", "earliest_date", "created_at"],
+                name="waitlist_match_idx",
+                condition=models.Q(is_active=True),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(check=models.Q(latest_date__gte=models.F("earliest_date")), name="waitlist_date_range"),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.email} waiting for {self.worker} {self.earliest_date}..{self.latest_date}"
+
+
+class SlotOffer(models.Model):
+    """A freed slot offered to a waitlist entry; the first offer accepted for a slot wins."""
+
+    entry = models.ForeignKey(WaitlistEntry, on_delete=models.CASCADE, related_name="offers")
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="+")
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="+")
+    date = models.DateField()
+    time = models.TimeField()
+    token = models.CharField(max_length=64, unique=True)
+    expires_at = models.DateTimeField()
+    accepted_at = models.DateTimeField(null=True, blank=True)
+    # Set when the slot is freed again after this offer was accepted; the row stays as the record.
+    released_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # Two clients accepting offers for the same slot: the second UPDATE fails.
+            models.UniqueConstraint(
+                fields=["worker", "date", "time"],
+                condition=models.Q(accepted_at__isnull=False, released_at__isnull=True),
+                name="unique_accepted_slot_offer",
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Offer {self.date} {self.time} with {self.worker} to {self.entry.email}"
+
+
+class OutboundEmail(models.Model):
+    """An email queued for ``bookings.outbox`` to deliver, or to retry after a failed send."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (SENT, "Sent"), (FAILED, "Failed")]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                name="outbound_email_due_idx",
+                condition=models.Q(status="pending"),
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
+
+
+class SchedulerLease(models.Model):
+    """Leader lease for ``run_scheduler``: only the current holder runs jobs."""
+
+    name = models.CharField(max_length=50, unique=True)
+    holder = models.CharField(max_length=200)
+    expires_at = models.DateTimeField()
+    # Per-job timing metrics written by the leader, see bookings.scheduler.JobStats.
+    metrics = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name} held by {self.holder} until {self.expires_at}"
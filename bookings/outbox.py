@@ -0,0 +1,121 @@
+"""
+Retry queue for outgoing email.
+
+``send`` tries SMTP immediately, as before; if that fails the message is stored
+as an ``OutboundEmail`` row instead of being lost. ``queue`` stores messages
+that a request should not wait on for the next run. ``deliver_due`` (run by the
+scheduler) sends due rows through the partial ``outbound_email_due_idx`` index
+with exponential backoff, and gives up after ``MAX_ATTEMPTS``.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+RETRY_BASE = timedelta(minutes=1)
+RETRY_MAX = timedelta(hours=6)
+DELIVERY_BATCH_SIZE = 50
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after ``attempts`` failed tries: 1, 2, 4, ... minutes, capped at ``RETRY_MAX``."""
+    return min(RETRY_BASE * (2 ** max(attempts - 1, 0)), RETRY_MAX)
+
+
+def _html_alternative(message: EmailMessage) -> str:
+    for content, mimetype in getattr(message, "alternatives", []):
+        if mimetype == "text/html":
+            return content
+    return ""
+
+
+def _outbound(message: EmailMessage, attempts: int, next_attempt_at: datetime, error: str = "") -> OutboundEmail:
+    return OutboundEmail(
+        subject=message.subject,
+        body=message.body,
+        html_body=_html_alternative(message),
+        from_email=message.from_email,
+        to=list(message.to),
+        attempts=attempts,
+        next_attempt_at=next_attempt_at,
+        last_error=error,
+    )
+
+
+def enqueue(message: EmailMessage, error: str = "", attempts: int = 1) -> OutboundEmail:
+    """Store ``message`` for a later retry."""
+    email = _outbound(message, attempts, timezone.now() + retry_delay(attempts), error)
+    email.save()
+    return email
+
+
+def queue(messages: list[EmailMessage]) -> list[OutboundEmail]:
+    """Store ``messages`` untried, for the scheduler's next ``deliver_due`` run, in one insert."""
+    now = timezone.now()
+    return OutboundEmail.objects.bulk_create([_outbound(message, 0, now) for message in messages])
+
+
+def send(message: EmailMessage) -> bool:
+    """Send ``message`` now; on failure queue it for retry. Return True if it was sent."""
+    try:
+        if message.send(fail_silently=False):
+            return True
+        error = "backend reported 0 messages sent"
+    except Exception as exc:
+        logger.warning("Email delivery failed, queued for retry", extra={"to": message.to, "error": str(exc)})
+        error = str(exc)
+    enqueue(message, error)
+    return False
+
+
+def _message(email: OutboundEmail) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        subject=email.subject, body=email.body, from_email=email.from_email, to=list(email.to)
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def deliver_due(now: datetime | None = None, limit: int = DELIVERY_BATCH_SIZE) -> int:
+    """Retry queued emails that are due; return how many were sent."""
+    now = now or timezone.now()
+    due = list(
+        OutboundEmail.objects.filter(status=OutboundEmail.PENDING, next_attempt_at__lte=now).order_by("next_attempt_at")[
+            :limit
+        ]
+    )
+    sent = 0
+    for email in due:
+        attempts = email.attempts + 1
+        try:
+            delivered = bool(_message(email).send(fail_silently=False))
+            error = "" if delivered else "backend reported 0 messages sent"
+        except Exception as exc:
+            delivered, error = False, str(exc)
+
+        if delivered:
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                status=OutboundEmail.SENT, attempts=attempts, sent_at=timezone.now(), last_error=""
+            )
+            sent += 1
+        elif attempts >= MAX_ATTEMPTS:
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                status=OutboundEmail.FAILED, attempts=attempts, last_error=error
+            )
+            logger.error("Giving up on queued email", extra={"outbound_email_id": email.pk, "to": email.to, "error": error})
+        else:
+            OutboundEmail.objects.filter(pk=email.pk).update(
+                attempts=attempts, next_attempt_at=now + retry_delay(attempts), last_error=error
+            )
+    if due:
+        logger.info("Queued emails retried", extra={"due": len(due), "sent": sent})
+    return sent
@@ -0,0 +1,100 @@
+"""
+Appointment reminders.
+
+Due bookings are read through the partial ``booking_reminder_due_idx`` index
+(unsent rows only, by aware ``starts_at``), so a run costs O(reminders to
+send) however often it is scheduled. Each booking is claimed with a
+conditional UPDATE before anything is sent: overlapping runs never remind the
+same booking twice, and a booking whose every channel failed is released for
+the next run. Texts go out as one concurrent batch through ``bookings.sms``.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.utils import timezone
+
+from . import sms
+from .models import Booking
+
+logger = logging.getLogger(__name__)
+
+REMINDER_WINDOW = timedelta(hours=24)
+
+
+def due_reminders(now: datetime, window: timedelta = REMINDER_WINDOW):
+    """Unsent bookings starting within ``window`` from ``now``, soonest first."""
+    return (
+        Booking.objects.filter(reminder_sent_at__isnull=True, starts_at__gte=now, starts_at__lte=now + window)
+        .select_related("worker")
+        .order_by("starts_at")
+    )
+
+
+def _send_email(booking: Booking) -> bool:
+    body = f"Reminder: Your appointment with {booking.worker.full_name} is on {booking.date} at {booking.time}."
+    try:
+        send_mail("Appointment reminder", body, settings.DEFAULT_FROM_EMAIL, [booking.email], fail_silently=False)
+    except Exception:
+        logger.exception("Failed to send reminder email", extra={"booking_id": booking.id, "email": booking.email})
+        return False
+    logger.info("Sent reminder email", extra={"booking_id": booking.id, "email": booking.email})
+    return True
+
+
+def _send_sms_batch(bookings: list[Booking]) -> dict[int, bool]:
+    """Text every booking with a phone in one concurrent batch; booking id -> delivered."""
+    messages = {
+        booking.id: sms.SMSMessage(
+            f"Reminder: appointment {booking.date} {booking.time} with {booking.worker.full_name}.", booking.phone
+        )
+        for booking in bookings
+        if booking.phone
+    }
+    if not messages:
+        return {}
+    try:
+        sms.get_connection(fail_silently=True).send_messages(messages.values())
+    except Exception:
+        logger.exception("Failed to send reminder SMS batch", extra={"count": len(messages)})
+    for booking_id, message in messages.items():
+        if message.sent:
+            logger.info("Sent reminder SMS", extra={"booking_id": booking_id, "phone": message.to})
+        else:
+            logger.error(
+                "Failed to send reminder SMS", extra={"booking_id": booking_id, "phone": message.to, "error": message.error}
+            )
+    return {booking_id: message.sent for booking_id, message in messages.items()}
+
+
+def send_due_reminders(now: datetime | None = None, window: timedelta = REMINDER_WINDOW) -> int:
+    """Send reminders for bookings due within ``window``; return how many were reminded."""
+    now = now or timezone.now()
+    bookings = list(due_reminders(now, window))
+    logger.info(
+        "Preparing reminders",
+        extra={"window_start": now.isoformat(), "window_end": (now + window).isoformat(), "count": len(bookings)},
+    )
+    if not bookings:
+        return 0
+
+    claimed = [
+        booking
+        for booking in bookings
+        if Booking.objects.filter(pk=booking.pk, reminder_sent_at__isnull=True).update(reminder_sent_at=now)
+    ]
+    emailed = {booking.id: _send_email(booking) for booking in claimed if booking.email}
+    texted = _send_sms_batch(claimed)
+
+    sent = 0
+    for booking in claimed:
+        outcomes = [result for result in (emailed.get(booking.id), texted.get(booking.id)) if result is not None]
+        if outcomes and not any(outcomes):
+            # Every channel failed: release the booking for the next run.
+            Booking.objects.filter(pk=booking.pk, reminder_sent_at=now).update(reminder_sent_at=None)
+            continue
+        sent += 1
+    return sent
@@ -0,0 +1,127 @@
+"""
+Read-replica routing.
+
+Views marked with ``@replica_reads`` (the calendar) run their GET/HEAD
+queries against the ``replica`` database alias when one is configured;
+everything else, and every write, uses ``default``. Pages served only from the
+catalog don't need the mark: its cache loads from the primary anyway.
+``ReplicaRoutingMiddleware`` keeps the per-request choice in a context
+variable, so it follows async views into their worker threads. A request
+that writes sets a short-lived cookie that pins the visitor to the primary
+for ``REPLICA_PIN_SECONDS``, so the pages after a booking or cancellation
+show it even while the replica lags.
+
+Caches that outlive the request (the catalog, the host map) load inside
+``primary()``: a copy read from a lagging replica would otherwise be kept
+until the next change. Migrations never run on the replica; it gets its schema
+and data from the primary (``manage.py sync_replica`` for the SQLite stand-in).
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE = "primary_pin"
+
+
+@dataclass
+class RoutingState:
+    replica: bool = False
+    wrote: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("bookings_db_routing", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in connections.databases
+
+
+def replica_reads(view):
+    """Mark a read-only view whose GET/HEAD queries may be served by the replica."""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def _routing(replica: bool):
+    state = _state.get()
+    if state is None:
+        token = _state.set(RoutingState(replica=replica))
+        try:
+            yield
+        finally:
+            _state.reset(token)
+        return
+    previous, state.replica = state.replica, replica
+    try:
+        yield
+    finally:
+        state.replica = previous
+
+
+def primary():
+    """Read from the primary inside the block, whatever the request chose."""
+    return _routing(False)
+
+
+def replica():
+    """Read from the replica (when configured) inside the block, e.g. for exports."""
+    return _routing(True)
+
+
+class ReplicaRouter:
+    """Send reads to the replica when the current request or block allows it."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.replica and replica_configured():
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """Choose the read database per request and pin writers to the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax"
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _state.get().replica = (
+            request.method in ("GET", "HEAD")
+            and getattr(view_func, "replica_reads", False)
+            and PIN_COOKIE not in request.COOKIES
+        )
@@ -0,0 +1,205 @@
+"""
+In-process job scheduler for ``manage.py run_scheduler``.
+
+Every app host may run the command; a ``SchedulerLease`` row elects one leader.
+The leader renews the lease on every tick (and before each job), runs the jobs
+whose interval has elapsed, and writes per-job timing metrics into the lease
+row, where the admin and ``run_scheduler --status`` read them. Other hosts keep
+ticking and take over once the lease has expired.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from importlib import import_module
+import logging
+import os
+import socket
+import time
+from typing import Callable
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "scheduler"
+
+
+def default_holder() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def acquire_lease(holder: str, ttl: timedelta, name: str = LEASE_NAME, metrics: dict | None = None) -> bool:
+    """Take or renew the lease for ``holder``; False while another holder's lease is live."""
+    now = timezone.now()
+    values = {"holder": holder, "expires_at": now + ttl, "updated_at": now}
+    if metrics is not None:
+        values["metrics"] = metrics
+    taken = SchedulerLease.objects.filter(Q(holder=holder) | Q(expires_at__lte=now), name=name).update(**values)
+    if taken:
+        return True
+    try:
+        with transaction.atomic():
+            SchedulerLease.objects.create(name=name, **values)
+    except IntegrityError:
+        return False
+    return True
+
+
+def release_lease(holder: str, name: str = LEASE_NAME) -> None:
+    """Expire the lease now if ``holder`` has it, so another host can take over at once."""
+    SchedulerLease.objects.filter(name=name, holder=holder).update(expires_at=timezone.now())
+
+
+@dataclass
+class JobStats:
+    runs: int = 0
+    failures: int = 0
+    last_started_at: str | None = None
+    last_duration_ms: float | None = None
+    max_duration_ms: float = 0.0
+    total_duration_ms: float = 0.0
+    last_result: str | None = None
+    last_error: str | None = None
+
+    def record(self, started_at: datetime, duration_ms: float, result=None, error: str | None = None) -> None:
+        self.runs += 1
+        self.last_started_at = started_at.isoformat()
+        self.last_duration_ms = round(duration_ms, 1)
+        self.max_duration_ms = max(self.max_duration_ms, self.last_duration_ms)
+        self.total_duration_ms = round(self.total_duration_ms + duration_ms, 1)
+        if error is None:
+            self.last_result = None if result is None else str(result)
+        else:
+            self.failures += 1
+        self.last_error = error
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], object]
+    interval: float
+    next_run: float = 0.0
+    stats: JobStats = field(default_factory=JobStats)
+
+
+class Scheduler:
+    """Runs ``jobs`` on their intervals while holding the leader lease."""
+
+    def __init__(
+        self,
+        jobs: list[Job],
+        lease_seconds: float = 120,
+        holder: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.jobs = jobs
+        self.lease_ttl = timedelta(seconds=lease_seconds)
+        self.holder = holder or default_holder()
+        self.clock = clock
+        self.is_leader = False
+
+    def metrics(self) -> dict:
+        return {
+            "holder": self.holder,
+            "jobs": {job.name: asdict(job.stats) for job in self.jobs},
+        }
+
+    def _renew(self) -> bool:
+        was_leader = self.is_leader
+        self.is_leader = acquire_lease(self.holder, self.lease_ttl, metrics=self.metrics())
+        if self.is_leader and not was_leader:
+            logger.info("Scheduler lease acquired", extra={"holder": self.holder})
+            # Run everything once on taking over; the previous leader's schedule is unknown.
+            for job in self.jobs:
+                job.next_run = 0.0
+        elif was_leader and not self.is_leader:
+            logger.warning("Scheduler lease lost", extra={"holder": self.holder})
+        return self.is_leader
+
+    def run_job(self, job: Job) -> None:
+        started_at = timezone.now()
+        start = time.perf_counter()
+        try:
+            result = job.func()
+        except Exception as exc:
+            duration_ms = (time.perf_counter() - start) * 1000
+            job.stats.record(started_at, duration_ms, error=f"{type(exc).__name__}: {exc}")
+            logger.exception("Scheduled job failed", extra={"job": job.name, "duration_ms": round(duration_ms, 1)})
+        else:
+            duration_ms = (time.perf_counter() - start) * 1000
+            job.stats.record(started_at, duration_ms, result=result)
+            logger.info(
+                "Scheduled job finished",
+                extra={"job": job.name, "duration_ms": round(duration_ms, 1), "result": result},
+            )
+
+    def tick(self) -> list[str]:
+        """Renew the lease and run due jobs; return the names of the jobs run."""
+        close_old_connections()
+        if not self._renew():
+            return []
+        ran = []
+        for job in self.jobs:
+            now = self.clock()
+            if now < job.next_run:
+                continue
+            # Long jobs must not let the lease lapse under them.
+            if not self._renew():
+                break
+            self.run_job(job)
+            job.next_run = now + job.interval
+            ran.append(job.name)
+        if ran:
+            acquire_lease(self.holder, self.lease_ttl, metrics=self.metrics())
+        return ran
+
+    def stop(self) -> None:
+        if self.is_leader:
+            release_lease(self.holder)
+            self.is_leader = False
+
+
+def _refresh_summaries() -> str:
+    """Rebuild this and last week's analytics summaries."""
+    from .analytics import refresh_weekly_summaries
+
+    today = timezone.localdate()
+    summaries = refresh_weekly_summaries(today - timedelta(days=7), today)
+    return f"{len(summaries)} rows"
+
+
+def _clear_expired_sessions() -> str:
+    """Delete expired sessions, like ``clearsessions``.
+
+    Database rows are purged whatever the engine, since sessions created
+    before a switch to cookie or cache sessions stay in the table.
+    """
+    from django.contrib.sessions.models import Session
+
+    deleted, _ = Session.objects.filter(expire_date__lt=timezone.now()).delete()
+    try:
+        import_module(settings.SESSION_ENGINE).SessionStore.clear_expired()
+    except NotImplementedError:
+        pass
+    return f"{deleted} expired database sessions"
+
+
+def default_jobs(intervals: dict[str, float]) -> list[Job]:
+    """The reminder, outbox, summary and session cleanup jobs with ``intervals`` in seconds, keyed by job name."""
+    from . import outbox, reminders
+
+    funcs = {
+        "reminders": reminders.send_due_reminders,
+        "outbox": outbox.deliver_due,
+        "summaries": _refresh_summaries,
+        "sessions": _clear_expired_sessions,
+    }
+    return [Job(name, func, intervals[name]) for name, func in funcs.items() if intervals.get(name)]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import logging
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import catalog, tenancy
+from .availability import refresh_daily_availability
+from .http_caching import invalidate_worker_pages
+from .images import refresh_worker_photo
+from .models import Booking, Location, Service, Worker, WorkerServicePrice
+
+
+logger = logging.getLogger(__name__)
+
+# Worker fields the DailyAvailability summary is computed from.
+SLOT_FIELDS = ("working_hours_start", "working_hours_end", "slot_step_minutes", "compact_slots")
+
+
+@receiver(post_save, sender=Worker)
+def worker_photo_variants(sender, instance: Worker, raw: bool = False, **kwargs):
+    """Generate thumbnails/WebP variants when a worker's photo is uploaded or replaced."""
+    if raw:
+        return
+    try:
+        refresh_worker_photo(instance)
+    except Exception:
+        # A broken upload must not block saving the worker; the backfill command can retry.
+        logger.exception("Failed to generate worker photo variants", extra={"worker_id": instance.pk})
+
+
+@receiver(pre_save, sender=Booking)
+def remember_booking_day(sender, instance: Booking, raw: bool = False, **kwargs):
+    """Note where an edited booking used to be so that day is refreshed too."""
+    if raw or instance.pk is None:
+        return
+    instance._previous_worker_day = (
+        Booking.objects.filter(pk=instance.pk).values_list("worker_id", "date").first()
+    )
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance: Booking, raw: bool = False, **kwargs):
+    """Refresh the daily availability summary for the booking's day."""
+    if raw:
+        return
+    refresh_daily_availability(instance.worker_id, instance.date, instance.date)
+    previous = getattr(instance, "_previous_worker_day", None)
+    if previous and previous != (instance.worker_id, instance.date):
+        refresh_daily_availability(previous[0], previous[1], previous[1])
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance: Booking, origin=None, **kwargs):
+    """Refresh the summary for a cancelled/deleted booking's day."""
+    # When the worker itself is deleted its summary rows go with it.
+    if isinstance(origin, Worker) or (isinstance(origin, QuerySet) and origin.model is Worker):
+        return
+    refresh_daily_availability(instance.worker_id, instance.date, instance.date)
+
+
+@receiver(pre_save, sender=Worker)
+def remember_worker_hours(sender, instance: Worker, raw: bool = False, update_fields=None, **kwargs):
+    """Note the slot settings before an edit, so unrelated saves skip the summary refresh."""
+    instance._previous_slot_settings = None
+    if raw or instance.pk is None or (update_fields is not None and not set(SLOT_FIELDS) & set(update_fields)):
+        return
+    instance._previous_slot_settings = Worker.objects.filter(pk=instance.pk).values_list(*SLOT_FIELDS).first()
+
+
+@receiver(post_save, sender=Worker)
+def worker_hours_changed(sender, instance: Worker, created: bool = False, raw: bool = False, **kwargs):
+    """Working hours and slot settings bound every gap, so recompute the worker's upcoming days."""
+    previous = getattr(instance, "_previous_slot_settings", None)
+    if raw or created or previous is None:
+        return
+    if previous != tuple(getattr(instance, name) for name in SLOT_FIELDS):
+        refresh_daily_availability(instance.pk, timezone.localdate())
+
+
+@receiver(post_save, sender=WorkerServicePrice)
+@receiver(post_delete, sender=WorkerServicePrice)
+def worker_duration_changed(sender, instance: WorkerServicePrice, raw: bool = False, origin=None, **kwargs):
+    """Worker-specific durations move booking end times."""
+    if raw or isinstance(origin, Worker) or (isinstance(origin, QuerySet) and origin.model is Worker):
+        return
+    refresh_daily_availability(instance.worker_id, timezone.localdate())
+
+
+@receiver(post_save, sender=Service)
+def service_duration_changed(sender, instance: Service, created: bool = False, raw: bool = False, **kwargs):
+    """Default durations apply wherever a worker has no override."""
+    if raw or created:
+        return
+    today = timezone.localdate()
+    worker_ids = (
+        Booking.objects.filter(service=instance, date__gte=today).values_list("worker_id", flat=True).distinct()
+    )
+    for worker_id in list(worker_ids):
+        refresh_daily_availability(worker_id, today)
+
+
+@receiver(pre_save, sender=Worker)
+def remember_worker_location(sender, instance: Worker, raw: bool = False, update_fields=None, **kwargs):
+    """Note the location before an edit, so a move also clears the old location's catalog."""
+    instance._previous_location_id = None
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and not {"location", "location_id"} & set(update_fields):
+        return
+    instance._previous_location_id = (
+        Worker.objects.filter(pk=instance.pk).values_list("location_id", flat=True).first()
+    )
+
+
+def _moved_from(instance: Worker) -> int | None:
+    previous = getattr(instance, "_previous_location_id", None)
+    return previous if previous and previous != instance.location_id else None
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def worker_catalog_changed(sender, instance: Worker, raw: bool = False, **kwargs):
+    if raw:
+        return
+    catalog.invalidate(catalog.WORKERS, catalog.PRICELIST, location_id=instance.location_id)
+    previous = _moved_from(instance)
+    if previous:
+        catalog.invalidate(catalog.WORKERS, catalog.PRICELIST, location_id=previous)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+def service_catalog_changed(sender, instance: Service, raw: bool = False, **kwargs):
+    if not raw:
+        catalog.invalidate(catalog.SERVICES, catalog.PRICELIST, location_id=instance.location_id)
+
+
+@receiver(post_save, sender=WorkerServicePrice)
+@receiver(post_delete, sender=WorkerServicePrice)
+def price_catalog_changed(sender, instance: WorkerServicePrice, raw: bool = False, **kwargs):
+    if not raw:
+        catalog.invalidate(catalog.PRICELIST, location_id=instance.location_id)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_pages_changed(sender, instance: Booking, raw: bool = False, **kwargs):
+    """Drop cached calendar pages of the worker (and the previous one, if the booking moved)."""
+    if raw:
+        return
+    invalidate_worker_pages(instance.worker_id)
+    previous = getattr(instance, "_previous_worker_day", None)
+    if previous and previous[0] != instance.worker_id:
+        invalidate_worker_pages(previous[0])
+
+
+@receiver(post_save, sender=Worker)
+def worker_location_changed(sender, instance: Worker, created: bool = False, raw: bool = False, **kwargs):
+    """Move a worker's bookings and prices along when the worker changes location."""
+    if raw or created or not _moved_from(instance):
+        return
+    for model in (Booking, WorkerServicePrice):
+        model.objects.filter(worker=instance).exclude(location_id=instance.location_id).update(
+            location_id=instance.location_id
+        )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_hosts_changed(sender, raw: bool = False, **kwargs):
+    if not raw:
+        tenancy.invalidate_hosts()
@@ -0,0 +1,54 @@
+"""
+Outgoing SMS, modelled on ``django.core.mail``.
+
+``SMS_BACKEND`` names the backend class: ``twilio`` for production, and
+``console``, ``filebased`` and ``locmem`` stand-ins that need no account.
+The locmem backend appends to ``bookings.sms.outbox`` like Django's
+``mail.outbox``.
+
+    from bookings import sms
+
+    with sms.get_connection() as connection:
+        connection.send_messages([sms.SMSMessage("Hi", "+359888123456")])
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Filled by the locmem backend.
+outbox: list["SMSMessage"] = []
+
+
+class SMSMessage:
+    """One text message; backends set ``status`` ("sent"/"failed"), ``sid`` and ``error``."""
+
+    SENT = "sent"
+    FAILED = "failed"
+
+    def __init__(self, body: str, to: str, from_: str | None = None):
+        self.body = body
+        self.to = to
+        self.from_ = from_ or settings.SMS_FROM_NUMBER
+        self.status: str | None = None
+        self.sid: str | None = None
+        self.error: str | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.status == self.SENT
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"<SMSMessage to={self.to!r} status={self.status!r}>"
+
+
+def get_connection(backend: str | None = None, fail_silently: bool = False, **kwargs):
+    """Instantiate the SMS backend named by ``backend`` or ``settings.SMS_BACKEND``."""
+    klass = import_string(backend or settings.SMS_BACKEND)
+    return klass(fail_silently=fail_silently, **kwargs)
+
+
+def send_sms(body: str, to: str, from_: str | None = None, fail_silently: bool = False, connection=None) -> int:
+    """Send one message; return 1 if it was sent."""
+    connection = connection or get_connection(fail_silently=fail_silently)
+    return connection.send_messages([SMSMessage(body, to, from_)])
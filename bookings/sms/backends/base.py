@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at least ``1 / rate`` seconds apart (no limit when rate is 0)."""
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=time.sleep):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = self.clock()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            self.sleep(slot - now)
+
+
+class BaseSmsBackend:
+    """Base class for SMS backends.
+
+    Subclasses implement ``send_message``. ``send_messages`` sends a batch on
+    up to ``max_workers`` threads while ``rate_limit`` (messages per second)
+    caps the pace across all of them; each message's ``status`` records its
+    outcome and the number sent is returned.
+    """
+
+    def __init__(self, fail_silently: bool = False, max_workers: int | None = None, rate_limit: float | None = None, **kwargs):
+        self.fail_silently = fail_silently
+        self.max_workers = max(1, max_workers if max_workers is not None else settings.SMS_MAX_WORKERS)
+        self.rate_limiter = RateLimiter(rate_limit if rate_limit is not None else settings.SMS_RATE_LIMIT)
+
+    def open(self) -> bool:
+        """Open a network connection; return True if a new one was opened."""
+        return False
+
+    def close(self) -> None:
+        """Close the network connection; a no-op by default."""
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def send_message(self, message) -> None:
+        """Deliver one message, setting ``message.sid``; raise on failure."""
+        raise NotImplementedError("subclasses of BaseSmsBackend must override send_message()")
+
+    def _deliver(self, message) -> bool:
+        self.rate_limiter.wait()
+        try:
+            self.send_message(message)
+        except Exception as exc:
+            message.status, message.error = message.FAILED, str(exc) or type(exc).__name__
+            logger.warning("SMS delivery failed", extra={"to": message.to, "error": message.error})
+            return False
+        message.status, message.error = message.SENT, None
+        return True
+
+    def send_messages(self, messages) -> int:
+        messages = list(messages)
+        if not messages:
+            return 0
+        new_connection = self.open()
+        try:
+            if self.max_workers == 1 or len(messages) == 1:
+                results = [self._deliver(message) for message in messages]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(messages))) as pool:
+                    results = list(pool.map(self._deliver, messages))
+        finally:
+            if new_connection:
+                self.close()
+        failed = [message for message in messages if not message.sent]
+        if failed and not self.fail_silently:
+            raise SmsDeliveryError(failed)
+        return sum(results)
+
+
+class SmsDeliveryError(Exception):
+    """Raised by ``send_messages`` (unless ``fail_silently``) when any message failed."""
+
+    def __init__(self, failed):
+        self.failed = failed
+        super().__init__(f"{len(failed)} SMS message(s) failed: {failed[0].error}")
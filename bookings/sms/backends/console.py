@@ -0,0 +1,26 @@
+"""
+SMS backend that writes messages to a stream (stdout by default), for development.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from uuid import uuid4
+
+from .base import BaseSmsBackend
+
+
+class SmsBackend(BaseSmsBackend):
+    def __init__(self, *args, stream=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def format(self, message) -> str:
+        return f"From: {message.from_}\nTo: {message.to}\n\n{message.body}\n{'-' * 79}\n"
+
+    def send_message(self, message) -> None:
+        message.sid = f"CO{uuid4().hex}"
+        with self._lock:
+            self.stream.write(self.format(message))
+            self.stream.flush()
@@ -0,0 +1,38 @@
+"""
+SMS backend that appends messages to a file in ``settings.SMS_FILE_PATH``, one file per connection.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .console import SmsBackend as ConsoleSmsBackend
+
+
+class SmsBackend(ConsoleSmsBackend):
+    def __init__(self, *args, file_path: str | None = None, **kwargs):
+        path = file_path or settings.SMS_FILE_PATH
+        if not path:
+            raise ImproperlyConfigured("The filebased SMS backend needs SMS_FILE_PATH.")
+        self.directory = Path(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not os.access(self.directory, os.W_OK):
+            raise ImproperlyConfigured(f"SMS_FILE_PATH {self.directory} is not writable.")
+        self.path = self.directory / f"{datetime.now():%Y%m%d-%H%M%S}-{id(self)}.log"
+        super().__init__(*args, stream=None, **kwargs)
+        self.stream = None
+
+    def open(self) -> bool:
+        if self.stream is None:
+            self.stream = self.path.open("a", encoding="utf-8")
+            return True
+        return False
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
@@ -0,0 +1,32 @@
+"""
+SMS backend that keeps messages in ``bookings.sms.outbox``, for tests and offline benchmarks.
+
+``latency`` (seconds, default ``settings.SMS_LOCMEM_LATENCY``) sleeps per
+message to stand in for a provider round trip.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from uuid import uuid4
+
+from django.conf import settings
+
+from bookings import sms
+
+from .base import BaseSmsBackend
+
+_outbox_lock = threading.Lock()
+
+
+class SmsBackend(BaseSmsBackend):
+    def __init__(self, *args, latency: float | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latency = latency if latency is not None else settings.SMS_LOCMEM_LATENCY
+
+    def send_message(self, message) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        message.sid = f"LM{uuid4().hex}"
+        with _outbox_lock:
+            sms.outbox.append(message)
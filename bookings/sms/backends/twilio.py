@@ -0,0 +1,84 @@
+"""
+Twilio SMS backend over the REST API.
+
+One ``requests.Session`` per connection keeps up to ``max_workers`` TLS
+connections alive, so a batch sent from the thread pool reuses them instead of
+handshaking per message. 429 responses and connection errors are retried with
+Twilio's ``Retry-After``; other errors are not, since the message may already
+have been accepted.
+"""
+from __future__ import annotations
+
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .base import BaseSmsBackend
+
+
+class SmsBackend(BaseSmsBackend):
+    def __init__(
+        self,
+        *args,
+        account_sid: str | None = None,
+        auth_token: str | None = None,
+        api_url: str | None = None,
+        timeout: float | None = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.account_sid = account_sid or settings.TWILIO_ACCOUNT_SID
+        self.auth_token = auth_token or settings.TWILIO_AUTH_TOKEN
+        if not (self.account_sid and self.auth_token):
+            raise ImproperlyConfigured("The Twilio SMS backend needs TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN.")
+        base = (api_url or settings.TWILIO_API_URL).rstrip("/")
+        self.messages_url = f"{base}/2010-04-01/Accounts/{self.account_sid}/Messages.json"
+        self.timeout = timeout if timeout is not None else settings.SMS_TIMEOUT
+        self.session: requests.Session | None = None
+        self._lock = threading.Lock()
+
+    def open(self) -> bool:
+        with self._lock:
+            if self.session is not None:
+                return False
+            session = requests.Session()
+            session.auth = (self.account_sid, self.auth_token)
+            retry = Retry(
+                total=3,
+                connect=3,
+                read=0,
+                status=3,
+                status_forcelist=(429,),
+                allowed_methods=frozenset({"POST"}),
+                backoff_factor=0.5,
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.session = session
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def send_message(self, message) -> None:
+        response = self.session.post(
+            self.messages_url,
+            data={"To": message.to, "From": message.from_, "Body": message.body},
+            timeout=self.timeout,
+        )
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = {}
+        if response.status_code >= 400:
+            raise RuntimeError(f"Twilio {response.status_code}: {payload.get('message') or response.reason}")
+        message.sid = payload.get("sid")
@@ -0,0 +1,102 @@
+"""
+Locations (salons) served by one deployment.
+
+``LocationMiddleware`` maps the request's host name to a ``Location`` and
+activates it in a context variable for the rest of the request. The catalog,
+the page cache and the ``location`` default of new workers and services read
+it from there, so forms and templates need not pass it around; views that
+query directly filter on ``request.location_id``. Outside a request
+(management commands, the scheduler) the default location is active unless
+code wraps itself in ``activate()``.
+
+The host map costs one cache read per request and is dropped whenever a
+location is saved or deleted.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.http.request import split_domain_port
+
+from . import routing
+from .models import Location
+
+HOSTS_CACHE_KEY = "bookings:locations"
+DEFAULT_LOCATION_NAME = "Main salon"
+
+_current: ContextVar[int | None] = ContextVar("bookings_location", default=None)
+
+
+def _host_map() -> tuple[dict[str, int], int | None]:
+    """(host name -> location id, default location id), cached until a location changes."""
+    data = cache.get(HOSTS_CACHE_KEY)
+    if data is None:
+        with routing.primary():
+            rows = list(Location.objects.values_list("id", "hostname", "is_default"))
+        data = (
+            {hostname.lower(): location_id for location_id, hostname, _ in rows if hostname},
+            next((location_id for location_id, _, is_default in rows if is_default), None),
+        )
+        cache.set(HOSTS_CACHE_KEY, data, None)
+    return data
+
+
+def invalidate_hosts() -> None:
+    cache.delete(HOSTS_CACHE_KEY)
+
+
+def default_location_id() -> int:
+    """The fallback location, created on first use in an empty database."""
+    location_id = _host_map()[1]
+    if location_id is None:
+        location, _ = Location.objects.get_or_create(
+            is_default=True, defaults={"name": DEFAULT_LOCATION_NAME, "slug": "main"}
+        )
+        invalidate_hosts()
+        location_id = location.pk
+    return location_id
+
+
+def location_id_for_host(host: str) -> int:
+    """Location serving ``host`` (port ignored), else the default location."""
+    hosts, _ = _host_map()
+    return hosts.get(split_domain_port(host)[0]) or default_location_id()
+
+
+def location_id_for_slug(slug: str | None) -> int:
+    """Id of the location with ``slug``, or of the default location for None.
+
+    Raises ``Location.DoesNotExist`` for an unknown slug.
+    """
+    if slug is None:
+        return default_location_id()
+    return Location.objects.values_list("id", flat=True).get(slug=slug)
+
+
+def current_location_id() -> int:
+    """Location of the current request or ``activate()`` block, else the default location."""
+    return _current.get() or default_location_id()
+
+
+@contextmanager
+def activate(location_id: int):
+    """Make ``location_id`` current for the enclosed block."""
+    token = _current.set(location_id)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+class LocationMiddleware:
+    """Route each request to the location serving its host name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.location_id = location_id_for_host(request.get_host())
+        with activate(request.location_id):
+            return self.get_response(request)
@@ -0,0 +1,80 @@
+"""
+Unit tests for the booking admin.
+"""
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from bookings.admin import CappedCountPaginator
+from bookings.models import Worker, Service, Booking
+
+
+class BookingAdminTest(TestCase):
+    """Test cases for BookingAdmin changelist."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        self.workers = [Worker.objects.create(full_name=f"Worker {i}") for i in range(3)]
+        self.services = [Service.objects.create(name=f"Service {i}") for i in range(3)]
+        self.url = reverse("admin:bookings_booking_changelist")
+
+    def _create_bookings(self, count: int, phone_prefix: str = "+359", offset: int = 0) -> None:
+        start = date.today() + timedelta(days=1 + offset)
+        Booking.objects.bulk_create(
+            Booking(
+                worker=self.workers[i % 3],
+                service=self.services[i % 3],
+                date=start + timedelta(days=i),
+                time=time(10, 0),
+                phone=f"{phone_prefix}{i:07d}",
+            )
+            for i in range(count)
+        )
+
+    def _changelist_queries(self) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_query_count_independent_of_rows(self):
+        """Test that worker/service columns don't trigger per-row queries."""
+        self._create_bookings(3)
+        few = self._changelist_queries()
+        self._create_bookings(40, phone_prefix="+44", offset=3)
+        self.assertEqual(self._changelist_queries(), few)
+
+    def test_phone_prefix_search(self):
+        """Test that phone search matches by prefix only."""
+        self._create_bookings(3)
+        Booking.objects.create(
+            worker=self.workers[0], service=self.services[0], date=date.today(), time=time(9, 0), phone="0888 123 456"
+        )
+        response = self.client.get(self.url, {"q": "0888"})
+        self.assertEqual([b.phone for b in response.context["cl"].result_list], ["0888 123 456"])
+        response = self.client.get(self.url, {"q": "123"})
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_date_hierarchy_drilldown(self):
+        """Test that the date hierarchy filters the changelist."""
+        self._create_bookings(3)
+        target = date.today() + timedelta(days=1)
+        response = self.client.get(
+            self.url, {"date__year": target.year, "date__month": target.month, "date__day": target.day}
+        )
+        self.assertEqual([b.date for b in response.context["cl"].result_list], [target])
+
+    def test_paginator_caps_count(self):
+        """Test that the paginator stops counting at the cap."""
+        self._create_bookings(8)
+        paginator = CappedCountPaginator(Booking.objects.all(), 2)
+        paginator.count_cap = 5
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(CappedCountPaginator(Booking.objects.all(), 2).count, 8)
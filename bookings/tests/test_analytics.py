@@ -0,0 +1,82 @@
+"""
+Unit tests for weekly analytics summaries.
+"""
+from __future__ import annotations
+
+from datetime import date, time
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from bookings import analytics
+from bookings.models import Worker, Service, Booking, BookingCancellation, WorkerServicePrice, WorkerWeekSummary
+
+
+class WeeklySummaryTest(TestCase):
+    """Test cases for analytics.refresh_weekly_summaries."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # 09:00-17:00 -> 480 minutes a day, 3360 a week.
+        self.worker = Worker.objects.create(full_name="John Doe", working_hours_start=time(9, 0), working_hours_end=time(17, 0))
+        self.other = Worker.objects.create(full_name="Jane Roe")
+        self.cut = Service.objects.create(name="Haircut", duration_minutes=30)
+        self.color = Service.objects.create(name="Color", duration_minutes=90)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.cut, price=Decimal("25.00"), duration_minutes=48)
+        self.monday = date(2030, 1, 7)
+
+        def book(worker, service, day, hour, **extra):
+            return Booking.objects.create(worker=worker, service=service, date=day, time=time(hour, 0), phone="+1234567890", **extra)
+
+        book(self.worker, self.cut, self.monday, 10)
+        book(self.worker, self.cut, date(2030, 1, 8), 10)
+        book(self.worker, self.cut, date(2030, 1, 9), 14, no_show=True)
+        # No worker price: service duration, no revenue.
+        book(self.worker, self.color, date(2030, 1, 12), 11)
+        book(self.worker, None, date(2030, 1, 14), 9)
+        book(self.other, self.cut, self.monday, 12)
+        BookingCancellation.objects.create(worker=self.worker, service=self.cut, date=date(2030, 1, 10), time=time(15, 0))
+
+    def test_single_booking_query(self):
+        """Test that per-week booking totals with worker prices come from one grouped query."""
+        with self.assertNumQueries(1):
+            rows = list(analytics.weekly_booking_totals(self.monday, date(2030, 1, 20)))
+        self.assertEqual(len(rows), 3)
+
+    def test_weekly_summary_values(self):
+        """Test occupancy, revenue, no-show, cancellation and peak hour per worker-week."""
+        analytics.refresh_weekly_summaries(self.monday, date(2030, 1, 14))
+        summary = WorkerWeekSummary.objects.get(worker=self.worker, week_start=self.monday)
+        self.assertEqual(summary.booking_count, 4)
+        self.assertEqual(summary.booked_minutes, 48 * 3 + 90)
+        self.assertEqual(summary.available_minutes, 480 * 7)
+        self.assertEqual(summary.occupancy_percent, Decimal("7.0"))
+        self.assertEqual(summary.revenue, Decimal("50.00"))
+        self.assertEqual(summary.no_show_count, 1)
+        self.assertEqual(summary.cancellation_count, 1)
+        self.assertEqual(summary.peak_hour, 10)
+
+        next_week = WorkerWeekSummary.objects.get(worker=self.worker, week_start=date(2030, 1, 14))
+        self.assertEqual((next_week.booking_count, next_week.booked_minutes, next_week.peak_hour), (1, 60, 9))
+        self.assertEqual(WorkerWeekSummary.objects.get(worker=self.other).booked_minutes, 30)
+
+    def test_refresh_replaces_rows(self):
+        """Test that rebuilding a window replaces its rows instead of duplicating them."""
+        analytics.refresh_weekly_summaries(self.monday, self.monday)
+        Booking.objects.filter(worker=self.other).delete()
+        analytics.refresh_weekly_summaries(self.monday, self.monday)
+        self.assertEqual(WorkerWeekSummary.objects.filter(week_start=self.monday).count(), 1)
+
+    def test_empty_window(self):
+        """Test that a window without bookings stores nothing."""
+        summary = analytics.refresh_weekly_summaries(date(2031, 1, 1), date(2031, 1, 31))
+        self.assertEqual(len(summary), 0)
+        self.assertFalse(WorkerWeekSummary.objects.exists())
+
+    def test_command(self):
+        """Test the build_analytics command."""
+        out = StringIO()
+        call_command("build_analytics", "--start", "2030-01-07", "--end", "2030-01-20", stdout=out)
+        self.assertIn("Stored 3 worker-week summaries", out.getvalue())
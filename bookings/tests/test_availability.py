@@ -0,0 +1,305 @@
+"""
+Unit tests for availability helpers.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from bookings import availability
+from bookings.models import Worker, Service, Booking, DailyAvailability, WorkerServicePrice
+
+
+class SlotsForDayTest(SimpleTestCase):
+    """Test cases for slots_for_day."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.day = date(2030, 1, 7)
+        self.hours = (time(9, 0), time(11, 0))
+        self.now = datetime(2030, 1, 1, 12, 0)
+
+    def test_slots_cover_working_hours(self):
+        """Test that 15-minute starts are generated up to the last fitting start."""
+        slots = availability.slots_for_day(self.day, 60, self.hours, [], self.now)
+        self.assertEqual(slots[0]["time"], "09:00")
+        self.assertEqual(slots[-1]["time"], "10:00")
+        self.assertEqual(len(slots), 5)
+        self.assertTrue(all(slot["available"] for slot in slots))
+
+    def test_overlapping_slots_marked_busy(self):
+        """Test that starts overlapping an existing interval are unavailable."""
+        booked = [(datetime(2030, 1, 7, 9, 30), datetime(2030, 1, 7, 10, 0))]
+        slots = {s["time"]: s["available"] for s in availability.slots_for_day(self.day, 30, self.hours, booked, self.now)}
+        self.assertTrue(slots["09:00"])
+        self.assertFalse(slots["09:15"])
+        self.assertFalse(slots["09:30"])
+        self.assertTrue(slots["10:00"])
+
+    def test_past_slots_skipped_today(self):
+        """Test that starts ending before now are dropped on the current day."""
+        now = datetime(2030, 1, 7, 10, 0)
+        slots = availability.slots_for_day(self.day, 30, self.hours, [], now)
+        self.assertEqual(slots[0]["time"], "09:45")
+
+    def test_service_longer_than_day(self):
+        """Test that no slots are returned when the service does not fit."""
+        self.assertEqual(availability.slots_for_day(self.day, 180, self.hours, [], self.now), [])
+
+
+class SlotGranularityTest(SimpleTestCase):
+    """Test cases for configurable slot steps and compact mode."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.day = date(2030, 1, 7)
+        self.hours = (time(9, 0), time(13, 0))
+        self.now = datetime(2030, 1, 1, 12, 0)
+        begin = datetime.combine(self.day, time(10, 0))
+        self.intervals = [(begin, begin + timedelta(minutes=40))]
+
+    def test_coarser_step(self):
+        """Test that a 30-minute step halves the candidates."""
+        slots = availability.slots_for_day(self.day, 90, self.hours, self.intervals, self.now, step=30)
+        self.assertEqual([s["time"] for s in slots], ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"])
+        self.assertEqual([s["time"] for s in slots if s["available"]], ["11:00", "11:30"])
+
+    def test_compact_offers_adjacent_starts(self):
+        """Test that compact mode only offers starts touching bookings or the day's edges."""
+        slots = availability.slots_for_day(self.day, 60, self.hours, self.intervals, self.now, compact=True)
+        self.assertEqual([s["time"] for s in slots], ["09:00", "10:40", "12:00"])
+        self.assertTrue(all(s["available"] for s in slots))
+
+    def test_slot_step_precedence(self):
+        """Test that a service step overrides the worker step, which overrides the default."""
+        worker = Worker(slot_step_minutes=20)
+        self.assertEqual(availability.slot_step(worker, Service(slot_step_minutes=45)), 45)
+        self.assertEqual(availability.slot_step(worker, Service()), 20)
+        self.assertEqual(availability.slot_step(None, None), availability.SLOT_STEP_MINUTES)
+
+    def test_day_fits_matches_slots(self):
+        """Test that summary-based fitting agrees with slot generation for every step and mode."""
+        begin = datetime.combine(self.day, time(11, 35))
+        intervals = self.intervals + [(begin, begin + timedelta(minutes=25))]
+        gaps = availability.free_gaps(self.day, self.hours, intervals)
+        for step in (5, 15, 20, 30, 45, 60):
+            for compact in (False, True):
+                largest = availability.largest_gap(gaps, 9 * 60, 15)
+                for duration in range(5, 241, 5):
+                    slots = availability.slots_for_day(self.day, duration, self.hours, intervals, self.now, step, compact)
+                    expected = any(s["available"] for s in slots)
+                    fits = availability.day_fits((largest, gaps), duration, self.hours, step, compact)
+                    self.assertEqual(fits, expected, (step, compact, duration))
+
+
+class IntervalLoaderTest(TestCase):
+    """Test cases for interval loaders."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        self.other_service = Service.objects.create(name="Color", duration_minutes=90)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=20, duration_minutes=45)
+        self.day = date.today() + timedelta(days=2)
+        for hour, service in ((10, self.service), (13, self.other_service), (16, None)):
+            Booking.objects.create(worker=self.worker, service=service, date=self.day, time=time(hour, 0), phone="+1234567890")
+
+    def test_intervals_use_worker_durations(self):
+        """Test that intervals use worker prices, service defaults and the 60 minute fallback."""
+        durations = availability.duration_map(self.worker)
+        intervals = availability.intervals_by_date(self.worker, self.day, self.day, durations)[self.day]
+        lengths = [int((end - start).total_seconds() // 60) for start, end in intervals]
+        self.assertEqual(lengths, [45, 90, 60])
+
+    def test_intervals_fixed_query_count(self):
+        """Test that loading intervals costs two queries regardless of booking count."""
+        with self.assertNumQueries(2):
+            durations = availability.duration_map(self.worker)
+            availability.intervals_by_date(self.worker, self.day, self.day, durations)
+
+
+class DayBookingsConflictTest(TestCase):
+    """Test cases for conflict checks against a worker-day's bookings, as BookingForm runs them."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        self.day = date.today() + timedelta(days=2)
+        self.booking = Booking.objects.create(
+            worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890"
+        )
+
+    def _conflicts(self, start_time, worker=None, day=None, service=None, exclude_id=None):
+        worker, day, service = worker or self.worker, day or self.day, service or self.service
+        durations = availability.duration_map(worker)
+        start = datetime.combine(day, start_time)
+        end = start + timedelta(minutes=availability.service_duration(service, durations))
+        bookings = availability.day_bookings(worker.pk, day, durations, exclude_id=exclude_id)
+        return availability.overlaps((start, end), bookings.values())
+
+    def test_overlaps(self):
+        """Test that starts overlapping the 10:00-10:30 booking conflict and adjacent ones do not."""
+        self.assertFalse(self._conflicts(time(11, 0)))
+        self.assertFalse(self._conflicts(time(9, 30)))
+        self.assertTrue(self._conflicts(time(10, 15)))
+        self.assertTrue(self._conflicts(time(9, 45)))
+        self.assertTrue(self._conflicts(time(10, 0)))
+
+    def test_excluded_booking(self):
+        """Test that a booking does not conflict with itself when excluded."""
+        self.assertFalse(self._conflicts(time(10, 0), exclude_id=self.booking.pk))
+
+    def test_other_worker_and_date(self):
+        """Test that conflicts only count the same worker and date."""
+        other_worker = Worker.objects.create(full_name="Jane Smith")
+        self.assertFalse(self._conflicts(time(10, 0), worker=other_worker))
+        self.assertFalse(self._conflicts(time(10, 0), day=self.day + timedelta(days=1)))
+
+    def test_durations(self):
+        """Test that service defaults and worker-specific durations bound each booking."""
+        long_service = Service.objects.create(name="Long Service", duration_minutes=120)
+        Booking.objects.create(
+            worker=self.worker, service=long_service, date=self.day, time=time(12, 0), phone="+1234567890"
+        )
+        # 12:00-14:00 with the service default.
+        self.assertTrue(self._conflicts(time(13, 30)))
+        WorkerServicePrice.objects.create(worker=self.worker, service=long_service, price=80, duration_minutes=30)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=50, duration_minutes=45)
+        # 12:00-12:30 with the worker's override; 11:30 + 45 minutes reaches into 12:00.
+        self.assertFalse(self._conflicts(time(13, 30)))
+        self.assertTrue(self._conflicts(time(11, 30)))
+
+    def test_day_bookings_single_query(self):
+        """Test that a worker-day's bookings load in one query."""
+        durations = availability.duration_map(self.worker)
+        with self.assertNumQueries(1):
+            availability.day_bookings(self.worker.pk, self.day, durations)
+
+
+class DayGapsTest(SimpleTestCase):
+    """Test cases for day_gaps."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.day = date(2030, 1, 7)
+        self.hours = (time(9, 0), time(12, 0))
+
+    def _interval(self, start: time, minutes: int):
+        begin = datetime.combine(self.day, start)
+        return begin, begin + timedelta(minutes=minutes)
+
+    def test_empty_day(self):
+        """Test that an empty day is one gap the length of working hours."""
+        self.assertEqual(availability.day_gaps(self.day, self.hours, []), (180, 180))
+
+    def test_gaps_align_to_slot_grid(self):
+        """Test that a gap opening off the 15-minute grid only counts from the next grid start."""
+        intervals = [self._interval(time(9, 0), 50), self._interval(time(11, 0), 60)]
+        free, largest = availability.day_gaps(self.day, self.hours, intervals)
+        self.assertEqual(free, 70)
+        self.assertEqual(largest, 60)
+
+    def test_matches_slot_generation(self):
+        """Test that largest_gap >= duration agrees with slots_for_day for every duration."""
+        intervals = [self._interval(time(9, 20), 35), self._interval(time(10, 40), 45)]
+        _, largest = availability.day_gaps(self.day, self.hours, intervals)
+        now = datetime(2030, 1, 1)
+        for duration in range(5, 181, 5):
+            slots = availability.slots_for_day(self.day, duration, self.hours, intervals, now)
+            self.assertEqual(any(s["available"] for s in slots), largest >= duration, duration)
+
+    def test_bookings_outside_hours_are_clipped(self):
+        """Test that bookings straddling opening time only block working minutes."""
+        intervals = [self._interval(time(8, 0), 90)]
+        self.assertEqual(availability.day_gaps(self.day, self.hours, intervals), (150, 150))
+
+
+class DailyAvailabilityTest(TestCase):
+    """Test cases for the incrementally maintained DailyAvailability summary."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe", working_hours_start=time(9, 0), working_hours_end=time(12, 0))
+        self.service = Service.objects.create(name="Haircut", duration_minutes=60)
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def _row(self):
+        return DailyAvailability.objects.filter(worker=self.worker, date=self.day).first()
+
+    def test_booking_save_and_delete(self):
+        """Test that saving and deleting bookings keeps the day's row current."""
+        booking = Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        self.assertEqual((self._row().free_minutes, self._row().largest_gap_minutes), (120, 60))
+        booking.delete()
+        self.assertIsNone(self._row())
+
+    def test_moved_booking_refreshes_both_days(self):
+        """Test that moving a booking to another day refreshes the old and new day."""
+        booking = Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        booking.date = self.day + timedelta(days=1)
+        booking.save()
+        self.assertIsNone(self._row())
+        self.assertTrue(DailyAvailability.objects.filter(worker=self.worker, date=booking.date).exists())
+
+    def test_working_hours_and_duration_changes(self):
+        """Test that working hours and worker durations recompute upcoming days."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        self.worker.working_hours_end = time(13, 0)
+        self.worker.save()
+        self.assertEqual(self._row().largest_gap_minutes, 120)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=20, duration_minutes=30)
+        self.assertEqual(self._row().largest_gap_minutes, 150)
+        self.service.duration_minutes = 120
+        self.service.save()
+        self.assertEqual(self._row().largest_gap_minutes, 150)
+
+    def test_unrelated_worker_edits_skip_refresh(self):
+        """Test that saving a worker without touching hours or slot settings keeps the summary as is."""
+        with patch("bookings.signals.refresh_daily_availability") as refresh:
+            self.worker.bio = "Ten years of colour work"
+            self.worker.save()
+            self.worker.save(update_fields=["bio"])
+            refresh.assert_not_called()
+            self.worker.slot_step_minutes = 30
+            self.worker.save(update_fields=["slot_step_minutes"])
+            refresh.assert_called_once_with(self.worker.pk, timezone.localdate())
+
+    def test_deleting_worker(self):
+        """Test that deleting a worker with bookings doesn't recreate its summary rows."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=20, duration_minutes=30)
+        self.worker.delete()
+        self.assertFalse(DailyAvailability.objects.exists())
+
+    def test_import_refreshes_summary(self):
+        """Test that bulk imports, which skip signals, still refresh the summary."""
+        from bookings import dataio
+
+        text = f"worker_id,service,date,time,phone,email\n{self.worker.id},Haircut,{self.day},09:00,+1234567890,\n"
+        dataio.import_rows("bookings", dataio.read_rows(StringIO(text), "csv"))
+        self.assertEqual(self._row().largest_gap_minutes, 120)
+
+    def test_rebuild_command(self):
+        """Test that rebuild_availability recreates missing rows."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        DailyAvailability.objects.all().delete()
+        call_command("rebuild_availability", stdout=StringIO())
+        self.assertEqual(self._row().free_minutes, 120)
+
+    def test_rebuild_command_missing_only(self):
+        """Test that rebuild_availability --missing only touches workers with unsummarized booking days."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        other = Worker.objects.create(full_name="Jane Roe")
+        Booking.objects.create(worker=other, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890")
+        DailyAvailability.objects.filter(worker=self.worker).delete()
+        out = StringIO()
+        call_command("rebuild_availability", "--missing", stdout=out)
+        self.assertIn("for 1 workers", out.getvalue())
+        self.assertEqual(self._row().free_minutes, 120)
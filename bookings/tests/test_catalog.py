@@ -0,0 +1,69 @@
+"""
+Unit tests for the cached worker/service catalog.
+"""
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from bookings import catalog, tenancy
+from bookings.forms import BookingForm
+from bookings.models import Worker, Service, WorkerServicePrice
+
+
+class CatalogTest(TestCase):
+    """Test cases for catalog lookups and invalidation."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.inactive = Worker.objects.create(full_name="Gone Away", is_active=False)
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=20, duration_minutes=40)
+
+    def test_second_lookup_runs_no_queries(self):
+        """Test that warm lookups are served without SQL."""
+        self.assertEqual(catalog.active_workers(), [self.worker])
+        catalog.services()
+        catalog.pricelist()
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog.active_workers(), [self.worker])
+            self.assertEqual(catalog.services(), [self.service])
+            self.assertEqual(catalog.worker_prices(self.worker.id)[0].duration_minutes, 40)
+            self.assertIsNone(catalog.active_worker(self.inactive.id))
+
+    def test_save_invalidates(self):
+        """Test that model saves drop the affected entries."""
+        catalog.active_workers()
+        Worker.objects.create(full_name="Anna Smith")
+        self.assertEqual([w.full_name for w in catalog.active_workers()], ["Anna Smith", "John Doe"])
+
+        catalog.pricelist()
+        WorkerServicePrice.objects.filter(worker=self.worker).update(duration_minutes=50)
+        self.assertEqual(catalog.worker_prices(self.worker.id)[0].duration_minutes, 40)
+        price = WorkerServicePrice.objects.get(worker=self.worker)
+        price.save()
+        self.assertEqual(catalog.worker_prices(self.worker.id)[0].duration_minutes, 50)
+
+    def test_version_bump_from_another_process(self):
+        """Test that a version written to the shared cache by another worker drops the local copy."""
+        catalog.services()
+        Service.objects.filter(pk=self.service.pk).update(name="Cut")
+        # What invalidate() in another gunicorn worker leaves behind: only the shared version changes.
+        cache.set(catalog._version_key(tenancy.current_location_id(), catalog.SERVICES), "other-process", None)
+        self.assertEqual(catalog.services()[0].name, "Cut")
+
+    def test_form_renders_without_queries(self):
+        """Test that BookingForm's choice fields read the catalog."""
+        catalog.active_workers()
+        catalog.services()
+        with self.assertNumQueries(0):
+            html = BookingForm().as_p()
+        self.assertIn("John Doe", html)
+        self.assertNotIn("Gone Away", html)
+
+    def test_form_rejects_inactive_worker(self):
+        """Test that only catalog workers validate."""
+        form = BookingForm(data={"worker": self.inactive.id, "service": self.service.id})
+        self.assertFalse(form.is_valid())
+        self.assertIn("worker", form.errors)
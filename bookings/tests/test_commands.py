@@ -0,0 +1,119 @@
+"""
+Unit tests for booking management commands.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from bookings import reminders, sms
+from bookings.management.commands.profile_imports import parse_importtime, summarize_by_root
+from bookings.models import Booking, Service, Worker
+
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       209 |        209 |   _io
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django.utils
+import time:       500 |        920 | django
+import time:        80 |         80 | whitenoise
+"""
+
+
+class ProfileImportsTest(SimpleTestCase):
+    """Test cases for the profile_imports command helpers."""
+
+    def test_parse_importtime_skips_header(self):
+        """Test that the header line is ignored and values are parsed."""
+        records = parse_importtime(IMPORTTIME_SAMPLE)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[0].module, "_io")
+        self.assertEqual(records[3].module, "django")
+        self.assertEqual(records[3].cumulative_us, 920)
+
+    def test_parse_importtime_depth(self):
+        """Test that nesting depth is derived from indentation."""
+        records = parse_importtime(IMPORTTIME_SAMPLE)
+        depths = {record.module: record.depth for record in records}
+        self.assertEqual(depths["django"], 0)
+        self.assertEqual(depths["django.utils"], 1)
+        self.assertEqual(depths["django.utils.version"], 2)
+
+    def test_summarize_by_root(self):
+        """Test that self time is aggregated per top-level package."""
+        summary = summarize_by_root(parse_importtime(IMPORTTIME_SAMPLE))
+        self.assertEqual(summary[0], ("django", 920, 3))
+        self.assertIn(("whitenoise", 80, 1), summary)
+
+
+@override_settings(SMS_BACKEND="bookings.sms.backends.locmem.SmsBackend")
+class SendRemindersTest(TestCase):
+    """Test cases for the send_reminders command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        sms.outbox.clear()
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut")
+        self.now = timezone.localtime().replace(minute=0, second=0, microsecond=0)
+
+    def _booking(self, hours_ahead: int, **kwargs) -> Booking:
+        start = self.now + timedelta(hours=hours_ahead)
+        return Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=start.date(),
+            time=start.time(),
+            phone="+1234567890",
+            email=kwargs.pop("email", "client@example.com"),
+            **kwargs,
+        )
+
+    def test_second_run_sends_nothing(self):
+        """Test that a booking is reminded once however often the command runs."""
+        soon = self._booking(3)
+        self._booking(30)
+        call_command("send_reminders", stdout=StringIO())
+        self.assertEqual([m.to for m in mail.outbox], [["client@example.com"]])
+        self.assertEqual([m.to for m in sms.outbox], ["+1234567890"])
+        soon.refresh_from_db()
+        self.assertIsNotNone(soon.reminder_sent_at)
+
+        out = StringIO()
+        call_command("send_reminders", stdout=out)
+        self.assertIn("Processed 0 reminders", out.getvalue())
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_due_query_skips_sent_bookings(self):
+        """Test that only unsent bookings starting within the window are selected."""
+        due = self._booking(2)
+        self._booking(5, reminder_sent_at=self.now)
+        self._booking(-2)
+        self.assertEqual(list(reminders.due_reminders(self.now)), [due])
+
+    def test_failed_delivery_is_retried(self):
+        """Test that a booking whose email and SMS both failed is released for the next run."""
+        booking = self._booking(2)
+        with patch("bookings.reminders.send_mail", side_effect=OSError("SMTP down")), patch(
+            "bookings.sms.backends.locmem.SmsBackend.send_message", side_effect=OSError("SMS down")
+        ):
+            self.assertEqual(reminders.send_due_reminders(self.now), 0)
+        booking.refresh_from_db()
+        self.assertIsNone(booking.reminder_sent_at)
+        self.assertEqual(reminders.send_due_reminders(self.now), 1)
+
+    def test_rescheduled_booking_is_reminded_again(self):
+        """Test that moving a booking resets its reminder state and start time."""
+        booking = self._booking(2, reminder_sent_at=self.now)
+        booking.time = (self.now + timedelta(hours=3)).time()
+        booking.save(update_fields=["time"])
+        booking.refresh_from_db()
+        self.assertIsNone(booking.reminder_sent_at)
+        self.assertEqual(booking.starts_at, self.now + timedelta(hours=3))
@@ -0,0 +1,158 @@
+"""
+Unit tests for bulk import/export.
+"""
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+from decimal import Decimal
+from io import StringIO
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from bookings import dataio
+from bookings.models import Location, Worker, Service, Booking, WorkerServicePrice
+
+
+class DataIOTest(TestCase):
+    """Test cases for dataio import/export."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(
+            full_name="John Doe", role="Stylist", slot_step_minutes=30, compact_slots=True
+        )
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30, slot_step_minutes=5)
+        self.price = WorkerServicePrice.objects.create(
+            worker=self.worker, service=self.service, price=Decimal("25.00"), duration_minutes=45
+        )
+        self.day = date.today() + timedelta(days=3)
+        Booking.objects.create(
+            worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890"
+        )
+
+    def _export(self, kind: str, fmt: str) -> str:
+        stream = StringIO()
+        dataio.write_rows(dataio.iter_export_rows(kind), dataio.COLUMNS[kind], stream, fmt)
+        return stream.getvalue()
+
+    def _import(self, kind: str, text: str, fmt: str, **kwargs):
+        return dataio.import_rows(kind, dataio.read_rows(StringIO(text), fmt), **kwargs)
+
+    def test_roundtrip_all_kinds(self):
+        """Test that exported data re-imports into an empty database."""
+        for fmt in dataio.FORMATS:
+            with self.subTest(fmt=fmt):
+                exports = {kind: self._export(kind, fmt) for kind in dataio.KINDS}
+                Booking.objects.all().delete()
+                WorkerServicePrice.objects.all().delete()
+                Service.objects.all().delete()
+                Worker.objects.all().delete()
+
+                for kind in dataio.KINDS:
+                    self._import(kind, exports[kind], fmt)
+
+                booking = Booking.objects.get()
+                self.assertEqual(booking.worker_id, self.worker.id)
+                self.assertEqual(booking.service.name, "Haircut")
+                self.assertEqual(booking.service.slot_step_minutes, 5)
+                self.assertEqual(WorkerServicePrice.objects.get().duration_minutes, 45)
+                worker = Worker.objects.get()
+                self.assertEqual((worker.slot_step_minutes, worker.compact_slots), (30, True))
+
+    def test_csv_price_update(self):
+        """Test a seasonal price update via CSV upserts existing prices."""
+        text = f"worker_id,service,price,duration_minutes\n{self.worker.id},Haircut,30.50,40\n"
+        result = self._import("prices", text, "csv")
+        self.assertEqual((result.created, result.updated), (0, 1))
+        self.price.refresh_from_db()
+        self.assertEqual(self.price.price, Decimal("30.50"))
+        self.assertEqual(self.price.duration_minutes, 40)
+
+    def test_booking_conflict_aborts_import(self):
+        """Test that an overlapping booking fails the whole import."""
+        text = (
+            "worker_id,service,date,time,phone,email\n"
+            f"{self.worker.id},Haircut,{self.day},12:00,+1234567890,\n"
+            f"{self.worker.id},Haircut,{self.day},10:30,+1234567890,\n"
+        )
+        with self.assertRaises(dataio.DataImportError) as ctx:
+            self._import("bookings", text, "csv")
+        self.assertIn("row 2", ctx.exception.errors[0])
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_booking_conflicts_within_file(self):
+        """Test that rows in the same file are checked against each other."""
+        text = (
+            "worker_id,service,date,time,phone,email\n"
+            f"{self.worker.id},Haircut,{self.day},14:00,+1234567890,\n"
+            f"{self.worker.id},Haircut,{self.day},14:15,+1234567890,\n"
+        )
+        result = self._import("bookings", text, "csv", skip_conflicts=True, chunk_size=1)
+        self.assertEqual((result.created, result.skipped), (1, 1))
+
+    def test_duplicate_booking_rows(self):
+        """Test that a repeated worker/date/time row is reported instead of counted as an update."""
+        text = (
+            "worker_id,service,date,time,phone,email\n"
+            f"{self.worker.id},Haircut,{self.day},14:00,+1234567890,\n"
+            f"{self.worker.id},Haircut,{self.day},14:00,+1987654321,\n"
+        )
+        with self.assertRaises(dataio.DataImportError) as ctx:
+            self._import("bookings", text, "csv", chunk_size=1)
+        self.assertIn("row 2: duplicates row 1", ctx.exception.errors[0])
+
+        result = self._import("bookings", text, "csv", skip_conflicts=True)
+        self.assertEqual((result.created, result.updated, result.skipped), (1, 0, 1))
+        self.assertEqual(Booking.objects.get(time=time(14, 0)).phone, "+1234567890")
+
+    def test_worker_id_collision_reported(self):
+        """Test that an explicit id used by another location's worker is a row error."""
+        north = Location.objects.create(name="North", slug="north")
+        other = Worker.objects.create(full_name="North Stylist", location=north)
+        text = f"id,full_name\n{other.id},Jane Roe\n"
+        with self.assertRaises(dataio.DataImportError) as ctx:
+            self._import("workers", text, "csv")
+        self.assertIn("belongs to another location", ctx.exception.errors[0])
+        self.assertEqual(Worker.objects.get(id=other.id).full_name, "North Stylist")
+
+    def test_invalid_phone_reported(self):
+        """Test that model validators run on imported values."""
+        text = f"worker_id,service,date,time,phone,email\n{self.worker.id},Haircut,{self.day},15:00,abc,\n"
+        with self.assertRaises(dataio.DataImportError) as ctx:
+            self._import("bookings", text, "csv")
+        self.assertIn("phone", ctx.exception.errors[0])
+
+    def test_dry_run_rolls_back(self):
+        """Test that dry runs validate without writing."""
+        result = self._import("services", '{"name": "Color", "duration_minutes": 90}\n', "json", dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertFalse(Service.objects.filter(name="Color").exists())
+
+    def test_commands(self):
+        """Test the export_data/import_data commands end to end."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "services.csv")
+            call_command("export_data", "services", "--output", path, stderr=StringIO())
+            Service.objects.filter(name="Haircut").update(duration_minutes=5)
+            out = StringIO()
+            call_command("import_data", "services", path, stdout=out)
+            self.assertIn("updated 1", out.getvalue())
+            self.assertEqual(Service.objects.get(name="Haircut").duration_minutes, 30)
+
+            bad = os.path.join(tmp, "bad.csv")
+            with open(bad, "w") as handle:
+                handle.write("worker_id,service,price,duration_minutes\n999,Haircut,1,1\n")
+            with self.assertRaises(CommandError):
+                call_command("import_data", "prices", bad, stderr=StringIO())
+
+    def test_export_to_stdout(self):
+        """Test that CSV export to stdout has one line per row."""
+        out = StringIO()
+        call_command("export_data", "bookings", stdout=out, stderr=StringIO())
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "worker_id,service,date,time,phone,email,created_at")
+        self.assertEqual(len(lines), 2)
@@ -0,0 +1,73 @@
+"""
+Unit tests for worker schedule feeds.
+"""
+from __future__ import annotations
+
+from datetime import date, time, timedelta
+
+from django.test import TestCase
+
+from bookings import feeds
+from bookings.models import Worker, Service, Booking
+
+
+class FeedsTest(TestCase):
+    """Test cases for feed rendering helpers."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="Jane, Senior; Stylist")
+        self.service = Service.objects.create(name="Cut, wash & blow-dry", duration_minutes=30)
+
+    def test_iter_schedule_uses_one_query(self):
+        """Test that durations are not looked up per booking."""
+        day = date(2030, 1, 7)
+        for hour in range(9, 15):
+            Booking.objects.create(worker=self.worker, service=self.service, date=day, time=time(hour, 0), phone="+1234567890")
+        with self.assertNumQueries(1):
+            entries = list(feeds.iter_schedule(self.worker, None, {self.service.id: 50}, chunk_size=2))
+        self.assertEqual(len(entries), 6)
+        self.assertEqual(entries[0].end - entries[0].start, timedelta(minutes=50))
+
+    def test_ics_escapes_and_folds(self):
+        """Test that text values are escaped and long lines folded at 75 octets."""
+        Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=date(2030, 1, 7),
+            time=time(9, 0),
+            phone="+1234567890",
+            email="a-very-long-address-for-folding-purposes@example.com",
+        )
+        body = "".join(feeds.iter_ics(self.worker, feeds.iter_schedule(self.worker, None, {})))
+        self.assertIn(r"X-WR-CALNAME:Jane\, Senior\; Stylist bookings", body)
+        self.assertIn("SUMMARY:Cut\\, wash & blow-dry", body)
+        for line in body.split("\r\n"):
+            self.assertLessEqual(len(line.encode()), 75)
+        unfolded = body.replace("\r\n ", "")
+        self.assertIn("\\nEmail: a-very-long-address-for-folding-purposes@example.com", unfolded)
+
+    def test_buffered_joins_chunks(self):
+        """Test that buffered() groups small chunks without losing any."""
+        chunks = list(feeds.buffered((str(i) for i in range(250)), size=100))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual("".join(chunks), "".join(str(i) for i in range(250)))
+
+    def test_feed_token_roundtrip(self):
+        """Test that feed tokens resolve to the worker and reject tampering."""
+        token = self.worker.get_feed_token()
+        self.assertEqual(Worker.from_feed_token(token), self.worker)
+        self.assertIsNone(Worker.from_feed_token(token + "x"))
+        self.assertIsNone(Worker.from_feed_token("garbage"))
+
+    def test_feed_token_revocation(self):
+        """Test that rotating the secret or deactivating the worker invalidates feed tokens."""
+        token = self.worker.get_feed_token()
+        self.worker.rotate_feed_secret()
+        self.assertIsNone(Worker.from_feed_token(token))
+        token = self.worker.get_feed_token()
+        self.assertEqual(Worker.from_feed_token(token), self.worker)
+
+        self.worker.is_active = False
+        self.worker.save()
+        self.assertIsNone(Worker.from_feed_token(token))
@@ -9,7 +9,7 @@ from django.utils import timezone
 from django import forms
 
 from bookings.forms import BookingForm
-from bookings.models import Worker, Service, Booking
+from bookings.models import Worker, Service, Booking, WorkerServicePrice
 
 
 class BookingFormTest(TestCase):
@@ -272,9 +272,44 @@ class BookingFormTest(TestCase):
         self.assertEqual(form["time"].value(), self.future_time)
 
 
+class BookingFormQueryCountTest(TestCase):
+    """Test cases for the query budget of BookingForm validation."""
 
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=20, duration_minutes=40)
+        self.day = timezone.localdate() + timedelta(days=2)
+        self.data = {
+            "worker": self.worker.id,
+            "service": self.service.id,
+            "date": self.day,
+            "time": time(16, 0),
+            "phone": "+1234567890",
+        }
+        # Warm the catalog, as it is for every request after the first.
+        BookingForm(data=self.data).is_valid()
 
+    def test_validation_is_one_query(self):
+        """Test that a valid form runs a single query however busy the day is."""
+        with self.assertNumQueries(1):
+            self.assertTrue(BookingForm(data=self.data).is_valid())
+        for hour in range(9, 15):
+            Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(hour, 0), phone="+1234567890")
+        with self.assertNumQueries(1):
+            self.assertTrue(BookingForm(data=self.data).is_valid())
 
+    def test_conflict_and_uniqueness_share_the_day_query(self):
+        """Test that a duplicate slot reports both errors from the same query."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(16, 0), phone="+1234567890")
+        form = BookingForm(data=self.data)
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertIn("This time slot conflicts with an existing appointment.", form.non_field_errors())
+        self.assertTrue(any("already exists" in error for error in form.non_field_errors()))
 
-
-
+    def test_worker_duration_used_for_conflicts(self):
+        """Test that the new booking's length comes from the worker price (40 minutes)."""
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(16, 30), phone="+1234567890")
+        self.assertFalse(BookingForm(data=self.data).is_valid())
@@ -0,0 +1,77 @@
+"""
+Unit tests for worker photo variants.
+"""
+from __future__ import annotations
+
+from io import BytesIO, StringIO
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from bookings.models import Worker
+
+
+def _jpeg_upload(name: str = "portrait.jpg", size: tuple[int, int] = (1200, 900)) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 120, 80)).save(buffer, "JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+class WorkerPhotoVariantsTest(TestCase):
+    """Test cases for generated photo variants."""
+
+    def setUp(self):
+        """Use a throwaway MEDIA_ROOT."""
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def test_variants_generated_on_upload(self):
+        """Test that saving a photo creates square JPEG and WebP variants."""
+        worker = Worker.objects.create(full_name="John Doe", photo=_jpeg_upload())
+        worker.refresh_from_db()
+        variants = worker.photo_variants
+        self.assertEqual(variants["source"], worker.photo.name)
+        self.assertEqual(variants["widths"], [220, 440, 880])
+        with worker.photo.storage.open(variants["webp"]["220"]) as handle:
+            with Image.open(handle) as image:
+                self.assertEqual(image.format, "WEBP")
+                self.assertEqual(image.size, (220, 220))
+
+    def test_no_upscaling(self):
+        """Test that small uploads only get variants up to their own size."""
+        worker = Worker.objects.create(full_name="John Doe", photo=_jpeg_upload(size=(500, 500)))
+        worker.refresh_from_db()
+        self.assertEqual(worker.photo_variants["widths"], [220, 440])
+
+    def test_srcset_properties(self):
+        """Test the srcset helpers used by the templates."""
+        worker = Worker.objects.create(full_name="John Doe", photo=_jpeg_upload())
+        worker.refresh_from_db()
+        self.assertIn("220w", worker.photo_srcset)
+        self.assertIn(".webp 880w", worker.photo_webp_srcset)
+        self.assertTrue(worker.photo_thumbnail_url.endswith("-220w.jpg"))
+
+    def test_fallback_without_variants(self):
+        """Test that templates fall back to the original upload."""
+        worker = Worker.objects.create(full_name="Jane Smith")
+        self.assertEqual(worker.photo_srcset, "")
+        self.assertEqual(worker.photo_thumbnail_url, "")
+
+    def test_backfill_command(self):
+        """Test that the backfill command regenerates missing variants."""
+        worker = Worker.objects.create(full_name="John Doe", photo=_jpeg_upload())
+        Worker.objects.filter(pk=worker.pk).update(photo_variants={})
+        out = StringIO()
+        call_command("backfill_photo_variants", stdout=out)
+        worker.refresh_from_db()
+        self.assertIn("Refreshed 1", out.getvalue())
+        self.assertIn("jpeg", worker.photo_variants)
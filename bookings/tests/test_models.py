@@ -239,154 +239,6 @@ class BookingModelTest(TestCase):
         expected_end = datetime.combine(self.future_date, self.future_time) + timedelta(minutes=90)
         self.assertEqual(booking.end_time, expected_end)
 
-    def test_booking_has_conflict_no_conflict(self):
-        """Test conflict detection when no conflict exists."""
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # New booking at 11:00 (30 min duration, ends at 11:30) shouldn't conflict
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(11, 0),
-            self.service,
-        )
-        self.assertFalse(has_conflict)
-
-    def test_booking_has_conflict_overlapping_start(self):
-        """Test conflict detection with overlapping start time."""
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # New booking at 10:15 (30 min duration, ends at 10:45) conflicts with existing (10:00-10:30)
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(10, 15),
-            self.service,
-        )
-        self.assertTrue(has_conflict)
-
-    def test_booking_has_conflict_overlapping_end(self):
-        """Test conflict detection with overlapping end time."""
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # New booking at 9:45 (30 min duration, ends at 10:15) conflicts with existing (10:00-10:30)
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(9, 45),
-            self.service,
-        )
-        self.assertTrue(has_conflict)
-
-    def test_booking_has_conflict_exact_overlap(self):
-        """Test conflict detection with exact overlap."""
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # New booking at same time conflicts
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(10, 0),
-            self.service,
-        )
-        self.assertTrue(has_conflict)
-
-    def test_booking_has_conflict_exclude_booking(self):
-        """Test conflict detection excluding a specific booking."""
-        existing_booking = Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # Should not conflict with itself when excluded
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(10, 0),
-            self.service,
-            exclude_booking=existing_booking,
-        )
-        self.assertFalse(has_conflict)
-
-    def test_booking_has_conflict_different_worker(self):
-        """Test that conflicts only check same worker."""
-        other_worker = Worker.objects.create(full_name="Jane Smith")
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # Different worker, same time - no conflict
-        has_conflict = Booking.has_conflict(
-            other_worker,
-            self.future_date,
-            time(10, 0),
-            self.service,
-        )
-        self.assertFalse(has_conflict)
-
-    def test_booking_has_conflict_different_date(self):
-        """Test that conflicts only check same date."""
-        other_date = self.future_date + timedelta(days=1)
-        Booking.objects.create(
-            worker=self.worker,
-            service=self.service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # Same worker, different date - no conflict
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            other_date,
-            time(10, 0),
-            self.service,
-        )
-        self.assertFalse(has_conflict)
-
-    def test_booking_has_conflict_different_durations(self):
-        """Test conflict detection with different service durations."""
-        long_service = Service.objects.create(name="Long Service", duration_minutes=120)
-        Booking.objects.create(
-            worker=self.worker,
-            service=long_service,
-            date=self.future_date,
-            time=time(10, 0),
-            phone="+1234567890",
-        )
-        # New booking at 11:30 (30 min, ends at 12:00) conflicts with existing (10:00-12:00)
-        has_conflict = Booking.has_conflict(
-            self.worker,
-            self.future_date,
-            time(11, 30),
-            self.service,
-        )
-        self.assertTrue(has_conflict)
-
     def test_booking_duration_for_worker_service_with_price(self):
         """Test duration calculation with worker-specific price."""
         WorkerServicePrice.objects.create(
@@ -0,0 +1,60 @@
+"""
+Unit tests for the email retry outbox.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings import outbox
+from bookings.models import OutboundEmail
+
+
+class OutboxTest(TestCase):
+    """Test cases for queuing and retrying emails."""
+
+    def _message(self):
+        message = EmailMultiAlternatives("Subject", "Body", "salon@example.com", ["client@example.com"])
+        message.attach_alternative("<p>Body</p>", "text/html")
+        return message
+
+    def test_send_delivers_without_queuing(self):
+        """Test that a successful send leaves nothing in the outbox."""
+        self.assertTrue(outbox.send(self._message()))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(OutboundEmail.objects.exists())
+
+    def test_failed_send_is_queued_and_retried(self):
+        """Test that a failed email is stored and delivered by a later retry."""
+        with patch.object(EmailMultiAlternatives, "send", side_effect=OSError("SMTP down")):
+            self.assertFalse(outbox.send(self._message()))
+        queued = OutboundEmail.objects.get()
+        self.assertEqual((queued.to, queued.attempts, queued.last_error), (["client@example.com"], 1, "SMTP down"))
+
+        self.assertEqual(outbox.deliver_due(), 0)  # not due yet
+        self.assertEqual(outbox.deliver_due(now=queued.next_attempt_at), 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboundEmail.SENT)
+        self.assertEqual(mail.outbox[0].alternatives, [("<p>Body</p>", "text/html")])
+
+    def test_backoff_and_give_up(self):
+        """Test that retries back off exponentially and stop after MAX_ATTEMPTS."""
+        queued = outbox.enqueue(self._message(), "SMTP down")
+        now = timezone.now() + timedelta(days=1)
+        with patch.object(EmailMultiAlternatives, "send", side_effect=OSError("SMTP down")):
+            outbox.deliver_due(now=now)
+            queued.refresh_from_db()
+            self.assertEqual(queued.attempts, 2)
+            self.assertEqual(queued.next_attempt_at, now + outbox.retry_delay(2))
+            for day in range(1, outbox.MAX_ATTEMPTS + 1):
+                outbox.deliver_due(now=now + timedelta(days=day))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, OutboundEmail.FAILED)
+        self.assertEqual(queued.attempts, outbox.MAX_ATTEMPTS)
+        self.assertEqual(outbox.retry_delay(1), timedelta(minutes=1))
+        self.assertEqual(outbox.retry_delay(20), outbox.RETRY_MAX)
@@ -0,0 +1,129 @@
+"""
+Unit tests for read-replica routing.
+"""
+from __future__ import annotations
+
+from datetime import time, timedelta
+from io import StringIO
+import unittest
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings import routing
+from bookings.models import Booking, Service, Worker
+
+HAS_REPLICA = routing.REPLICA_ALIAS in settings.DATABASES
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    """Test cases for the router and the routing middleware."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        patcher = patch("bookings.routing.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = routing.ReplicaRouter()
+
+    def test_replica_is_never_migrated(self):
+        """Test that migrations are kept off the replica alias."""
+        self.assertFalse(self.router.allow_migrate(routing.REPLICA_ALIAS, "bookings"))
+        self.assertIsNone(self.router.allow_migrate("default", "bookings"))
+
+    def test_blocks_choose_the_read_database(self):
+        """Test that replica() and primary() blocks nest and writes always go to the primary."""
+        self.assertEqual(self.router.db_for_read(Worker), "default")
+        with routing.replica():
+            self.assertEqual(self.router.db_for_read(Worker), "replica")
+            with routing.primary():
+                self.assertEqual(self.router.db_for_read(Worker), "default")
+            self.assertEqual(self.router.db_for_read(Worker), "replica")
+            self.assertEqual(self.router.db_for_write(Worker), "default")
+
+    def test_middleware_routes_marked_views(self):
+        """Test that only GETs of marked views without a pin cookie read from the replica."""
+        seen = []
+
+        @routing.replica_reads
+        def listing(request):
+            seen.append(self.router.db_for_read(Worker))
+            return HttpResponse()
+
+        def form(request):
+            seen.append(self.router.db_for_read(Worker))
+            return HttpResponse()
+
+        factory = RequestFactory()
+        pinned = factory.get("/")
+        pinned.COOKIES[routing.PIN_COOKIE] = "1"
+        for request, view in (
+            (factory.get("/"), listing),
+            (factory.post("/"), listing),
+            (pinned, listing),
+            (factory.get("/"), form),
+        ):
+            middleware = routing.ReplicaRoutingMiddleware(view)
+
+            def get_response(request, middleware=middleware, view=view):
+                middleware.process_view(request, view, (), {})
+                return view(request)
+
+            middleware.get_response = get_response
+            middleware(request)
+        self.assertEqual(seen, ["replica", "default", "default", "default"])
+
+
+class PrimaryPinTest(TestCase):
+    """Test cases for pinning visitors to the primary after a write."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        self.booking = Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=timezone.localdate() + timedelta(days=2),
+            time=time(10, 0),
+            phone="+1234567890",
+        )
+
+    def test_write_sets_pin_cookie(self):
+        """Test that a request that writes pins the visitor and a read-only one does not."""
+        response = self.client.post(reverse("cancel_booking", args=[self.booking.get_cancellation_token()]))
+        cookie = response.cookies[routing.PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie["httponly"])
+        self.assertNotIn(routing.PIN_COOKIE, self.client.get(reverse("pricelist")).cookies)
+
+
+@unittest.skipUnless(HAS_REPLICA, "set DJANGO_SQLITE_REPLICA_PATH to test against a second SQLite file")
+class TwoDatabaseTest(TestCase):
+    """Test cases for replica routing against a separate SQLite database."""
+
+    # The test runner checks every alias listed here, even for skipped classes.
+    databases = {"default", routing.REPLICA_ALIAS} if HAS_REPLICA else {"default"}
+
+    @classmethod
+    def setUpClass(cls):
+        """Copy the migrated primary to the replica, which the router keeps migrations off."""
+        call_command("sync_replica", stdout=StringIO())
+        super().setUpClass()
+
+    def test_calendar_reads_replica_until_pinned(self):
+        """Test that the calendar misses a booking the replica lacks unless the visitor is pinned."""
+        worker = Worker.objects.create(full_name="John Doe")
+        service = Service.objects.create(name="Haircut", duration_minutes=30)
+        day = timezone.localdate() + timedelta(days=2)
+        Booking.objects.create(worker=worker, service=service, date=day, time=time(9, 0), phone="+1234567890")
+        url = reverse("calendar") + f"?worker={worker.id}&service={service.id}&date={day}"
+
+        self.assertTrue(self.client.get(url).context["selected_slots"][0]["available"])
+        self.client.cookies[routing.PIN_COOKIE] = "1"
+        self.assertFalse(self.client.get(url).context["selected_slots"][0]["available"])
@@ -0,0 +1,125 @@
+"""
+Unit tests for the in-process scheduler.
+"""
+from __future__ import annotations
+
+from datetime import time, timedelta
+from io import StringIO
+
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from bookings.models import Booking, SchedulerLease, Worker, WorkerWeekSummary
+from bookings.scheduler import Job, Scheduler, _clear_expired_sessions, acquire_lease, default_jobs, release_lease
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LeaseTest(TestCase):
+    """Test cases for leader election through the lease row."""
+
+    def test_only_one_holder(self):
+        """Test that a live lease cannot be taken by another holder but can be renewed."""
+        ttl = timedelta(seconds=60)
+        self.assertTrue(acquire_lease("host-a", ttl))
+        self.assertFalse(acquire_lease("host-b", ttl))
+        self.assertTrue(acquire_lease("host-a", ttl))
+        self.assertEqual(SchedulerLease.objects.get().holder, "host-a")
+
+    def test_expired_or_released_lease_is_taken_over(self):
+        """Test that another holder takes over once the lease expires or is released."""
+        ttl = timedelta(seconds=60)
+        acquire_lease("host-a", ttl)
+        SchedulerLease.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(acquire_lease("host-b", ttl))
+        release_lease("host-b")
+        self.assertTrue(acquire_lease("host-a", ttl))
+
+
+class SchedulerTest(TestCase):
+    """Test cases for job dispatch and metrics."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calls = []
+        self.clock = FakeClock()
+
+    def _job(self, name, interval, fail=False):
+        def run():
+            self.calls.append(name)
+            if fail:
+                raise RuntimeError("boom")
+            return len(self.calls)
+
+        return Job(name, run, interval)
+
+    def test_jobs_run_on_their_intervals(self):
+        """Test that each job runs when its interval has elapsed."""
+        scheduler = Scheduler([self._job("fast", 10), self._job("slow", 60)], holder="host-a", clock=self.clock)
+        self.assertEqual(scheduler.tick(), ["fast", "slow"])
+        self.clock.now += 5
+        self.assertEqual(scheduler.tick(), [])
+        self.clock.now += 5
+        self.assertEqual(scheduler.tick(), ["fast"])
+        self.clock.now += 50
+        self.assertEqual(scheduler.tick(), ["fast", "slow"])
+
+    def test_follower_runs_nothing(self):
+        """Test that a host without the lease does not run jobs."""
+        acquire_lease("host-a", timedelta(seconds=60))
+        follower = Scheduler([self._job("fast", 10)], holder="host-b", clock=self.clock)
+        self.assertEqual(follower.tick(), [])
+        self.assertEqual(self.calls, [])
+
+    def test_failures_are_recorded_and_isolated(self):
+        """Test that a failing job is counted without stopping the others, and metrics are stored."""
+        scheduler = Scheduler([self._job("broken", 10, fail=True), self._job("ok", 10)], holder="host-a", clock=self.clock)
+        self.assertEqual(scheduler.tick(), ["broken", "ok"])
+        jobs = SchedulerLease.objects.get().metrics["jobs"]
+        self.assertEqual((jobs["broken"]["runs"], jobs["broken"]["failures"]), (1, 1))
+        self.assertEqual(jobs["broken"]["last_error"], "RuntimeError: boom")
+        self.assertEqual((jobs["ok"]["failures"], jobs["ok"]["last_result"]), (0, "2"))
+        self.assertIsNotNone(jobs["ok"]["last_duration_ms"])
+
+    def test_run_scheduler_once(self):
+        """Test that the command runs one tick and reports status."""
+        call_command("run_scheduler", "--once", "--summaries-interval", "0", stdout=StringIO())
+        out = StringIO()
+        call_command("run_scheduler", "--status", stdout=out)
+        self.assertIn('"reminders"', out.getvalue())
+        self.assertIn('"outbox"', out.getvalue())
+        self.assertNotIn('"summaries"', out.getvalue())
+
+
+class SummaryJobTest(TestCase):
+    """Test cases for the scheduler's weekly summary job."""
+
+    def test_summaries_job_stores_rows(self):
+        """Test that the summaries job rebuilds this week's worker summaries."""
+        worker = Worker.objects.create(full_name="John Doe")
+        today = timezone.localdate()
+        Booking.objects.create(worker=worker, date=today, time=time(10, 0), phone="+1234567890")
+        (job,) = default_jobs({"summaries": 3600})
+        self.assertEqual(job.func(), "1 rows")
+        summary = WorkerWeekSummary.objects.get(worker=worker)
+        self.assertEqual((summary.week_start, summary.booking_count), (today - timedelta(days=today.weekday()), 1))
+
+
+class SessionCleanupTest(TestCase):
+    """Test cases for the expired session cleanup job."""
+
+    def test_only_expired_sessions_are_deleted(self):
+        """Test that expired database sessions are purged and live ones kept."""
+        now = timezone.now()
+        Session.objects.create(session_key="expired", session_data="", expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key="live", session_data="", expire_date=now + timedelta(days=1))
+        self.assertEqual(_clear_expired_sessions(), "1 expired database sessions")
+        self.assertEqual(list(Session.objects.values_list("session_key", flat=True)), ["live"])
@@ -0,0 +1,173 @@
+"""
+Unit tests for the SMS backends.
+"""
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs
+
+from django.test import SimpleTestCase, override_settings
+
+from bookings import sms
+from bookings.sms.backends.base import RateLimiter, SmsDeliveryError
+
+LOCMEM = "bookings.sms.backends.locmem.SmsBackend"
+
+
+class FakeTwilioHandler(BaseHTTPRequestHandler):
+    """Accepts Messages.json posts; answers 429 once for numbers ending in 9."""
+
+    protocol_version = "HTTP/1.1"
+    received: list[dict] = []
+    connections: set[int] = set()
+    throttled: set[str] = set()
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers["Content-Length"])
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        with self.lock:
+            self.connections.add(self.client_address[1])
+            first_try = form["To"] not in self.throttled
+            if form["To"].endswith("9") and first_try:
+                self.throttled.add(form["To"])
+                status, payload = 429, {"message": "Too Many Requests"}
+            elif form["To"].endswith("0"):
+                status, payload = 400, {"message": "Invalid 'To' Phone Number"}
+            else:
+                self.received.append(form)
+                status, payload = 201, {"sid": f"SM{len(self.received)}"}
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SmsBackendTest(SimpleTestCase):
+    """Test cases for the console, file and locmem backends."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        sms.outbox.clear()
+
+    @override_settings(SMS_BACKEND=LOCMEM)
+    def test_locmem_collects_messages(self):
+        """Test that send_sms goes through the configured backend."""
+        self.assertEqual(sms.send_sms("Hello", "+359888000111", from_="+100"), 1)
+        (message,) = sms.outbox
+        self.assertEqual((message.to, message.from_, message.body, message.status), ("+359888000111", "+100", "Hello", "sent"))
+        self.assertTrue(message.sid.startswith("LM"))
+
+    def test_batch_is_concurrent(self):
+        """Test that a batch uses several threads when max_workers allows it."""
+        threads = set()
+        # Each send waits for a second one to be in flight, so a single thread would time out.
+        barrier = threading.Barrier(2, timeout=5)
+
+        def send_message(self, message):
+            barrier.wait()
+            threads.add(threading.get_ident())
+
+        connection = sms.get_connection(LOCMEM, max_workers=4, rate_limit=0)
+        with patch.object(type(connection), "send_message", send_message):
+            sent = connection.send_messages([sms.SMSMessage("Hi", f"+35988800{i:04d}") for i in range(8)])
+        self.assertEqual(sent, 8)
+        self.assertGreater(len(threads), 1)
+
+    def test_failures_are_reported_per_message(self):
+        """Test that failed messages are marked and raise unless fail_silently."""
+
+        def send_message(self, message):
+            if message.to.endswith("2"):
+                raise ConnectionError("unreachable")
+
+        messages = [sms.SMSMessage("Hi", f"+3598880000{i}") for i in range(4)]
+        with patch("bookings.sms.backends.locmem.SmsBackend.send_message", send_message):
+            with self.assertRaises(SmsDeliveryError) as ctx:
+                sms.get_connection(LOCMEM, max_workers=2, rate_limit=0).send_messages(messages)
+            self.assertEqual([m.to for m in ctx.exception.failed], ["+35988800002"])
+            self.assertEqual(sms.get_connection(LOCMEM, fail_silently=True).send_messages(messages), 3)
+        self.assertEqual(messages[2].error, "unreachable")
+
+    def test_rate_limiter_spaces_calls(self):
+        """Test that the limiter schedules calls 1/rate seconds apart."""
+        now = [0.0]
+        sleeps = []
+        limiter = RateLimiter(4, clock=lambda: now[0], sleep=sleeps.append)
+        for _ in range(3):
+            limiter.wait()
+        self.assertEqual(sleeps, [0.25, 0.5])
+
+    def test_console_and_file_backends(self):
+        """Test that the development backends write the message out."""
+        stream = StringIO()
+        sms.get_connection("bookings.sms.backends.console.SmsBackend", stream=stream).send_messages(
+            [sms.SMSMessage("Console hi", "+359888000111")]
+        )
+        self.assertIn("To: +359888000111", stream.getvalue())
+
+        with tempfile.TemporaryDirectory() as directory:
+            connection = sms.get_connection("bookings.sms.backends.filebased.SmsBackend", file_path=directory)
+            connection.send_messages([sms.SMSMessage("File hi", "+359888000111")])
+            (log,) = Path(directory).iterdir()
+            self.assertIn("File hi", log.read_text())
+
+
+@override_settings(TWILIO_ACCOUNT_SID="AC123", TWILIO_AUTH_TOKEN="secret", SMS_FROM_NUMBER="+15550000000")
+class TwilioBackendTest(SimpleTestCase):
+    """Test cases for the Twilio backend against a local stand-in API."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeTwilioHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        FakeTwilioHandler.received = []
+        FakeTwilioHandler.connections = set()
+        FakeTwilioHandler.throttled = set()
+
+    def _connection(self, **kwargs):
+        return sms.get_connection(
+            "bookings.sms.backends.twilio.SmsBackend", api_url=self.api_url, rate_limit=0, fail_silently=True, **kwargs
+        )
+
+    def test_batch_reuses_pooled_connections(self):
+        """Test that a batch is posted over at most max_workers keep-alive connections."""
+        messages = [sms.SMSMessage("Reminder", f"+359888{i:05d}1") for i in range(20)]
+        self.assertEqual(self._connection(max_workers=3).send_messages(messages), 20)
+        self.assertEqual(len(FakeTwilioHandler.received), 20)
+        self.assertLessEqual(len(FakeTwilioHandler.connections), 3)
+        self.assertEqual(FakeTwilioHandler.received[0]["From"], "+15550000000")
+        self.assertTrue(all(m.sid.startswith("SM") for m in messages))
+
+    def test_throttled_is_retried_and_errors_reported(self):
+        """Test that 429 responses are retried and 4xx errors mark the message failed."""
+        throttled = sms.SMSMessage("Hi", "+359888000019")
+        invalid = sms.SMSMessage("Hi", "+359888000010")
+        self.assertEqual(self._connection(max_workers=2).send_messages([throttled, invalid]), 1)
+        self.assertTrue(throttled.sent)
+        self.assertFalse(invalid.sent)
+        self.assertIn("Invalid 'To' Phone Number", invalid.error)
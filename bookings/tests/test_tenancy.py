@@ -0,0 +1,108 @@
+"""
+Unit tests for locations and host name routing.
+"""
+from __future__ import annotations
+
+from datetime import time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings import catalog, tenancy
+from bookings.models import Booking, Location, Service, Worker, WorkerServicePrice
+
+NORTH_HOST = "north.example.com"
+
+
+class LocationTest(TestCase):
+    """Test cases for per-location routing, catalogs and denormalized locations."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # The host map and catalog versions outlive each test's rolled-back rows.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.main_id = tenancy.default_location_id()
+        self.north = Location.objects.create(name="North", slug="north", hostname=NORTH_HOST)
+        self.main_worker = Worker.objects.create(full_name="Main Stylist")
+        self.north_worker = Worker.objects.create(full_name="North Stylist", location=self.north)
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30, location=self.north)
+
+    def test_host_selects_location(self):
+        """Test that each host name sees only its own salon's workers."""
+        north = self.client.get(reverse("home"), HTTP_HOST=f"{NORTH_HOST}:8000")
+        self.assertEqual(north.context["workers"], [self.north_worker])
+        main = self.client.get(reverse("home"), HTTP_HOST="unknown.example.com")
+        self.assertEqual(main.context["workers"], [self.main_worker])
+
+    def test_new_rows_default_to_active_location(self):
+        """Test that workers default to the active location and prices/bookings copy their worker's."""
+        self.assertEqual(self.main_worker.location_id, self.main_id)
+        with tenancy.activate(self.north.pk):
+            self.assertEqual(Worker.objects.create(full_name="Another").location_id, self.north.pk)
+        price = WorkerServicePrice.objects.create(worker=self.north_worker, service=self.service, price=30)
+        booking = Booking.objects.create(
+            worker=self.north_worker,
+            service=self.service,
+            date=timezone.localdate(),
+            time=time(10, 0),
+            phone="+1234567890",
+        )
+        (bulk,) = Booking.objects.bulk_create(
+            [Booking(worker_id=self.north_worker.pk, date=timezone.localdate(), time=time(11, 0), phone="+1234567890")]
+        )
+        self.assertEqual({price.location_id, booking.location_id, bulk.location_id}, {self.north.pk})
+
+        self.north_worker.location_id = self.main_id
+        self.north_worker.save()
+        self.assertEqual(set(Booking.objects.values_list("location_id", flat=True)), {self.main_id})
+        self.assertEqual(WorkerServicePrice.objects.get().location_id, self.main_id)
+
+    def test_catalogs_are_cached_per_location(self):
+        """Test that invalidating one location's catalog leaves the other's cached."""
+        with tenancy.activate(self.north.pk):
+            catalog.active_workers()
+        catalog.active_workers()
+        Worker.objects.create(full_name="Main Junior")
+        with tenancy.activate(self.north.pk), self.assertNumQueries(0):
+            self.assertEqual(catalog.active_workers(), [self.north_worker])
+        self.assertEqual(len(catalog.active_workers()), 2)
+
+    def test_moving_worker_clears_both_locations_catalogs(self):
+        """Test that a worker moved to another location leaves the old location's cached lists."""
+        WorkerServicePrice.objects.create(worker=self.main_worker, service=self.service, price=30)
+        self.assertEqual(catalog.active_workers(), [self.main_worker])
+        self.assertEqual(catalog.pricelist(), [self.main_worker])
+
+        self.main_worker.location = self.north
+        self.main_worker.save()
+        self.assertEqual(catalog.active_workers(), [])
+        self.assertEqual(catalog.pricelist(), [])
+        with tenancy.activate(self.north.pk):
+            self.assertEqual(len(catalog.active_workers()), 2)
+
+    def test_unrelated_worker_save_skips_moving_rows(self):
+        """Test that a save that leaves the location alone does not touch bookings or prices."""
+        with self.assertNumQueries(1):
+            self.north_worker.rotate_feed_secret()
+        with self.assertNumQueries(3):
+            self.north_worker.save()
+
+    def test_cannot_book_another_locations_worker(self):
+        """Test that the booking form rejects a worker from another salon."""
+        response = self.client.post(
+            reverse("book"),
+            {
+                "worker": self.main_worker.pk,
+                "service": self.service.pk,
+                "date": timezone.localdate() + timedelta(days=1),
+                "time": "10:00",
+                "phone": "+1234567890",
+            },
+            HTTP_HOST=NORTH_HOST,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("worker", response.context["form"].errors)
+        self.assertFalse(Booking.objects.exists())
@@ -5,13 +5,21 @@ from __future__ import annotations
 
 from datetime import date, time, datetime, timedelta
 from unittest.mock import patch, MagicMock
-from django.test import TestCase, Client
+from django.test import TestCase, Client, AsyncClient
 from django.urls import reverse
+from django.conf import settings
+from django.contrib.sessions.models import Session
 from django.contrib.messages import get_messages
 from django.utils import timezone
 from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import cache
 
-from bookings.models import Worker, Service, Booking, WorkerServicePrice
+from bookings import idempotency
+from bookings.http_caching import invalidate_worker_pages
+
+from bookings.models import Worker, Service, Booking, BookingCancellation, WorkerServicePrice
 
 
 class HomeViewTest(TestCase):
@@ -42,6 +50,34 @@ class HomeViewTest(TestCase):
         self.assertIn(self.active_worker, workers)
         self.assertNotIn(self.inactive_worker, workers)
 
+    def test_home_view_conditional_get(self):
+        """Test that a repeat visit with the ETag gets 304 and the page is publicly cacheable."""
+        response = self.client.get(reverse("home"))
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("must-revalidate", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(0):
+            repeat = self.client.get(reverse("home"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(repeat.status_code, 304)
+
+        self.active_worker.role = "Stylist"
+        self.active_worker.save()
+        changed = self.client.get(reverse("home"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], response["ETag"])
+
+    def test_home_view_not_cached_with_pending_messages(self):
+        """Test that a page showing flash messages is never cached or answered with 304."""
+        etag = self.client.get(reverse("home"))["ETag"]
+        self.client.get(reverse("cancel_booking", args=["bad-token"]))
+        response = self.client.get(reverse("home"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Invalid cancellation link")
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertFalse(response.has_header("ETag"))
+
 
 class BookViewTest(TestCase):
     """Test cases for book view."""
@@ -180,6 +216,21 @@ class BookViewTest(TestCase):
             # Booking should still be created
             self.assertTrue(Booking.objects.filter(worker=self.worker, date=self.future_date).exists())
 
+    async def test_book_view_async_client_post(self):
+        """Test that booking works when served through the ASGI handler."""
+        form_data = {
+            "worker": self.worker.id,
+            "service": self.service.id,
+            "date": self.future_date,
+            "time": self.future_time,
+            "phone": "+1234567890",
+            "email": "customer@example.com",
+        }
+        response = await AsyncClient().post(reverse("book"), data=form_data)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(await Booking.objects.filter(worker=self.worker, date=self.future_date).aexists())
+        self.assertEqual(len(mail.outbox), 1)
+
     def test_book_view_success_message(self):
         """Test that success message is displayed."""
         form_data = {
@@ -194,6 +245,80 @@ class BookViewTest(TestCase):
         self.assertTrue(any("confirmed" in str(m.message).lower() for m in messages))
 
 
+class BookIdempotencyTest(TestCase):
+    """Test cases for replayed booking submissions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        cache.clear()
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        self.form_data = {
+            "worker": self.worker.id,
+            "service": self.service.id,
+            "date": date.today() + timedelta(days=1),
+            "time": time(14, 0),
+            "phone": "+1234567890",
+            "email": "customer@example.com",
+            "idempotency_key": idempotency.new_key(),
+        }
+
+    def test_form_renders_key(self):
+        """Test that the booking page carries a fresh idempotency key."""
+        response = self.client.get(reverse("book"))
+        key = response.context["form"]["idempotency_key"].value()
+        self.assertTrue(idempotency.is_valid(key))
+        self.assertContains(response, f'name="idempotency_key" value="{key}"')
+
+    def test_replay_returns_original_booking(self):
+        """Test that a replayed POST redirects to the first booking without saving or emailing again."""
+        first = self.client.post(reverse("book"), data=self.form_data)
+        booking = Booking.objects.get()
+        with self.assertNumQueries(0):
+            second = self.client.post(reverse("book"), data=self.form_data)
+        self.assertEqual(second.url, f"{reverse('booking_success')}?id={booking.id}")
+        self.assertEqual(first.url, second.url)
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_invalid_submission_releases_key(self):
+        """Test that a corrected resubmission with the same key is processed."""
+        response = self.client.post(reverse("book"), data={**self.form_data, "phone": "bad"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(reverse("book"), data=self.form_data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_pending_submission_is_not_run_twice(self):
+        """Test that a replay arriving while the first POST runs does not book again."""
+        key = self.form_data["idempotency_key"]
+        cache.set(f"{idempotency.KEY_PREFIX}:{key}", idempotency.PENDING)
+        with patch("bookings.idempotency.PENDING_WAIT_SECONDS", 0):
+            response = self.client.post(reverse("book"), data=self.form_data)
+        self.assertRedirects(response, reverse("home"))
+        self.assertFalse(Booking.objects.exists())
+
+    def test_duplicate_past_cache_claim_is_replayed(self):
+        """Test that a duplicate POST that also wins the cache claim is caught by the unique key column."""
+        first = self.client.post(reverse("book"), data=self.form_data)
+        with patch("bookings.idempotency.aclaim", return_value=True):
+            second = self.client.post(reverse("book"), data=self.form_data)
+        self.assertEqual(first.url, second.url)
+        self.assertEqual(Booking.objects.get().idempotency_key, self.form_data["idempotency_key"])
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_concurrent_insert_shows_form_error(self):
+        """Test that losing the race to the unique constraint re-renders the form."""
+        with patch("bookings.forms.BookingForm.validate_unique"), patch("bookings.forms.BookingForm.clean", lambda form: form.cleaned_data):
+            Booking.objects.create(
+                worker=self.worker, service=self.service, date=self.form_data["date"], time=time(14, 0), phone="+1234567890"
+            )
+            response = self.client.post(reverse("book"), data=self.form_data)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "This time slot was just booked.")
+        self.assertEqual(Booking.objects.count(), 1)
+
+
 class BookingSuccessViewTest(TestCase):
     """Test cases for booking_success view."""
 
@@ -256,6 +381,20 @@ class PricelistViewTest(TestCase):
         services = response.context["services"]
         self.assertIn(self.service, services)
 
+    def test_pricelist_view_etag_tracks_prices(self):
+        """Test that the pricelist revalidates to 304 until a price changes."""
+        response = self.client.get(reverse("pricelist"))
+        self.assertIn("max-age=300", response["Cache-Control"])
+        self.assertEqual(
+            self.client.get(reverse("pricelist"), HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304
+        )
+
+        self.price.price = 55
+        self.price.save()
+        self.assertEqual(
+            self.client.get(reverse("pricelist"), HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200
+        )
+
 
 class CalendarViewTest(TestCase):
     """Test cases for calendar_view."""
@@ -340,6 +479,128 @@ class CalendarViewTest(TestCase):
         # Check that slots are calculated
         self.assertIn("selected_slots", response.context)
 
+    def test_calendar_view_selected_date_outside_month(self):
+        """Test that bookings are considered for a selected date outside the displayed month."""
+        booking_date = date.today().replace(day=1) + timedelta(days=40)
+        Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=booking_date,
+            time=time(10, 0),
+            phone="+1234567890",
+        )
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}&date={booking_date}"
+        response = self.client.get(url)
+        slots = {slot["time"]: slot["available"] for slot in response.context["selected_slots"]}
+        self.assertFalse(slots["10:00"])
+        self.assertTrue(slots["09:00"])
+
+    def test_calendar_view_uses_static_bundles(self):
+        """Test that calendar styles and scripts come from static files, not inline blocks."""
+        response = self.client.get(reverse("calendar"))
+        self.assertContains(response, "css/calendar")
+        self.assertContains(response, "js/calendar")
+        self.assertNotContains(response, "<style>")
+
+    def test_static_urls_fall_back_before_collectstatic(self):
+        """Test that pages render with unhashed static URLs when no manifest has been collected."""
+        response = self.client.get(reverse("calendar"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "/static/css/styles.css")
+
+    async def test_calendar_view_async_client(self):
+        """Test that the calendar renders when served through the ASGI handler."""
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}"
+        response = await AsyncClient().get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["selected_service"], self.service)
+
+    def test_calendar_view_month_grid_from_summary(self):
+        """Test that the month grid reads day status from DailyAvailability in a fixed number of queries."""
+        month_start = (timezone.localdate().replace(day=1) + timedelta(days=32)).replace(day=1)
+        full_day = month_start + timedelta(days=9)
+        # 09:00-18:00 with 45-minute bookings leaves no room for another one.
+        for hour in range(9, 18):
+            Booking.objects.create(
+                worker=self.worker, service=self.service, date=full_day, time=time(hour, 0), phone="+1234567890"
+            )
+        Booking.objects.filter(date=full_day, time=time(12, 0)).delete()
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}&month={month_start:%Y-%m}"
+        self.client.get(url)  # warm the catalog cache
+        invalidate_worker_pages(self.worker.id)  # measure a render, not a page cache hit
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        # Workers and prices come from the catalog: one summary range query plus today's bookings.
+        self.assertEqual(len(ctx.captured_queries), 2)
+        statuses = {d["date"]: d["status"] for week in response.context["calendar_days"] for d in week if d["in_month"]}
+        self.assertEqual(statuses[full_day], "available")
+
+        Booking.objects.create(
+            worker=self.worker, service=self.service, date=full_day, time=time(12, 0), phone="+1234567890"
+        )
+        response = self.client.get(url)
+        statuses = {d["date"]: d["status"] for week in response.context["calendar_days"] for d in week if d["in_month"]}
+        self.assertEqual(statuses[full_day], "full")
+        self.assertEqual(statuses[full_day + timedelta(days=1)], "available")
+
+    def test_calendar_view_page_cache(self):
+        """Test that anonymous repeat views share one cached page until a booking for the worker changes."""
+        day = timezone.localdate() + timedelta(days=3)
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}&date={day}"
+        first = self.client.get(url)
+        self.assertIsNotNone(first.context)
+
+        # Parameter order and unrelated parameters do not split the cache.
+        with self.assertNumQueries(0):
+            repeat = self.client.get(
+                reverse("calendar") + f"?utm_source=mail&date={day}&service={self.service.id}&worker={self.worker.id}"
+            )
+        self.assertIsNone(repeat.context)
+        self.assertEqual(repeat.content, first.content)
+
+        Booking.objects.create(worker=self.worker, service=self.service, date=day, time=time(9, 0), phone="+1234567890")
+        fresh = self.client.get(url)
+        self.assertIsNotNone(fresh.context)
+        self.assertFalse(fresh.context["selected_slots"][0]["available"])
+
+    def test_calendar_view_page_cache_skips_sessions_and_messages(self):
+        """Test that visitors with a session or pending messages always get a fresh render."""
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}"
+        self.client.get(url)
+
+        with_session = Client()
+        with_session.cookies[settings.SESSION_COOKIE_NAME] = "abc"
+        self.assertIsNotNone(with_session.get(url).context)
+
+        with_messages = Client()
+        with_messages.get(reverse("cancel_booking", args=["bad-token"]))
+        self.assertIsNotNone(with_messages.get(url).context)
+
+    def test_calendar_view_compact_worker(self):
+        """Test that a compact-mode worker is offered only gap-free starts on the selected day."""
+        self.worker.compact_slots = True
+        self.worker.save()
+        day = timezone.localdate() + timedelta(days=2)
+        Booking.objects.create(worker=self.worker, service=self.service, date=day, time=time(10, 0), phone="+1234567890")
+        url = reverse("calendar") + f"?worker={self.worker.id}&service={self.service.id}&date={day}"
+        slots = [slot["time"] for slot in self.client.get(url).context["selected_slots"]]
+        self.assertEqual(slots, ["09:00", "09:15", "10:45", "17:15"])
+
+    def test_calendar_view_precomputed_links(self):
+        """Test that day cells and slots carry links built by the view."""
+        month_start = (timezone.localdate().replace(day=1) + timedelta(days=32)).replace(day=1)
+        day = month_start + timedelta(days=3)
+        query = f"worker={self.worker.id}&service={self.service.id}"
+        response = self.client.get(reverse("calendar") + f"?{query}&month={month_start:%Y-%m}")
+        cell = next(d for week in response.context["calendar_days"] for d in week if d["date"] == day)
+        self.assertEqual((cell["css"], cell["label"]), ("day available", str(day.day)))
+        self.assertEqual(cell["url"], f"?{query}&month={month_start:%Y-%m}&date={day.isoformat()}")
+        self.assertContains(response, f'href="?{query.replace("&", "&amp;")}&amp;month={month_start:%Y-%m}&amp;date={day}"')
+
+        response = self.client.get(reverse("calendar") + f"?{query}&date={day}")
+        slot = response.context["selected_slots"][0]
+        self.assertEqual(slot["url"], f"{reverse('book')}?{query}&date={day}&time=09:00")
+
     def test_calendar_view_past_dates(self):
         """Test that past dates are marked correctly."""
         past_date = date.today() - timedelta(days=1)
@@ -410,6 +671,14 @@ class WorkerDetailViewTest(TestCase):
         self.assertIn("today", response.context)
         self.assertEqual(response.context["today"], timezone.localdate())
 
+    def test_worker_detail_view_etag_includes_today(self):
+        """Test that the worker page revalidates within a day but not across days."""
+        url = reverse("worker_detail", args=[self.worker.id])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with patch("bookings.views.timezone.localdate", return_value=timezone.localdate() + timedelta(days=1)):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
 
 class CancelBookingViewTest(TestCase):
     """Tests for token-based cancellation flow."""
@@ -445,3 +714,180 @@ class CancelBookingViewTest(TestCase):
         self.assertEqual(resp_post.status_code, 302)
         self.assertFalse(Booking.objects.filter(id=booking.id).exists())
 
+    def test_cancel_booking_records_cancellation(self):
+        """Cancelled bookings leave a BookingCancellation row for analytics."""
+        booking = Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=self.future_date,
+            time=self.future_time,
+            phone="+1234567890",
+        )
+        self.client.post(reverse("cancel_booking", args=[booking.get_cancellation_token()]))
+        cancellation = BookingCancellation.objects.get()
+        self.assertEqual(
+            (cancellation.worker, cancellation.service, cancellation.date, cancellation.time),
+            (self.worker, self.service, self.future_date, self.future_time),
+        )
+
+    def test_cancel_booking_message_uses_cookie(self):
+        """Test that the flash message after cancelling travels in a cookie, not a database session."""
+        booking = Booking.objects.create(
+            worker=self.worker,
+            service=self.service,
+            date=self.future_date,
+            time=self.future_time,
+            phone="+1234567890",
+        )
+        response = self.client.post(reverse("cancel_booking", args=[booking.get_cancellation_token()]))
+        self.assertIn("messages", response.cookies)
+        self.assertNotIn(settings.SESSION_COOKIE_NAME, response.cookies)
+        self.assertEqual(len(self.client.get(response.url).context["messages"]), 1)
+        self.assertFalse(Session.objects.exists())
+
+
+
+class DayBoardViewTest(TestCase):
+    """Test cases for the staff day board."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        from django.contrib.auth import get_user_model
+
+        self.staff = get_user_model().objects.create_user("staff", password="password", is_staff=True)
+        self.workers = [Worker.objects.create(full_name=f"Worker {i}") for i in range(3)]
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        WorkerServicePrice.objects.create(worker=self.workers[0], service=self.service, price=40, duration_minutes=45)
+        self.day = date.today() + timedelta(days=1)
+        self.url = reverse("day_board") + f"?date={self.day}"
+
+    def _book(self, worker, hour, minute=0):
+        return Booking.objects.create(
+            worker=worker, service=self.service, date=self.day, time=time(hour, minute), phone="+1234567890"
+        )
+
+    def test_staff_session_can_be_revoked(self):
+        """Test that staff sessions are stored server-side, so deleting one logs them out."""
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(Session.objects.count(), 1)
+        self.client.session.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_day_board_requires_staff(self):
+        """Test that anonymous users are redirected to the admin login."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/admin/login/", response.url)
+
+    def test_day_board_columns_and_end_times(self):
+        """Test that each worker gets a column with end times from worker prices."""
+        self._book(self.workers[0], 10)
+        self._book(self.workers[1], 10)
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        columns = {c["worker"].id: c["bookings"] for c in response.context["columns"]}
+        self.assertEqual(len(columns), 3)
+        self.assertEqual(columns[self.workers[0].id][0]["end"], time(10, 45))
+        self.assertEqual(columns[self.workers[1].id][0]["end"], time(10, 30))
+        self.assertEqual(columns[self.workers[2].id], [])
+
+    def test_day_board_fixed_query_budget(self):
+        """Test that the query count does not grow with workers or bookings."""
+        self.client.force_login(self.staff)
+        self._book(self.workers[0], 9)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        for i in range(5):
+            worker = Worker.objects.create(full_name=f"Extra {i}")
+            WorkerServicePrice.objects.create(worker=worker, service=self.service, price=30, duration_minutes=60)
+            for hour in (9, 11, 13):
+                self._book(worker, hour)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["booking_count"], 16)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+
+
+class WorkerScheduleFeedViewTest(TestCase):
+    """Test cases for worker_schedule_feed view."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.worker = Worker.objects.create(full_name="John Doe")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=30)
+        WorkerServicePrice.objects.create(worker=self.worker, service=self.service, price=25, duration_minutes=45)
+        self.day = timezone.localdate() + timedelta(days=2)
+        self.booking = Booking.objects.create(
+            worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890"
+        )
+        Booking.objects.create(
+            worker=self.worker, service=self.service, date=self.day - timedelta(days=400), time=time(9, 0), phone="+1234567890"
+        )
+        self.token = self.worker.get_feed_token()
+
+    def test_ics_feed(self):
+        """Test that the ICS feed streams recent bookings with worker durations."""
+        response = self.client.get(reverse("worker_schedule_ics", args=[self.token]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("text/calendar"))
+        body = b"".join(response.streaming_content).decode()
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertEqual(body.count("BEGIN:VEVENT"), 1)
+        self.assertIn(f"UID:booking-{self.booking.id}@testserver", body)
+        start = timezone.make_aware(datetime.combine(self.day, time(10, 0)))
+        end = start + timedelta(minutes=45)
+        self.assertIn(f"DTEND:{end.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}", body)
+
+    def test_csv_feed_includes_history(self):
+        """Test that the CSV export covers the full history unless since is given."""
+        url = reverse("worker_schedule_csv", args=[self.token])
+        lines = b"".join(self.client.get(url).streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[2].startswith(f"{self.day.isoformat()},10:00,10:45,45,Haircut"))
+
+        lines = b"".join(self.client.get(url, {"since": self.day.isoformat()}).streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_etag_conditional_request(self):
+        """Test that a matching ETag returns 304 until bookings change."""
+        url = reverse("worker_schedule_ics", args=[self.token])
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertLessEqual(len(ctx.captured_queries), 3)
+
+        self.booking.phone = "+1987654321"
+        self.booking.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_etag_changes_with_service(self):
+        """Test that renaming a booked service invalidates the feed ETag."""
+        url = reverse("worker_schedule_ics", args=[self.token])
+        etag = self.client.get(url)["ETag"]
+        self.service.name = "Cut & style"
+        self.service.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_token(self):
+        """Test that a tampered token returns 404."""
+        response = self.client.get(reverse("worker_schedule_ics", args=[f"{self.token}x"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_since(self):
+        """Test that a malformed since parameter returns 400."""
+        response = self.client.get(reverse("worker_schedule_csv", args=[self.token]), {"since": "soon"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_day_board_links_feeds(self):
+        """Test that staff see each worker's feed links on the day board."""
+        from django.contrib.auth import get_user_model
+
+        staff = get_user_model().objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse("day_board"))
+        self.assertContains(response, reverse("worker_schedule_ics", args=[self.token]))
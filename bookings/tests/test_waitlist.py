@@ -0,0 +1,192 @@
+"""
+Unit tests for waitlist slot offers.
+"""
+from __future__ import annotations
+
+from datetime import time, timedelta
+
+from django.core import mail
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from bookings import outbox, waitlist
+from bookings.models import Booking, OutboundEmail, Service, SlotOffer, WaitlistEntry, Worker
+
+
+class WaitlistOfferTest(TestCase):
+    """Test cases for offering freed slots to the waitlist."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="Test Worker")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=60)
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def _entry(self, email, **kwargs):
+        fields = {
+            "worker": self.worker,
+            "service": self.service,
+            "earliest_date": self.day - timedelta(days=1),
+            "latest_date": self.day + timedelta(days=1),
+            "email": email,
+            "phone": "+1234567890",
+        }
+        fields.update(kwargs)
+        return WaitlistEntry.objects.create(**fields)
+
+    def test_offers_oldest_matching_entries_only(self):
+        """Test that only active entries covering the date are offered, capped at the batch size."""
+        for i in range(waitlist.OFFER_BATCH_SIZE + 2):
+            self._entry(f"client{i}@example.com")
+        self._entry("late@example.com", earliest_date=self.day + timedelta(days=1))
+        self._entry("done@example.com", is_active=False)
+
+        # Entries, two updates voiding an earlier round, the offers and their queued emails.
+        with self.assertNumQueries(5):
+            offers = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+
+        self.assertEqual(len(offers), waitlist.OFFER_BATCH_SIZE)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(outbox.deliver_due(), waitlist.OFFER_BATCH_SIZE)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            sorted(f"client{i}@example.com" for i in range(waitlist.OFFER_BATCH_SIZE)),
+        )
+        self.assertIn(reverse("waitlist_offer", args=[offers[0].token]), mail.outbox[0].body)
+
+    def test_past_slot_is_not_offered(self):
+        """Test that a slot that has already started is not offered."""
+        self._entry("client@example.com", earliest_date=timezone.localdate() - timedelta(days=1))
+        past = timezone.localdate() - timedelta(days=1)
+        self.assertEqual(waitlist.offer_freed_slot(self.worker.id, self.service.id, past, time(10, 0)), [])
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_first_acceptor_wins(self):
+        """Test that a second offer for the same slot cannot be accepted."""
+        self._entry("first@example.com")
+        self._entry("second@example.com")
+        first, second = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+
+        booking = waitlist.accept_offer(second)
+        self.assertEqual(booking.email, "second@example.com")
+        with self.assertRaises(waitlist.OfferUnavailable):
+            waitlist.accept_offer(first)
+        with self.assertRaises(waitlist.OfferUnavailable):
+            waitlist.accept_offer(second)
+
+        self.assertEqual(Booking.objects.filter(worker=self.worker, date=self.day).count(), 1)
+        self.assertFalse(WaitlistEntry.objects.get(email="second@example.com").is_active)
+        self.assertTrue(WaitlistEntry.objects.get(email="first@example.com").is_active)
+
+    def test_expired_offer_is_rejected(self):
+        """Test that an offer past its expiry cannot be accepted."""
+        self._entry("client@example.com")
+        (offer,) = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        SlotOffer.objects.filter(pk=offer.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+        with self.assertRaises(waitlist.OfferUnavailable):
+            waitlist.accept_offer(offer)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_directly_booked_slot_is_rejected(self):
+        """Test that an offer fails if the slot was booked through the normal form meanwhile."""
+        self._entry("client@example.com")
+        (offer,) = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        Booking.objects.create(worker=self.worker, service=self.service, date=self.day, time=time(9, 30), phone="+1234567890")
+        with self.assertRaises(waitlist.OfferUnavailable):
+            waitlist.accept_offer(offer)
+        self.assertIsNone(SlotOffer.objects.get(pk=offer.pk).accepted_at)
+
+    def test_slot_freed_again_can_be_offered(self):
+        """Test that a slot booked from an offer and cancelled again starts a new round."""
+        self._entry("first@example.com")
+        (offer,) = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        waitlist.accept_offer(offer).delete()
+
+        self._entry("second@example.com")
+        (again,) = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        self.assertEqual(waitlist.accept_offer(again).email, "second@example.com")
+        offer.refresh_from_db()
+        self.assertIsNotNone(offer.accepted_at)
+        self.assertIsNotNone(offer.released_at)
+
+    def test_new_round_expires_pending_offers(self):
+        """Test that a new round voids unaccepted offers without deleting them."""
+        self._entry("first@example.com")
+        (offer,) = waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        waitlist.offer_freed_slot(self.worker.id, self.service.id, self.day, time(10, 0))
+        self.assertEqual(SlotOffer.objects.count(), 2)
+        with self.assertRaises(waitlist.OfferUnavailable):
+            waitlist.accept_offer(offer)
+
+
+class WaitlistViewTest(TestCase):
+    """Test cases for the waitlist views."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.worker = Worker.objects.create(full_name="Test Worker")
+        self.service = Service.objects.create(name="Haircut", duration_minutes=60)
+        self.day = timezone.localdate() + timedelta(days=3)
+
+    def test_join_creates_entry(self):
+        """Test that posting the form adds an active waitlist entry."""
+        response = self.client.post(
+            reverse("waitlist_join"),
+            {
+                "worker": self.worker.id,
+                "service": self.service.id,
+                "earliest_date": self.day.isoformat(),
+                "latest_date": (self.day + timedelta(days=2)).isoformat(),
+                "email": "client@example.com",
+                "phone": "+1234567890",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(WaitlistEntry.objects.filter(email="client@example.com", is_active=True).exists())
+
+    def test_join_rejects_reversed_range(self):
+        """Test that the end date must not precede the start date."""
+        response = self.client.post(
+            reverse("waitlist_join"),
+            {
+                "worker": self.worker.id,
+                "service": self.service.id,
+                "earliest_date": self.day.isoformat(),
+                "latest_date": (self.day - timedelta(days=1)).isoformat(),
+                "email": "client@example.com",
+                "phone": "+1234567890",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(WaitlistEntry.objects.exists())
+
+    def test_cancellation_offers_slot_and_accept_books_it(self):
+        """Test the flow from a cancellation to a booking made from the offer."""
+        booking = Booking.objects.create(
+            worker=self.worker, service=self.service, date=self.day, time=time(10, 0), phone="+1234567890"
+        )
+        WaitlistEntry.objects.create(
+            worker=self.worker,
+            service=self.service,
+            earliest_date=self.day,
+            latest_date=self.day,
+            email="waiting@example.com",
+            phone="+1987654321",
+        )
+        self.client.post(reverse("cancel_booking", args=[booking.get_cancellation_token()]))
+        offer = SlotOffer.objects.get()
+        self.assertEqual(OutboundEmail.objects.get().to, ["waiting@example.com"])
+        self.assertEqual(len(mail.outbox), 0)
+        outbox.deliver_due()
+        self.assertEqual([m.to for m in mail.outbox], [["waiting@example.com"]])
+
+        response = self.client.get(reverse("waitlist_offer", args=[offer.token]))
+        self.assertContains(response, "Book this slot")
+        response = self.client.post(reverse("waitlist_offer", args=[offer.token]))
+        new_booking = Booking.objects.get(email="waiting@example.com")
+        self.assertRedirects(response, f"{reverse('booking_success')}?id={new_booking.id}")
+        self.assertEqual(new_booking.time, time(10, 0))
+
+        response = self.client.get(reverse("waitlist_offer", args=[offer.token]))
+        self.assertContains(response, "expired or was already used")
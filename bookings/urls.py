@@ -9,6 +9,21 @@ urlpatterns = [
     path("calendar/", views.calendar_view, name="calendar"),
     path("workers/<int:worker_id>/", views.worker_detail, name="worker_detail"),
     path("cancel/<str:token>/", views.cancel_booking, name="cancel_booking"),
+    path("waitlist/join/", views.waitlist_join, name="waitlist_join"),
+    path("waitlist/offer/<str:token>/", views.waitlist_offer, name="waitlist_offer"),
+    path("staff/day/", views.day_board, name="day_board"),
+    path(
+        "feeds/workers/<str:token>/schedule.ics",
+        views.worker_schedule_feed,
+        {"fmt": "ics"},
+        name="worker_schedule_ics",
+    ),
+    path(
+        "feeds/workers/<str:token>/schedule.csv",
+        views.worker_schedule_feed,
+        {"fmt": "csv"},
+        name="worker_schedule_csv",
+    ),
 ]
 
 
@@ -2,45 +2,205 @@ from __future__ import annotations
 
 import logging
 
+from asgiref.sync import sync_to_async
+
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
 from django.template.loader import render_to_string
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_safe
 
-from datetime import datetime, timedelta, date as date_cls, time as time_cls
+from datetime import datetime, timedelta, date as date_cls
 import calendar
 
-from .forms import BookingForm
-from .models import Worker, WorkerServicePrice, Service, Booking
+from . import availability, calendar_grid, catalog, feeds, idempotency, outbox, waitlist
+from .routing import replica_reads
+from .http_caching import anonymous_page_cache, public_page, row_validators
+from .forms import BookingForm, WaitlistForm
+from .models import Worker, Service, Booking, BookingCancellation, SlotOffer
 
 
 logger = logging.getLogger(__name__)
 
 
+def _home_validators(request):
+    return row_validators(catalog.active_workers())
+
+
+# Always revalidate: the home page is where redirects land with flash messages.
+@public_page(_home_validators, max_age=0, must_revalidate=True)
 def home(request):
-    workers = Worker.objects.filter(is_active=True)
+    workers = catalog.active_workers()
     return render(request, "bookings/home.html", {"workers": workers})
 
 
-def book(request):
+async def _send_booking_confirmation(request, booking) -> bool:
+    """Send the confirmation email off the event loop; return True if a user message was added."""
+    logger.info(
+        "Sending booking confirmation email",
+        extra={
+            "booking_id": booking.id,
+            "email": booking.email,
+        },
+    )
+    subject = "Your salon booking is confirmed"
+
+    # Generate cancellation token
+    cancellation_token = booking.get_cancellation_token()
+    cancellation_url = request.build_absolute_uri(
+        reverse("cancel_booking", args=[cancellation_token])
+    )
+
+    # Prepare email context
+    email_context = {
+        "booking": booking,
+        "worker": booking.worker,
+        "service": booking.service,
+        "date": booking.date,
+        "time": booking.time,
+        "cancellation_url": cancellation_url,
+    }
+
+    # Render plain text version
+    text_content = render_to_string("bookings/emails/booking_confirmation.txt", email_context)
+
+    # Render HTML version
+    html_content = render_to_string("bookings/emails/booking_confirmation.html", email_context)
+
+    # Create email message
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[booking.email],
+    )
+    msg.attach_alternative(html_content, "text/html")
+
+    try:
+        # Check if we're using console backend (development mode)
+        if settings.EMAIL_BACKEND == "django.core.mail.backends.console.EmailBackend":
+            logger.warning(
+                "Email backend is set to console - emails will be printed to console, not sent",
+                extra={
+                    "booking_id": booking.id,
+                    "email": booking.email,
+                    "hint": "Set EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend and provide EMAIL_HOST_USER and EMAIL_HOST_PASSWORD",
+                },
+            )
+            messages.warning(
+                request,
+                "Email configuration not set. Confirmation email was not sent. "
+                "Please contact us if you need booking details."
+            )
+            return True
+
+        # SMTP round-trips run in a worker thread so the event loop keeps serving other requests.
+        result = await sync_to_async(msg.send, thread_sensitive=False)(fail_silently=False)
+        if result:
+            logger.info(
+                "Booking confirmation email sent successfully",
+                extra={"booking_id": booking.id, "email": booking.email},
+            )
+            messages.success(
+                request,
+                f"Confirmation email sent to {booking.email}"
+            )
+        else:
+            logger.warning(
+                "Booking confirmation email send returned 0",
+                extra={"booking_id": booking.id, "email": booking.email},
+            )
+            await sync_to_async(outbox.enqueue)(msg, "backend reported 0 messages sent")
+            messages.warning(
+                request,
+                "Booking confirmed. The confirmation email is delayed; we will keep trying to send it."
+            )
+        return True
+    except Exception as e:
+        logger.exception(
+            "Failed to send booking confirmation email",
+            extra={
+                "booking_id": booking.id,
+                "email": booking.email,
+                "error": str(e),
+                "email_backend": settings.EMAIL_BACKEND,
+            },
+        )
+        # The scheduler retries it from the outbox.
+        await sync_to_async(outbox.enqueue)(msg, str(e))
+        messages.warning(
+            request,
+            "Booking confirmed. The confirmation email is delayed; we will keep trying to send it."
+        )
+        # Don't fail the booking if email fails, but log it
+        return True
+
+
+def _save_booking(form, idempotency_key: str | None = None):
+    """Save a valid BookingForm; None (with a form error) if a concurrent request took the slot."""
+    form.instance.idempotency_key = idempotency_key
+    try:
+        with transaction.atomic():
+            return form.save()
+    except IntegrityError:
+        form.add_error(None, "This time slot was just booked. Please choose another time.")
+        return None
+
+
+async def book(request):
     if request.method == "GET":
+        # request.user is resolved lazily from the session, which may hit the database.
+        user_id = await sync_to_async(lambda: getattr(request.user, "id", None))()
         logger.info(
             "Booking page viewed",
             extra={
                 "path": request.get_full_path(),
                 "method": request.method,
-                "user": getattr(request.user, "id", None),
+                "user": user_id,
             },
         )
 
     if request.method == "POST":
+        key = request.POST.get("idempotency_key")
+        if not idempotency.is_valid(key):
+            key = None
+        if key and not await idempotency.aclaim(key):
+            booking_id = await idempotency.aresult(key)
+            if booking_id is not None:
+                logger.info("Replayed booking submission", extra={"booking_id": booking_id})
+                return redirect(reverse("booking_success") + f"?id={booking_id}")
+            # The first submission failed validation and let the key go, unless it is still running.
+            if not await idempotency.aclaim(key):
+                messages.info(request, "Your booking is still being processed.")
+                return redirect(reverse("home"))
+
         form = BookingForm(request.POST)
-        if form.is_valid():
-            booking = form.save()
+        booking = replayed_id = None
+        try:
+            if await sync_to_async(form.is_valid)():
+                booking = await sync_to_async(_save_booking)(form, key)
+            if key and booking is None:
+                # A concurrent duplicate can slip past the cache claim; the unique column can't be.
+                replayed_id = await sync_to_async(idempotency.saved_booking_id)(key)
+        finally:
+            if key and booking is None and replayed_id is None:
+                await idempotency.arelease(key)
+
+        if replayed_id is not None:
+            await idempotency.acomplete(key, replayed_id)
+            logger.info("Replayed booking submission", extra={"booking_id": replayed_id})
+            return redirect(reverse("booking_success") + f"?id={replayed_id}")
+
+        if booking is not None:
+            if key:
+                await idempotency.acomplete(key, booking.id)
             logger.info(
                 "Booking created",
                 extra={
@@ -54,102 +214,8 @@ def book(request):
             # Send confirmation email if provided
             email_message_added = False
             if booking.email:
-                logger.info(
-                    "Sending booking confirmation email",
-                    extra={
-                        "booking_id": booking.id,
-                        "email": booking.email,
-                    },
-                )
-                subject = "Your salon booking is confirmed"
-                
-                # Generate cancellation token
-                cancellation_token = booking.get_cancellation_token()
-                cancellation_url = request.build_absolute_uri(
-                    reverse("cancel_booking", args=[cancellation_token])
-                )
-                
-                # Prepare email context
-                email_context = {
-                    "booking": booking,
-                    "worker": booking.worker,
-                    "service": booking.service,
-                    "date": booking.date,
-                    "time": booking.time,
-                    "cancellation_url": cancellation_url,
-                }
-                
-                # Render plain text version
-                text_content = render_to_string("bookings/emails/booking_confirmation.txt", email_context)
-                
-                # Render HTML version
-                html_content = render_to_string("bookings/emails/booking_confirmation.html", email_context)
-                
-                # Create email message
-                msg = EmailMultiAlternatives(
-                    subject=subject,
-                    body=text_content,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to=[booking.email],
-                )
-                msg.attach_alternative(html_content, "text/html")
-                
-                try:
-                    # Check if we're using console backend (development mode)
-                    if settings.EMAIL_BACKEND == "django.core.mail.backends.console.EmailBackend":
-                        logger.warning(
-                            "Email backend is set to console - emails will be printed to console, not sent",
-                            extra={
-                                "booking_id": booking.id,
-                                "email": booking.email,
-                                "hint": "Set EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend and provide EMAIL_HOST_USER and EMAIL_HOST_PASSWORD",
-                            },
-                        )
-                        messages.warning(
-                            request,
-                            "Email configuration not set. Confirmation email was not sent. "
-                            "Please contact us if you need booking details."
-                        )
-                        email_message_added = True
-                    else:
-                        result = msg.send(fail_silently=False)
-                        if result:
-                            logger.info(
-                                "Booking confirmation email sent successfully",
-                                extra={"booking_id": booking.id, "email": booking.email},
-                            )
-                            messages.success(
-                                request,
-                                f"Confirmation email sent to {booking.email}"
-                            )
-                            email_message_added = True
-                        else:
-                            logger.warning(
-                                "Booking confirmation email send returned 0",
-                                extra={"booking_id": booking.id, "email": booking.email},
-                            )
-                            messages.warning(
-                                request,
-                                "Booking confirmed, but email could not be sent. Please check your email address."
-                            )
-                            email_message_added = True
-                except Exception as e:
-                    logger.exception(
-                        "Failed to send booking confirmation email",
-                        extra={
-                            "booking_id": booking.id,
-                            "email": booking.email,
-                            "error": str(e),
-                            "email_backend": settings.EMAIL_BACKEND,
-                        },
-                    )
-                    messages.warning(
-                        request,
-                        "Booking confirmed, but email could not be sent. Please contact us if you need booking details."
-                    )
-                    email_message_added = True
-                    # Don't fail the booking if email fails, but log it
-            
+                email_message_added = await _send_booking_confirmation(request, booking)
+
             # Main success message (only show if we didn't already add an email-related message)
             if not email_message_added:
                 messages.success(request, "Your booking is confirmed.")
@@ -205,10 +271,14 @@ def book(request):
         try:
             worker_value = form["worker"].value()
             if worker_value:
-                selected_worker = Worker.objects.filter(id=worker_value).first()
+                selected_worker = await Worker.objects.filter(
+                    id=worker_value, location_id=request.location_id
+                ).afirst()
             service_value = form["service"].value()
             if service_value:
-                selected_service = Service.objects.filter(id=service_value).first()
+                selected_service = await Service.objects.filter(
+                    id=service_value, location_id=request.location_id
+                ).afirst()
             date_value = form["date"].value()
             if date_value:
                 selected_date = datetime.fromisoformat(date_value).date()
@@ -226,7 +296,8 @@ def book(request):
             selected_time = None
             calendar_month = None
 
-    return render(
+    # Rendering iterates the form's choice querysets, so it runs in the sync thread.
+    return await sync_to_async(render)(
         request,
         "bookings/book.html",
         {
@@ -252,16 +323,25 @@ def booking_success(request):
     return render(request, "bookings/success.html")
 
 
+def _pricelist_validators(request):
+    workers = catalog.pricelist()
+    prices = [price for worker in workers for price in worker.service_prices.all()]
+    return row_validators([*workers, *prices, *(price.service for price in prices), *catalog.services()])
+
+
+@public_page(_pricelist_validators, max_age=300)
 def pricelist(request):
-    workers = Worker.objects.filter(is_active=True).prefetch_related("service_prices__service")
-    services = Service.objects.all()
+    workers = catalog.pricelist()
+    services = catalog.services()
     return render(request, "bookings/pricelist.html", {"workers": workers, "services": services})
 
 
-def calendar_view(request):
+@replica_reads
+@anonymous_page_cache(("worker", "service", "month", "date"))
+async def calendar_view(request):
     """Month view calendar with worker/service availability coloring."""
     today = timezone.localdate()
-    workers = Worker.objects.filter(is_active=True)
+    workers = await catalog.aactive_workers()
 
     worker_id = request.GET.get("worker")
     service_id = request.GET.get("service")
@@ -270,10 +350,13 @@ def calendar_view(request):
 
     worker = None
     selected_service = None
-    service_options = Service.objects.none()
+    service_options: list[Service] = []
+    durations: dict[int, int] = {}
 
     if worker_id:
-        worker = get_object_or_404(workers, id=worker_id)
+        worker = next((w for w in workers if str(w.id) == worker_id), None)
+        if worker is None:
+            raise Http404("No Worker matches the given query.")
         logger.info(
             "Calendar viewed for worker",
             extra={
@@ -284,13 +367,11 @@ def calendar_view(request):
             },
         )
         # Only services the worker offers (fall back to all if none configured)
-        worker_prices = WorkerServicePrice.objects.filter(worker=worker).select_related("service")
-        service_options = [wp.service for wp in worker_prices] or list(Service.objects.all())
+        worker_prices = await catalog.aworker_prices(worker.id)
+        durations = availability.durations_from_prices(worker_prices)
+        service_options = [wp.service for wp in worker_prices] or await catalog.aservices()
         if service_id:
-            try:
-                selected_service = next((svc for svc in service_options if str(svc.id) == service_id), None)
-            except StopIteration:
-                selected_service = None
+            selected_service = next((svc for svc in service_options if str(svc.id) == service_id), None)
 
     # Resolve month
     if month_param:
@@ -307,122 +388,83 @@ def calendar_view(request):
     # Build weeks for display
     cal = calendar.Calendar(firstweekday=0)
     month_weeks = cal.monthdatescalendar(month_start.year, month_start.month)
+    month_end = date_cls(
+        month_start.year, month_start.month, calendar.monthrange(month_start.year, month_start.month)[1]
+    )
+
+    selected_date = None
+    if selected_date_str:
+        try:
+            selected_date = datetime.strptime(selected_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            selected_date = None
 
+    hours = availability.working_hours(worker)
+    local_now = timezone.localtime().replace(tzinfo=None)
     service_duration = None
+    step = availability.slot_step(worker, selected_service)
+    compact = bool(worker and worker.compact_slots)
+    summaries: dict[date_cls, tuple] = {}
+    intervals: dict[date_cls, list] = {}
     if worker and selected_service:
-        service_duration = Booking._duration_for_worker_service(worker, selected_service)
-
-    # Preload bookings for the month for the selected worker
-    bookings_by_date = {}
-    if worker:
-        month_end_day = calendar.monthrange(month_start.year, month_start.month)[1]
-        month_end = date_cls(month_start.year, month_start.month, month_end_day)
-        qs = (
-            Booking.objects.filter(worker=worker, date__gte=month_start, date__lte=month_end)
-            .select_related("service")
-            .order_by("time")
+        service_duration = availability.service_duration(selected_service, durations)
+        # Future days come from the DailyAvailability summary; only today (past
+        # slots drop out) and the selected day need their bookings loaded.
+        summaries = await availability.aday_summaries(worker, month_start, month_end)
+        slot_days = {today} | ({selected_date} if selected_date else set())
+        intervals = await availability.aintervals_for_days(worker, slot_days, durations)
+
+    def _slots_for_day(day: date_cls):
+        return availability.slots_for_day(
+            day, service_duration, hours, intervals.get(day, []), local_now, step=step, compact=compact
         )
-        for booking in qs:
-            bookings_by_date.setdefault(booking.date, []).append(booking)
-
-    def _working_hours():
-        start = worker.working_hours_start if worker else time_cls(9, 0)
-        end = worker.working_hours_end if worker else time_cls(18, 0)
-        return start, end
-
-    def _slots_for_day(day: date_cls, duration: int):
-        """Return all potential start times for a day with 15-min granularity and availability flag."""
-        start_time, end_time = _working_hours()
-        start_dt = datetime.combine(day, start_time)
-        end_dt = datetime.combine(day, end_time)
-        if end_dt <= start_dt:
-            return []
-
-        last_start = end_dt - timedelta(minutes=duration)
-        if last_start < start_dt:
-            return []
-
-        local_now = timezone.localtime().replace(tzinfo=None)
-        slots: list[dict[str, object]] = []
-        slot = start_dt
-        day_bookings = bookings_by_date.get(day, [])
-
-        while slot <= last_start:
-            candidate_end = slot + timedelta(minutes=duration)
-            # Skip past times for current day
-            if slot.date() == local_now.date() and candidate_end <= local_now:
-                slot += timedelta(minutes=15)
-                continue
-
-            conflict = False
-            for booking in day_bookings:
-                existing_start = datetime.combine(day, booking.time)
-                existing_duration = Booking._duration_for_worker_service(worker, booking.service)
-                existing_end = existing_start + timedelta(minutes=existing_duration)
-                if slot < existing_end and candidate_end > existing_start:
-                    conflict = True
-                    break
-
-            slots.append(
-                {
-                    "time": slot.time().strftime("%H:%M"),
-                    "available": not conflict,
-                }
-            )
-            slot += timedelta(minutes=15)
-
-        return slots
-
-    # Build availability for each day in the month grid
-    calendar_days = []
-    for week in month_weeks:
-        week_days = []
-        for day in week:
-            in_month = day.month == month_start.month
-            status = "past"
-            if day < today:
-                status = "past"
-            elif worker and selected_service and in_month:
-                day_slots = _slots_for_day(day, service_duration)
-                has_slots = any(s["available"] for s in day_slots)
-                status = "available" if has_slots else "full"
-            else:
-                status = "idle"
-
-            week_days.append(
-                {
-                    "date": day,
-                    "in_month": in_month,
-                    "status": status,
-                    "is_today": day == today,
-                }
-            )
-        calendar_days.append(week_days)
+
+    def _day_fits(day: date_cls) -> bool:
+        if day == today:
+            return any(s["available"] for s in _slots_for_day(day))
+        return availability.day_fits(summaries.get(day), service_duration, hours, step, compact)
+
+    # Build availability for each day in the month grid; classes and links are resolved here, not in the template.
+    month_query = {"worker": worker.id if worker else None, "service": selected_service.id if selected_service else None}
+    calendar_days = calendar_grid.month_cells(
+        month_weeks,
+        month_start,
+        today,
+        fits=_day_fits if worker and selected_service else None,
+        day_url=calendar_grid.query_prefix(**month_query, month=f"{month_start:%Y-%m}"),
+    )
 
     # Selected date slots (optional detail below calendar)
-    selected_date = None
     selected_slots: list[dict[str, object]] = []
-    if selected_date_str and worker and selected_service:
-        try:
-            selected_date = datetime.strptime(selected_date_str, "%Y-%m-%d").date()
-            selected_slots = _slots_for_day(selected_date, service_duration)
-            logger.info(
-                "Calendar slots calculated",
-                extra={
-                    "worker_id": worker.id,
-                    "service_id": selected_service.id,
-                    "selected_date": str(selected_date),
-                    "available_slots_count": len([s for s in selected_slots if s["available"]]),
-                },
-            )
-        except ValueError:
-            selected_date = None
+    if not (worker and selected_service):
+        selected_date = None
+    elif selected_date:
+        selected_slots = calendar_grid.link_slots(_slots_for_day(selected_date), worker.id, selected_service.id, selected_date)
+        logger.info(
+            "Calendar slots calculated",
+            extra={
+                "worker_id": worker.id,
+                "service_id": selected_service.id,
+                "selected_date": str(selected_date),
+                "available_slots_count": len([s for s in selected_slots if s["available"]]),
+            },
+        )
 
     # Determine prev/next month params
     prev_month = (month_start.replace(day=1) - timedelta(days=1)).replace(day=1)
     next_month = (month_start + timedelta(days=32)).replace(day=1)
+    links = {}
+    if worker and selected_service:
+        links = {
+            "prev_month": calendar_grid.query_prefix(**month_query) + f"month={prev_month:%Y-%m}",
+            "next_month": calendar_grid.query_prefix(**month_query) + f"month={next_month:%Y-%m}",
+            "change_date": calendar_grid.query_prefix(**month_query) + f"month={month_start:%Y-%m}",
+            "waitlist": calendar_grid.query_prefix(
+                reverse("waitlist_join"), **month_query, date=selected_date.isoformat() if selected_date else None
+            ).rstrip("&"),
+        }
 
-    return render(
+    return await sync_to_async(render)(
         request,
         "bookings/calendar.html",
         {
@@ -437,15 +479,29 @@ def calendar_view(request):
             "selected_slots": selected_slots,
             "prev_month": prev_month,
             "next_month": next_month,
+            "links": links,
         },
     )
 
 
+def _worker_detail_validators(request, worker_id: int):
+    worker = catalog.active_worker(worker_id)
+    if worker is None:
+        return None, None
+    prices = catalog.worker_prices(worker_id)
+    # The calendar link carries today's date.
+    today = timezone.localdate()
+    etag, last_modified = row_validators([worker, *prices, *(price.service for price in prices)], today.isoformat())
+    midnight = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+    return etag, max(last_modified, midnight)
+
+
+@public_page(_worker_detail_validators, max_age=300)
 def worker_detail(request, worker_id: int):
-    worker = get_object_or_404(Worker.objects.filter(is_active=True), id=worker_id)
-    # Prefetch prices and related services for display
-    prices = WorkerServicePrice.objects.filter(worker=worker).select_related("service")
-    from django.utils import timezone
+    worker = catalog.active_worker(worker_id)
+    if worker is None:
+        raise Http404("No Worker matches the given query.")
+    prices = catalog.worker_prices(worker_id)
     return render(request, "bookings/worker_detail.html", {
         'worker': worker,
         'prices': prices,
@@ -482,13 +538,29 @@ def cancel_booking(request, token: str):
             "email": booking.email,
         }
         
-        # Delete the booking
-        booking.delete()
+        # Delete the booking, keeping a record for the analytics summaries
+        with transaction.atomic():
+            BookingCancellation.objects.create(
+                worker_id=booking.worker_id, service_id=booking.service_id, date=booking.date, time=booking.time
+            )
+            booking.delete()
         
         logger.info(
             "Booking cancelled",
             extra=booking_details,
         )
+
+        # Offer the freed slot to the waitlist; failures must not undo the cancellation.
+        try:
+            waitlist.offer_freed_slot(
+                booking.worker_id,
+                booking.service_id,
+                booking.date,
+                booking.time,
+                base_url=request.build_absolute_uri("/")[:-1],
+            )
+        except Exception:
+            logger.exception("Failed to offer freed slot to the waitlist", extra=booking_details)
         
         # Send cancellation confirmation email if email was provided
         if booking_details["email"]:
@@ -510,7 +582,7 @@ def cancel_booking(request, token: str):
                     to=[booking_details["email"]],
                 )
                 msg.attach_alternative(html_content, "text/html")
-                msg.send(fail_silently=True)
+                outbox.send(msg)
             except Exception:
                 logger.exception(
                     "Failed to send cancellation confirmation email",
@@ -526,4 +598,149 @@ def cancel_booking(request, token: str):
     })
 
 
+def waitlist_join(request):
+    """Join the waitlist for a worker/service; offers are emailed when a matching slot frees up."""
+    if request.method == "POST":
+        form = WaitlistForm(request.POST)
+        if form.is_valid():
+            entry = form.save()
+            logger.info(
+                "Waitlist entry created",
+                extra={"entry_id": entry.id, "worker_id": entry.worker_id, "service_id": entry.service_id},
+            )
+            messages.success(request, "You are on the waitlist. We will email you if a slot frees up.")
+            return redirect(reverse("home"))
+    else:
+        initial = {}
+        for name in ("worker", "service"):
+            if request.GET.get(name):
+                initial[name] = request.GET[name]
+        if request.GET.get("date"):
+            initial["earliest_date"] = initial["latest_date"] = request.GET["date"]
+        form = WaitlistForm(initial=initial)
+    return render(request, "bookings/waitlist_join.html", {"form": form})
+
+
+def waitlist_offer(request, token: str):
+    """Show a waitlist slot offer (GET) and accept it (POST)."""
+    offer = get_object_or_404(SlotOffer.objects.select_related("entry", "worker", "service"), token=token)
+    expired = offer.accepted_at is not None or offer.expires_at <= timezone.now()
+
+    if request.method == "POST" and not expired:
+        try:
+            booking = waitlist.accept_offer(offer)
+        except waitlist.OfferUnavailable as exc:
+            messages.error(request, str(exc))
+            return redirect(reverse("home"))
+        return redirect(f"{reverse('booking_success')}?id={booking.id}")
+
+    return render(request, "bookings/waitlist_offer.html", {"offer": offer, "expired": expired})
+
 
+@staff_member_required
+def day_board(request):
+    """All workers' bookings for one day, one column per worker, for salon staff."""
+    today = timezone.localdate()
+    try:
+        day = datetime.strptime(request.GET.get("date", ""), "%Y-%m-%d").date()
+    except ValueError:
+        day = today
+
+    workers = list(Worker.objects.filter(location_id=request.location_id, is_active=True))
+    bookings = list(
+        Booking.objects.filter(location_id=request.location_id, date=day, worker__in=[w.id for w in workers])
+        .select_related("service")
+        .order_by("time")
+    )
+    # Durations are resolved in memory; Booking.end_time would query prices once per row.
+    durations = availability.durations_for_workers(w.id for w in workers)
+
+    columns = {
+        worker.id: {"worker": worker, "feed_token": worker.get_feed_token(), "bookings": []} for worker in workers
+    }
+    for booking in bookings:
+        if booking.service_id is None:
+            minutes = availability.DEFAULT_DURATION_MINUTES
+        else:
+            minutes = durations.get((booking.worker_id, booking.service_id), booking.service.duration_minutes)
+        start = datetime.combine(day, booking.time)
+        columns[booking.worker_id]["bookings"].append(
+            {
+                "booking": booking,
+                "start": start.time(),
+                "end": (start + timedelta(minutes=minutes)).time(),
+                "duration": minutes,
+            }
+        )
+
+    return render(
+        request,
+        "bookings/day_board.html",
+        {
+            "day": day,
+            "today": today,
+            "columns": list(columns.values()),
+            "booking_count": len(bookings),
+            "prev_day": day - timedelta(days=1),
+            "next_day": day + timedelta(days=1),
+        },
+    )
+
+
+FEED_FORMATS = {
+    "ics": ("text/calendar; charset=utf-8", feeds.ICS_LOOKBACK_DAYS),
+    "csv": ("text/csv; charset=utf-8", None),
+}
+
+
+def _schedule_feed_source(request, token: str, fmt: str):
+    """Resolve (worker, since, durations, error) once per request for both the ETag and the body."""
+    cached = getattr(request, "_schedule_feed_source", None)
+    if cached is not None:
+        return cached
+
+    worker = Worker.from_feed_token(token)
+    if worker is None:
+        raise Http404("Unknown feed")
+    since, error = None, None
+    raw_since = request.GET.get("since")
+    if raw_since:
+        try:
+            since = datetime.strptime(raw_since, "%Y-%m-%d").date()
+        except ValueError:
+            error = "since must be YYYY-MM-DD"
+    elif FEED_FORMATS[fmt][1] is not None:
+        since = timezone.localdate() - timedelta(days=FEED_FORMATS[fmt][1])
+    request._schedule_feed_source = (worker, since, availability.duration_map(worker), error)
+    return request._schedule_feed_source
+
+
+def _schedule_feed_etag(request, token: str, fmt: str):
+    worker, since, durations, error = _schedule_feed_source(request, token, fmt)
+    if error:
+        return None
+    return feeds.schedule_etag(worker, since, durations, fmt)
+
+
+@require_safe
+@condition(etag_func=_schedule_feed_etag)
+def worker_schedule_feed(request, token: str, fmt: str):
+    """Stream a worker's bookings as an iCalendar feed or CSV export."""
+    worker, since, durations, error = _schedule_feed_source(request, token, fmt)
+    if error:
+        return HttpResponseBadRequest(error)
+
+    entries = feeds.iter_schedule(worker, since, durations)
+    if fmt == "ics":
+        chunks = feeds.iter_ics(worker, entries, host=request.get_host().split(":")[0])
+    else:
+        chunks = feeds.iter_csv(entries)
+    response = StreamingHttpResponse(feeds.buffered(chunks), content_type=FEED_FORMATS[fmt][0])
+    response["Content-Disposition"] = f'inline; filename="worker-{worker.id}-schedule.{fmt}"'
+    # The URL is a bearer token: keep it out of shared caches.
+    response["Cache-Control"] = "private, no-cache"
+    logger.info(
+        "Schedule feed served",
+        extra={"worker_id": worker.id, "format": fmt, "since": str(since) if since else None},
+    )
+    return response
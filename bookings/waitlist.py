@@ -0,0 +1,150 @@
+"""
+Waitlist offers for freed slots.
+
+When a booking is cancelled, ``offer_freed_slot`` picks the oldest matching
+waitlist entries through the partial ``waitlist_match_idx`` index, capped at
+``OFFER_BATCH_SIZE`` however long the waitlist is, and queues a time-boxed
+offer link for each in the email outbox, so cancelling never waits on SMTP.
+``accept_offer`` claims the slot with a conditional UPDATE backed by the
+``unique_accepted_slot_offer`` constraint, so exactly one acceptor gets the
+booking.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import logging
+import secrets
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import IntegrityError, transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from . import availability, outbox
+from .models import Booking, SlotOffer, WaitlistEntry
+
+logger = logging.getLogger(__name__)
+
+OFFER_BATCH_SIZE = 5
+OFFER_TTL = timedelta(hours=2)
+
+
+class OfferUnavailable(Exception):
+    """The offer expired, was already used, or the slot has been taken."""
+
+
+def matching_entries(worker_id: int, service_id: int, day: date, limit: int = OFFER_BATCH_SIZE):
+    """Oldest active entries waiting for ``day`` with this worker and service."""
+    return list(
+        WaitlistEntry.objects.filter(
+            worker_id=worker_id,
+            service_id=service_id,
+            is_active=True,
+            earliest_date__lte=day,
+            latest_date__gte=day,
+        )
+        .select_related("worker", "service")
+        .order_by("created_at")[:limit]
+    )
+
+
+def offer_freed_slot(worker_id: int, service_id: int | None, day: date, start: time, base_url: str = "") -> list[SlotOffer]:
+    """Create offers for a freed slot and queue their emails; return the offers made."""
+    if service_id is None:
+        return []
+    now = timezone.now()
+    slot_start = timezone.make_aware(datetime.combine(day, start))
+    if slot_start <= now:
+        return []
+
+    entries = matching_entries(worker_id, service_id, day)
+    if not entries:
+        return []
+    # Pending offers from an earlier round for this slot are void now. An accepted
+    # one stays as the record of who had the slot but no longer holds it.
+    earlier = SlotOffer.objects.filter(worker_id=worker_id, date=day, time=start)
+    earlier.filter(accepted_at__isnull=True, expires_at__gt=now).update(expires_at=now)
+    earlier.filter(accepted_at__isnull=False, released_at__isnull=True).update(released_at=now)
+    expires_at = min(now + OFFER_TTL, slot_start)
+    offers = SlotOffer.objects.bulk_create(
+        [
+            SlotOffer(
+                entry=entry,
+                worker_id=worker_id,
+                service_id=service_id,
+                date=day,
+                time=start,
+                token=secrets.token_urlsafe(32),
+                expires_at=expires_at,
+            )
+            for entry in entries
+        ]
+    )
+    outbox.queue([_offer_email(offer, base_url) for offer in offers])
+    logger.info(
+        "Waitlist offers queued",
+        extra={"worker_id": worker_id, "service_id": service_id, "date": str(day), "time": start.isoformat(), "offers": len(offers)},
+    )
+    return offers
+
+
+def _offer_email(offer: SlotOffer, base_url: str) -> EmailMultiAlternatives:
+    entry = offer.entry
+    context = {
+        "worker": entry.worker,
+        "service": entry.service,
+        "date": offer.date,
+        "time": offer.time,
+        "expires_at": timezone.localtime(offer.expires_at),
+        "offer_url": base_url + reverse("waitlist_offer", args=[offer.token]),
+    }
+    msg = EmailMultiAlternatives(
+        subject="A slot you were waiting for is free",
+        body=render_to_string("bookings/emails/waitlist_offer.txt", context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[entry.email],
+    )
+    msg.attach_alternative(render_to_string("bookings/emails/waitlist_offer.html", context), "text/html")
+    return msg
+
+
+def accept_offer(offer: SlotOffer) -> Booking:
+    """Claim ``offer``'s slot and book it for the waitlisted client.
+
+    Raises :class:`OfferUnavailable` if the offer expired or was used, another
+    offer for the slot was accepted first, or the slot was booked directly.
+    """
+    now = timezone.now()
+    entry = offer.entry
+    try:
+        with transaction.atomic():
+            claimed = SlotOffer.objects.filter(pk=offer.pk, accepted_at__isnull=True, expires_at__gt=now).update(
+                accepted_at=now
+            )
+            if not claimed:
+                raise OfferUnavailable("This offer has expired or was already used.")
+
+            durations = availability.duration_map(offer.worker_id)
+            day_bookings = availability.day_bookings(offer.worker_id, offer.date, durations)
+            begin = datetime.combine(offer.date, offer.time)
+            end = begin + timedelta(minutes=availability.service_duration(offer.service, durations))
+            if availability.overlaps((begin, end), day_bookings.values()):
+                raise OfferUnavailable("This slot has already been taken.")
+
+            booking = Booking.objects.create(
+                worker_id=offer.worker_id,
+                service_id=offer.service_id,
+                date=offer.date,
+                time=offer.time,
+                phone=entry.phone,
+                email=entry.email,
+            )
+            WaitlistEntry.objects.filter(pk=entry.pk).update(is_active=False, booking=booking)
+    except IntegrityError:
+        # Another offer for the slot was accepted, or it was booked, in the meantime.
+        raise OfferUnavailable("This slot has already been taken.")
+
+    logger.info("Waitlist offer accepted", extra={"offer_id": offer.id, "booking_id": booking.id})
+    return booking
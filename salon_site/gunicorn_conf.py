@@ -0,0 +1,87 @@
+"""
+Gunicorn configuration for salon_site.
+
+Start the server with::
+
+    gunicorn -c python:salon_site.gunicorn_conf
+
+Booking traffic is I/O bound (SQLite writes, SMTP round-trips), so the default
+worker model is ``gthread``: a slow confirmation email blocks one thread rather
+than a whole worker process. Set ``GUNICORN_WORKER_MODEL=asgi`` to serve
+``salon_site.asgi`` through uvicorn workers instead, or ``sync`` for the legacy
+behaviour.
+
+Environment variables:
+
+- ``GUNICORN_WORKER_MODEL``: ``gthread`` (default), ``asgi`` or ``sync``
+- ``WEB_CONCURRENCY``: worker processes (default ``2 * CPUs + 1``, capped by ``GUNICORN_MAX_WORKERS``)
+- ``GUNICORN_THREADS``: threads per gthread worker (default 8)
+- ``GUNICORN_BIND``: bind address (default ``0.0.0.0:$PORT`` or ``0.0.0.0:8000``)
+- ``GUNICORN_TIMEOUT`` / ``GUNICORN_GRACEFUL_TIMEOUT`` / ``GUNICORN_KEEPALIVE``: seconds
+- ``GUNICORN_MAX_REQUESTS`` / ``GUNICORN_MAX_REQUESTS_JITTER``: worker recycling
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def default_worker_count() -> int:
+    """Return ``2 * CPUs + 1`` capped by ``GUNICORN_MAX_WORKERS``."""
+    cpus = multiprocessing.cpu_count()
+    return max(1, min(cpus * 2 + 1, _env_int("GUNICORN_MAX_WORKERS", 9)))
+
+
+WORKER_MODELS = {
+    "gthread": ("gthread", "salon_site.wsgi:application"),
+    "asgi": ("uvicorn.workers.UvicornWorker", "salon_site.asgi:application"),
+    "sync": ("sync", "salon_site.wsgi:application"),
+}
+
+worker_model = os.environ.get("GUNICORN_WORKER_MODEL", "gthread").strip().lower()
+if worker_model not in WORKER_MODELS:
+    raise RuntimeError(
+        f"Unknown GUNICORN_WORKER_MODEL {worker_model!r}; expected one of {', '.join(WORKER_MODELS)}"
+    )
+
+worker_class, wsgi_app = WORKER_MODELS[worker_model]
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+workers = _env_int("WEB_CONCURRENCY", default_worker_count())
+if worker_model == "gthread":
+    threads = _env_int("GUNICORN_THREADS", 8)
+
+# Load Django once in the master so workers fork with warm imports and share pages.
+preload_app = True
+
+# A request that takes longer than this is stuck, not slow: SMTP is bounded by
+# EMAIL_TIMEOUT and SQLite by its busy timeout.
+timeout = _env_int("GUNICORN_TIMEOUT", 60)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+
+# Recycle workers periodically; jitter keeps them from restarting in lockstep.
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# An empty GUNICORN_ACCESS_LOG disables access logging.
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = os.environ.get("GUNICORN_ERROR_LOG", "-")
+loglevel = os.environ.get("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    """Drop any DB connection inherited from the preloaded master."""
+    from django.db import connections
+
+    connections.close_all()
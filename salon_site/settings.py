@@ -43,6 +43,8 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "bookings.tenancy.LocationMiddleware",
+    "bookings.routing.ReplicaRoutingMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_browser_reload.middleware.BrowserReloadMiddleware",
 ]
@@ -70,10 +72,51 @@ WSGI_APPLICATION = "salon_site.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DJANGO_SQLITE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
+# Read replica for listing/calendar pages and exports (see bookings/routing.py).
+# Locally a second SQLite file stands in for it; refresh it from the primary
+# with `manage.py sync_replica`.
+if os.environ.get("DJANGO_SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["DJANGO_SQLITE_REPLICA_PATH"],
+    }
+DATABASE_ROUTERS = ["bookings.routing.ReplicaRouter"]
+# After a write, the visitor reads from the primary for this many seconds.
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+
+# The shared cache must be visible to every gunicorn worker for catalog
+# invalidation to propagate: Redis (REDIS_URL, needs the ``redis`` package) or a
+# directory on the host (DJANGO_CACHE_DIR). Local memory is per process and only
+# suits development and tests.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+elif os.environ.get("DJANGO_CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ["DJANGO_CACHE_DIR"],
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# Flash messages travel in a signed cookie, so anonymous visitors never get a
+# session and their page views never write to SQLite. Staff logins keep
+# server-side sessions (revocable by deleting the row), read through the cache.
+# SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies moves those
+# into cookies too, at the cost of not being able to revoke a stolen session.
+SESSION_ENGINE = os.environ.get("SESSION_ENGINE", "django.contrib.sessions.backends.cached_db")
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
 # Email configuration (override via environment variables)
 # Use SMTP backend if email credentials are provided, otherwise use console backend for development
 has_email_credentials = bool(os.environ.get("EMAIL_HOST_USER") and os.environ.get("EMAIL_HOST_PASSWORD"))
@@ -85,9 +128,11 @@ default_email_backend = "django.core.mail.backends.smtp.EmailBackend" if has_ema
 # ... other settings ...
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
+EMAIL_HOST = os.environ.get("EMAIL_HOST", "smtp.gmail.com")
+EMAIL_PORT = int(os.environ.get("EMAIL_PORT", "587"))
 EMAIL_USE_TLS = True
+# Bound how long a request can wait on SMTP; a hung server must not pin a worker thread.
+EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", "10"))
 
 # THIS IS THE IMPORTANT PART:
 # We use os.environ.get to read from Azure, not from this file.
@@ -100,6 +145,34 @@ DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER or "no
 TWILIO_ACCOUNT_SID = os.environ.get("TWILIO_ACCOUNT_SID", "")
 TWILIO_AUTH_TOKEN = os.environ.get("TWILIO_AUTH_TOKEN", "")
 TWILIO_FROM_NUMBER = os.environ.get("TWILIO_FROM_NUMBER", "")
+TWILIO_API_URL = os.environ.get("TWILIO_API_URL", "https://api.twilio.com")
+
+# SMS backend (see bookings/sms): Twilio when credentials are set, else printed to the console.
+SMS_BACKEND = os.environ.get(
+    "SMS_BACKEND",
+    "bookings.sms.backends.twilio.SmsBackend"
+    if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN
+    else "bookings.sms.backends.console.SmsBackend",
+)
+SMS_FROM_NUMBER = TWILIO_FROM_NUMBER
+# Concurrent sends per batch and the overall pace (messages/second, 0 = unlimited).
+SMS_MAX_WORKERS = int(os.environ.get("SMS_MAX_WORKERS", "8"))
+SMS_RATE_LIMIT = float(os.environ.get("SMS_RATE_LIMIT", "10"))
+SMS_TIMEOUT = float(os.environ.get("SMS_TIMEOUT", "10"))
+SMS_FILE_PATH = os.environ.get("SMS_FILE_PATH", "")
+# Simulated provider round trip for the locmem backend (benchmarks).
+SMS_LOCMEM_LATENCY = float(os.environ.get("SMS_LOCMEM_LATENCY", "0"))
+
+# In-process scheduler (`manage.py run_scheduler`): seconds between runs of each job.
+SCHEDULER_INTERVALS = {
+    "reminders": int(os.environ.get("SCHEDULER_REMINDERS_INTERVAL", "300")),
+    "outbox": int(os.environ.get("SCHEDULER_OUTBOX_INTERVAL", "60")),
+    "summaries": int(os.environ.get("SCHEDULER_SUMMARIES_INTERVAL", "3600")),
+    "sessions": int(os.environ.get("SCHEDULER_SESSIONS_INTERVAL", "86400")),
+}
+SCHEDULER_TICK_SECONDS = int(os.environ.get("SCHEDULER_TICK_SECONDS", "5"))
+# A leader that stops renewing (crash, lost host) is replaced after this many seconds.
+SCHEDULER_LEASE_SECONDS = int(os.environ.get("SCHEDULER_LEASE_SECONDS", "120"))
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -115,7 +188,18 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATICFILES_DIRS = [BASE_DIR / "static"]
-STATIC_ROOT = BASE_DIR / "staticfiles"
+STATIC_ROOT = Path(os.environ.get("DJANGO_STATIC_ROOT", BASE_DIR / "staticfiles"))
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    # Fingerprinted + gzip/brotli variants written by collectstatic; WhiteNoise serves
+    # hashed files as immutable so repeat visits never revalidate them.
+    "staticfiles": {
+        "BACKEND": os.environ.get("DJANGO_STATICFILES_STORAGE", "salon_site.storage.SalonStaticFilesStorage"),
+    },
+}
+# Cache lifetime for files WhiteNoise cannot prove are hashed (seconds).
+WHITENOISE_MAX_AGE = 0 if DEBUG else 3600
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -1,7 +1,13 @@
 #!/bin/bash
 
+# Gunicorn workers (and these commands) share cached catalog data through this
+# directory unless REDIS_URL is set.
+export DJANGO_CACHE_DIR="${DJANGO_CACHE_DIR:-/tmp/salon-cache}"
+
 # 1. Run Migrations
 python manage.py migrate
+# Fill in availability summary rows for booked days that have none yet (signals keep the rest current).
+python manage.py rebuild_availability --missing
 
 # 2. Create Superuser (only if it doesn't exist)
 # Replace these values with your desired login info
@@ -15,5 +21,11 @@ python manage.py createsuperuser --noinput || true
 # 3. Collect Static Files
 python manage.py collectstatic --noinput
 
-# 4. Start the Server (with the performance fixes we discussed)
-gunicorn --bind=0.0.0.0:8000 --workers 4 --timeout 600 salon_site.wsgi
\ No newline at end of file
+# 4. Background jobs (reminders, email retries, summaries). Every instance starts
+# one; a database lease lets only one of them run jobs at a time.
+python manage.py run_scheduler &
+
+# 5. Start the Server
+# Worker model, worker count, timeouts and recycling live in salon_site/gunicorn_conf.py
+# (override with GUNICORN_WORKER_MODEL, WEB_CONCURRENCY, GUNICORN_THREADS, ...).
+exec gunicorn -c python:salon_site.gunicorn_conf
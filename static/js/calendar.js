@@ -0,0 +1,17 @@
+(function(){
+  const form = document.getElementById('availability-form');
+  const workerSelect = document.getElementById('worker');
+  const serviceSelect = document.getElementById('service');
+  if(workerSelect){
+    workerSelect.addEventListener('change', function(){
+      if(!this.value){ return; }
+      form.querySelector('input[name="month"]').value = '';
+      form.submit();
+    });
+  }
+  if(serviceSelect){
+    serviceSelect.addEventListener('change', function(){
+      form.submit();
+    });
+  }
+})();
@@ -0,0 +1,21 @@
+(function(){
+  var toggle = document.querySelector('.nav-toggle');
+  var nav = document.getElementById('site-nav');
+  if(toggle && nav){
+    toggle.addEventListener('click', function(){
+      var expanded = this.getAttribute('aria-expanded') === 'true';
+      this.setAttribute('aria-expanded', String(!expanded));
+      nav.classList.toggle('open');
+    });
+  }
+  var observer = new IntersectionObserver(function(entries){
+    entries.forEach(function(entry){
+      if(entry.isIntersecting){ entry.target.classList.add('visible'); }
+    });
+  }, {threshold: 0.15});
+  document.querySelectorAll('.reveal').forEach(function(el){ observer.observe(el); });
+  // On-load animation
+  window.addEventListener('load', function(){
+    document.querySelectorAll('.reveal-onload').forEach(function(el){ el.classList.add('visible'); });
+  });
+})();